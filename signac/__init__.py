@@ -12,6 +12,7 @@ collectively accessible.
 from synced_collections.backends.collection_json import BufferedJSONAttrDict as JSONDict
 
 from . import errors, sync
+from ._write_behind import write_behind
 from .diff import diff_jobs
 from .h5store import H5Store, H5StoreManager
 from .project import Project, TemporaryProject, get_job, get_project, init_project
@@ -39,6 +40,7 @@ __all__ = [
     "get_buffer_capacity",
     "get_current_buffer_size",
     "set_buffer_capacity",
+    "write_behind",
     "JSONDict",
     "H5Store",
     "H5StoreManager",
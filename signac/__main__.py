@@ -147,8 +147,12 @@ def _find_with_filter_or_none(args):
         return None
 
 
-def _find_with_filter(args):
-    """Return a filtered subset of jobs."""
+def _find_with_filter(args, stream=False):
+    """Return a filtered subset of jobs.
+
+    If stream is True, the job ids are generated while the workspace is
+    searched.
+    """
     if getattr(args, "job_id", None):
         if args.filter:
             raise ValueError("Can't provide both 'job-id' and filter arguments!")
@@ -159,6 +163,8 @@ def _find_with_filter(args):
     filter_ = parse_filter_arg(args.filter) or {}
     if not filter_:
         filter_ = None
+    if stream:
+        return project._stream_job_ids(filter=filter_)
     return project._find_job_ids(filter=filter_)
 
 
@@ -292,7 +298,7 @@ def main_find(args):
             return pformat(s, depth=args.pretty)
 
     try:
-        for job_id in _find_with_filter(args):
+        for job_id in _find_with_filter(args, stream=True):
             print(job_id)
             job = project.open_job(id=job_id)
 
@@ -647,7 +653,11 @@ def main_update_cache(args):
 
 def main_migrate(args):
     """Migrate the project's schema to the current schema version."""
-    from .migration import _get_config_schema_version, apply_migrations
+    from .migration import (
+        _get_config_schema_version,
+        apply_migrations,
+        apply_workspace_layout,
+    )
     from .version import SCHEMA_VERSION
 
     root = args.root_directory if args.root_directory else os.getcwd()
@@ -661,11 +671,13 @@ def main_migrate(args):
             "newer than the schema version {schema_version} supported by "
             f"signac version {__version__}. Try updating signac."
         )
+        return
     elif config_schema_version == schema_version:
-        _print_err(
-            f"The schema version of the project ({config_schema_version}) is "
-            "up to date. Nothing to do."
-        )
+        if not args.workspace_layout:
+            _print_err(
+                f"The schema version of the project ({config_schema_version}) is "
+                "up to date. Nothing to do."
+            )
     elif args.yes or _query_yes_no(
         "Do you want to migrate this project's schema version from "
         f"'{config_schema_version}' to '{schema_version}'? WARNING: THIS "
@@ -674,6 +686,13 @@ def main_migrate(args):
     ):
         apply_migrations(root)
 
+    if args.workspace_layout:
+        _print_err(
+            f"Converting workspace to the {args.workspace_layout} layout... ", end=""
+        )
+        apply_workspace_layout(root, args.workspace_layout)
+        _print_err("OK")
+
 
 def main_config_show(args):
     """Handle config show subcommand."""
@@ -1626,6 +1645,13 @@ def main():
         action="store_true",
         help="Do not ask for confirmation.",
     )
+    parser_migrate.add_argument(
+        "--workspace-layout",
+        choices=["flat", "sharded"],
+        help="Convert the workspace to the given layout. The sharded layout "
+        "places job directories in subdirectories named after the first two "
+        "characters of the job id.",
+    )
     parser_migrate.set_defaults(func=main_migrate)
 
     args = parser.parse_args()
@@ -0,0 +1,160 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Implement a random-access binary format for the state point cache.
+
+The file consists of a header, a table of fixed-size entries sorted by job id,
+and a data section with the JSON-encoded state points::
+
+    header: magic (8 bytes), format version (uint32), number of entries (uint32)
+    table:  job id digest (16 bytes), data offset (uint64), data length (uint32)
+    data:   UTF-8 encoded JSON state points
+
+Since the table is sorted, a state point can be located with a binary search
+over the memory-mapped file and only the requested entries need to be decoded.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+_MAGIC = b"SIGNACSP"
+_VERSION = 1
+_HEADER = struct.Struct("<8sII")
+_ENTRY = struct.Struct("<16sQI")
+_DIGEST_SIZE = 16
+
+
+def _to_digest(job_id):
+    """Convert a job id into its binary digest.
+
+    Raises
+    ------
+    KeyError
+        If the job id is not a valid job id.
+
+    """
+    try:
+        digest = bytes.fromhex(job_id)
+    except (TypeError, ValueError):
+        raise KeyError(job_id)
+    if len(digest) != _DIGEST_SIZE:
+        raise KeyError(job_id)
+    return digest
+
+
+def _write_cache_index(filename, cache):
+    """Write a state point cache to a binary index file.
+
+    The file is first written to a temporary file, which then replaces the
+    target file.
+
+    Parameters
+    ----------
+    filename : str
+        The index filename.
+    cache : dict
+        Mapping of job ids to state points.
+
+    """
+    entries = sorted(
+        (_to_digest(id_), json.dumps(statepoint).encode())
+        for id_, statepoint in cache.items()
+    )
+    offset = _HEADER.size + _ENTRY.size * len(entries)
+    table = []
+    for digest, blob in entries:
+        table.append(_ENTRY.pack(digest, offset, len(blob)))
+        offset += len(blob)
+
+    fn_tmp = filename + "~"
+    try:
+        with open(fn_tmp, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(entries)))
+            file.write(b"".join(table))
+            file.write(b"".join(blob for _, blob in entries))
+    except OSError:  # clean-up
+        try:
+            os.remove(fn_tmp)
+        except OSError:
+            pass
+        raise
+    else:
+        os.replace(fn_tmp, filename)
+
+
+class _CacheIndex:
+    """Read-only, memory-mapped view of a binary state point cache file.
+
+    Parameters
+    ----------
+    filename : str
+        The index filename.
+
+    Raises
+    ------
+    OSError
+        If the file cannot be opened.
+    ValueError
+        If the file is not a valid state point cache index.
+
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._size = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC or version != _VERSION:
+                raise ValueError(f"Invalid state point cache index '{filename}'.")
+            if len(self._mmap) < _HEADER.size + _ENTRY.size * self._size:
+                raise ValueError(f"Truncated state point cache index '{filename}'.")
+        except (ValueError, struct.error):
+            self._mmap.close()
+            raise ValueError(f"Invalid state point cache index '{filename}'.")
+
+    def __len__(self):
+        return self._size
+
+    def _digest(self, i):
+        start = _HEADER.size + _ENTRY.size * i
+        return self._mmap[start : start + _DIGEST_SIZE]
+
+    def _bisect(self, digest):
+        """Return the position of the first entry not less than digest."""
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._digest(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __getitem__(self, job_id):
+        digest = _to_digest(job_id)
+        i = self._bisect(digest)
+        if i == self._size or self._digest(i) != digest:
+            raise KeyError(job_id)
+        _, offset, length = _ENTRY.unpack_from(
+            self._mmap, _HEADER.size + _ENTRY.size * i
+        )
+        return json.loads(self._mmap[offset : offset + length])
+
+    def __iter__(self):
+        """Iterate over the job ids without decoding the state points."""
+        for i in range(self._size):
+            yield self._digest(i).hex()
+
+    def __contains__(self, job_id):
+        try:
+            digest = _to_digest(job_id)
+        except KeyError:
+            return False
+        i = self._bisect(digest)
+        return i != self._size and self._digest(i) == digest
+
+    def close(self):
+        """Close the memory map."""
+        self._mmap.close()
@@ -0,0 +1,152 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Cache parsed job documents across calls and processes.
+
+Each cached document is stored together with the modification time, size, and
+inode of the document file it was read from. A document is read again whenever
+any of them changed.
+
+Since file systems may store modification times with a coarse granularity, a
+file modified shortly after it was read could keep its recorded modification
+time. Entries are therefore only trusted if the file was last modified well
+before it was read.
+"""
+
+import errno
+import gzip
+import json
+import logging
+import os
+import time
+from threading import Lock
+
+logger = logging.getLogger(__name__)
+
+# The coarsest modification time granularity of common file systems (FAT).
+_MTIME_GRANULARITY_NS = 2 * 10**9
+
+_VERSION = 1
+
+
+class _DocumentCache:
+    """Cache of parsed job documents validated by file metadata.
+
+    Parameters
+    ----------
+    filename : str
+        The filename of the persistent cache.
+
+    """
+
+    def __init__(self, filename):
+        self._filename = filename
+        self._entries = None
+        self._modified = False
+        # Documents may be read concurrently, but the cache is loaded once.
+        self._load_lock = Lock()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        # Locks are not pickleable and must be removed from the state
+        del state["_load_lock"]
+        return state
+
+    def __setstate__(self, state):
+        # Locks are not pickleable and must be added back to the state
+        state["_load_lock"] = Lock()
+        self.__dict__.update(state)
+
+    def _load(self):
+        """Read the persistent cache from disk."""
+        entries = {}
+        try:
+            with gzip.open(self._filename, "rb") as file:
+                data = json.loads(file.read().decode())
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                logger.warning(f"Ignoring unreadable job document cache: {error}")
+        except (EOFError, ValueError):
+            logger.warning("Ignoring corrupted job document cache.")
+        else:
+            if data.get("version") == _VERSION:
+                entries = data["documents"]
+        self._entries = entries
+
+    def read(self, job_id, fn_document):
+        """Read a job document, using the cached document if it is up to date.
+
+        Parameters
+        ----------
+        job_id : str
+            The job id.
+        fn_document : str
+            The filename of the job document.
+
+        Returns
+        -------
+        dict or None
+            The job document or None if the document file does not exist. The
+            returned dict must not be modified.
+
+        """
+        if self._entries is None:
+            with self._load_lock:
+                if self._entries is None:
+                    self._load()
+        try:
+            stat = os.stat(fn_document)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+            if self._entries.pop(job_id, None) is not None:
+                self._modified = True
+            return None
+        entry = self._entries.get(job_id)
+        if (
+            entry is not None
+            and entry[:3] == [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+            and stat.st_mtime_ns < entry[3] - _MTIME_GRANULARITY_NS
+        ):
+            return entry[4]
+        read_ns = time.time_ns()
+        with open(fn_document, "rb") as file:
+            document = json.loads(file.read().decode())
+        self._entries[job_id] = [
+            stat.st_mtime_ns,
+            stat.st_size,
+            stat.st_ino,
+            read_ns,
+            document,
+        ]
+        self._modified = True
+        return document
+
+    def flush(self, job_ids):
+        """Write the cache to disk if it was modified.
+
+        Parameters
+        ----------
+        job_ids : set
+            The ids of all jobs in the workspace. Entries of other jobs are
+            removed.
+
+        """
+        if not self._modified:
+            return
+        for job_id in set(self._entries).difference(job_ids):
+            del self._entries[job_id]
+        blob = json.dumps({"version": _VERSION, "documents": self._entries}).encode()
+        fn_tmp = self._filename + "~"
+        try:
+            with gzip.open(fn_tmp, "wb") as file:
+                file.write(blob)
+        except OSError as error:
+            try:
+                os.remove(fn_tmp)
+            except OSError:
+                pass
+            logger.warning(f"Unable to write job document cache: {error}")
+        else:
+            os.replace(fn_tmp, self._filename)
+            self._modified = False
@@ -0,0 +1,148 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Find the nearest state points with a k-d tree over numerical keys.
+
+The values of the queried keys are gathered into a point array with one row per
+job. The points are recursively split at the median of the dimension with the
+largest extent until at most :attr:`_KDTree.LEAF_SIZE` points remain, whose
+distances to a query point are then computed with vectorized operations.
+"""
+
+import heapq
+import math
+
+import numpy
+
+
+def _is_coordinate(value):
+    """Check if a value is a finite number that can be used as a coordinate."""
+    return type(value) in (int, float) and math.isfinite(value)
+
+
+def _gather_points(statepoints, keys):
+    """Gather the values of numerical state point keys into a point array.
+
+    Parameters
+    ----------
+    statepoints : iterable
+        Pairs of job ids and state points.
+    keys : sequence of str
+        State point keys in dotted key format.
+
+    Returns
+    -------
+    tuple
+        A list of the ids of all jobs that have finite numerical values for
+        all keys and an array of their values with one row per job.
+
+    """
+    nodes = [key.split(".") for key in keys]
+    ids = []
+    points = []
+    for job_id, statepoint in statepoints:
+        point = []
+        for path in nodes:
+            value = statepoint
+            try:
+                for node in path:
+                    value = value[node]
+            except (KeyError, TypeError):
+                break
+            if not _is_coordinate(value):
+                break
+            point.append(value)
+        else:
+            ids.append(job_id)
+            points.append(point)
+    return ids, numpy.array(points, dtype=float).reshape(len(points), len(keys))
+
+
+class _KDTree:
+    """A k-d tree for k-nearest neighbor queries of points.
+
+    Parameters
+    ----------
+    points : :class:`numpy.ndarray`
+        The points with shape (N, D).
+
+    """
+
+    LEAF_SIZE = 32
+
+    def __init__(self, points):
+        self._points = points
+        self._order = numpy.arange(len(points))
+        # Each node is either (dim, split, left, right) or (start, stop) of a
+        # leaf's range in self._order.
+        self._nodes = []
+        if len(points):
+            self._build(0, len(points))
+
+    def _build(self, start, stop):
+        """Build the node for the points self._order[start:stop]."""
+        node_id = len(self._nodes)
+        self._nodes.append(None)
+        if stop - start <= self.LEAF_SIZE:
+            self._nodes[node_id] = (start, stop)
+            return node_id
+        indices = self._order[start:stop]
+        points = self._points[indices]
+        dim = int(numpy.argmax(points.max(axis=0) - points.min(axis=0)))
+        mid = (stop - start) // 2
+        partition = numpy.argpartition(points[:, dim], mid)
+        self._order[start:stop] = indices[partition]
+        split = self._points[self._order[start + mid], dim]
+        left = self._build(start, start + mid)
+        right = self._build(start + mid, stop)
+        self._nodes[node_id] = (dim, split, left, right)
+        return node_id
+
+    def query(self, point, k):
+        """Find the k points nearest to a point.
+
+        Parameters
+        ----------
+        point : sequence
+            The coordinates of the query point.
+        k : int
+            The number of points to find.
+
+        Returns
+        -------
+        list
+            Pairs of the Euclidean distance and the index of the nearest
+            points, sorted by distance and index.
+
+        """
+        if not self._nodes:
+            return []
+        point = numpy.asarray(point, dtype=float)
+        # Max-heap of the k best (negative squared distance, negative index).
+        best = []
+
+        def _visit(node_id, bound):
+            if len(best) == k and bound > -best[0][0]:
+                return
+            node = self._nodes[node_id]
+            if len(node) == 2:
+                indices = self._order[node[0] : node[1]]
+                distances = ((self._points[indices] - point) ** 2).sum(axis=1)
+                for distance, index in zip(distances.tolist(), indices.tolist()):
+                    item = (-distance, -index)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+                return
+            dim, split, left, right = node
+            offset = point[dim] - split
+            near, far = (left, right) if offset < 0 else (right, left)
+            _visit(near, bound)
+            _visit(far, max(bound, offset * offset))
+
+        _visit(0, 0.0)
+        return [
+            (math.sqrt(-distance), -index)
+            for distance, index in sorted(best, reverse=True)
+        ]
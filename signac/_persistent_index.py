@@ -0,0 +1,126 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Persist search indexes of state point keys across calls and processes.
+
+Each index is stored in a separate JSON file together with a fingerprint of
+the job ids it was built from. Since job ids are hashes of the state points, an
+index is valid for as long as the set of job ids in the workspace is unchanged.
+"""
+
+import errno
+import hashlib
+import json
+import logging
+import os
+
+from ._search_indexer import _DictPlaceholder, _TypedSetDefaultDict
+from ._utility import _to_hashable
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(job_ids):
+    """Compute an order-independent fingerprint of a collection of job ids.
+
+    Parameters
+    ----------
+    job_ids : list[str]
+        Job ids.
+
+    Returns
+    -------
+    str
+        The fingerprint.
+
+    """
+    digest = 0
+    for job_id in job_ids:
+        digest ^= int(job_id, 16)
+    return f"{len(job_ids)}-{digest:032x}"
+
+
+def _index_filename(directory, key):
+    """Return the filename of the persisted index for a key."""
+    return os.path.join(directory, hashlib.md5(key.encode()).hexdigest() + ".json")
+
+
+def _write_index(directory, key, fingerprint, index):
+    """Write an index to disk.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which indexes are stored.
+    key : str
+        The key of the index.
+    fingerprint : str
+        The fingerprint of the job ids the index was built from.
+    index : :class:`~signac._search_indexer._TypedSetDefaultDict`
+        The index.
+
+    """
+    values = []
+    dicts = []
+    for value, ids in index.items():
+        if value is _DictPlaceholder:
+            dicts = list(ids)
+        else:
+            values.append([value, list(ids)])
+    blob = json.dumps(
+        {"key": key, "fingerprint": fingerprint, "values": values, "dicts": dicts}
+    )
+    os.makedirs(directory, exist_ok=True)
+    fn = _index_filename(directory, key)
+    fn_tmp = fn + "~"
+    try:
+        with open(fn_tmp, "w") as file:
+            file.write(blob)
+    except OSError:  # clean-up
+        try:
+            os.remove(fn_tmp)
+        except OSError:
+            pass
+        raise
+    else:
+        os.replace(fn_tmp, fn)
+
+
+def _read_index(directory, key, fingerprint):
+    """Read an index from disk.
+
+    Parameters
+    ----------
+    directory : str
+        The directory in which indexes are stored.
+    key : str
+        The key of the index.
+    fingerprint : str
+        The fingerprint of the current job ids.
+
+    Returns
+    -------
+    :class:`~signac._search_indexer._TypedSetDefaultDict` or None
+        The index or None if no valid index for this set of job ids exists.
+
+    """
+    try:
+        with open(_index_filename(directory, key), "rb") as file:
+            data = json.loads(file.read().decode())
+    except OSError as error:
+        if error.errno != errno.ENOENT:
+            # The index is rebuilt in memory, like a corrupted index.
+            logger.warning(f"Ignoring unreadable search index for key '{key}': {error}")
+        return None
+    except ValueError:
+        logger.warning(f"Ignoring corrupted search index for key '{key}'.")
+        return None
+    if data["key"] != key or data["fingerprint"] != fingerprint:
+        logger.debug(f"Search index for key '{key}' is outdated.")
+        return None
+    index = _TypedSetDefaultDict()
+    for value, ids in data["values"]:
+        index[_to_hashable(value)] = set(ids)
+    if data["dicts"]:
+        index[_DictPlaceholder] = set(data["dicts"])
+    return index
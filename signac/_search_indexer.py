@@ -7,6 +7,8 @@ import json
 import logging
 import operator
 import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
 from math import isclose
 from numbers import Number
 
@@ -32,6 +34,27 @@ _INDEX_OPERATORS = (
     "$near",
 )
 
+_RANGE_OPERATORS = ("$gt", "$gte", "$lt", "$lte")
+
+# Expected selectivity of operators, from the most to the least selective.
+_OPERATOR_RANKS = {
+    "$eq": 0,
+    "$in": 1,
+    "$near": 1,
+    "$regex": 2,
+    "$gt": 2,
+    "$gte": 2,
+    "$lt": 2,
+    "$lte": 2,
+    "$type": 3,
+    "$where": 3,
+    "$exists": 3,
+    "$ne": 4,
+    "$nin": 4,
+    "or": 5,
+    "not": 6,
+}
+
 _TYPES = {
     "int": int,
     "float": float,
@@ -65,8 +88,14 @@ class _TypedSetDefaultDict(dict):
     to the same integer as int type, which means they cannot be stored separately in a
     standard dict.
 
+    The numerical keys are kept in a sorted list, which is built on demand and
+    discarded whenever a key is added or removed.
+
     """
 
+    def _discard_sorted_keys(self):
+        self.__dict__.pop("_sorted_keys", None)
+
     def keys(self):
         for key in dict.keys(self):
             yield float(key) if type(key) is _float else key
@@ -78,6 +107,7 @@ class _TypedSetDefaultDict(dict):
             yield float(key) if type(key) is _float else key, value
 
     def __missing__(self, key):
+        self._discard_sorted_keys()
         value = set()
         dict.__setitem__(self, key, value)
         return value
@@ -86,11 +116,67 @@ class _TypedSetDefaultDict(dict):
         return dict.__getitem__(self, _float(key) if type(key) is float else key)
 
     def __setitem__(self, key, value):
+        self._discard_sorted_keys()
         return dict.__setitem__(self, _float(key) if type(key) is float else key, value)
 
     def __delitem__(self, key):
+        self._discard_sorted_keys()
         dict.__delitem__(self, _float(key) if type(key) is float else key)
 
+    def pop(self, key, *args):
+        self._discard_sorted_keys()
+        return dict.pop(self, _float(key) if type(key) is float else key, *args)
+
+    def popitem(self):
+        self._discard_sorted_keys()
+        key, value = dict.popitem(self)
+        return float(key) if type(key) is _float else key, value
+
+    def setdefault(self, key, default=None):
+        self._discard_sorted_keys()
+        return dict.setdefault(
+            self, _float(key) if type(key) is float else key, default
+        )
+
+    def update(self, other=(), **kwargs):
+        items = other.items() if hasattr(other, "keys") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def clear(self):
+        self._discard_sorted_keys()
+        dict.clear(self)
+
+    def sorted_keys(self):
+        """Return the keys in ascending order if all keys are numbers.
+
+        Keys that are not a number (NaN) are omitted, since they do not
+        compare to any other number.
+
+        Returns
+        -------
+        list or None
+            The sorted keys or None if any key is not a number.
+
+        """
+        try:
+            return self._sorted_keys
+        except AttributeError:
+            pass
+        keys = []
+        for key in self.keys():
+            if not isinstance(key, (int, float)):
+                keys = None
+                break
+            if key == key:
+                keys.append(key)
+        else:
+            keys.sort()
+        self._sorted_keys = keys
+        return keys
+
     def get(self, key, default=None):
         """Get the value for given key.
 
@@ -109,61 +195,151 @@ class _TypedSetDefaultDict(dict):
         return dict.get(self, _float(key) if type(key) is float else key, default)
 
 
-def _find_with_index_operator(index, op, argument):
-    """Find index for given operator and argument.
+class _LazyDict(dict):
+    """A dict that is populated on first access.
+
+    Parameters
+    ----------
+    load : callable
+        Function without arguments that returns the items of the dict.
+
+    """
+
+    def __init__(self, load):
+        super().__init__()
+        self._load = load
+
+    def _ensure_loaded(self):
+        if self._load is not None:
+            load, self._load = self._load, None
+            self.update(load())
+
+    def __getitem__(self, key):
+        self._ensure_loaded()
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        self._ensure_loaded()
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self._ensure_loaded()
+        return super().__iter__()
+
+    def __len__(self):
+        self._ensure_loaded()
+        return super().__len__()
+
+    def get(self, key, default=None):
+        self._ensure_loaded()
+        return super().get(key, default)
+
+    def keys(self):
+        self._ensure_loaded()
+        return super().keys()
+
+    def items(self):
+        self._ensure_loaded()
+        return super().items()
+
+    def values(self):
+        self._ensure_loaded()
+        return super().values()
+
+
+def _scan_index(index, test):
+    """Find ids of all values of an index that pass a test.
 
     Parameters
     ----------
     index : dict
-        Index for the operator.
+        The index.
+    test : callable
+        Function that returns whether a value matches.
+
+    Returns
+    -------
+    set
+        The ids of all matching values.
+
+    """
+    matches = set()
+    for value, ids in index.items():
+        if test(value):
+            matches.update(ids)
+    return matches
+
+
+def _compile_index_operator(op, argument):
+    """Compile an index operator and its argument into a matching function.
+
+    Parameters
+    ----------
     op : str
-        logical operator.
+        The index operator.
     argument :
-        Dependent on the choice of logical operator argument (op).
+        Dependent on the choice of operator (op).
         For better understanding have a look at :meth:`~_SearchIndexer.find`.
 
     Returns
     -------
-    set
-        Index for given operator and argument.
+    callable
+        Function that returns the set of ids of an index matching the operator
+        and argument.
 
     Raises
     ------
     ValueError
-        When unknown argument is given for $type operator (When the operator is $type).
+        When unknown argument is given for $type operator (When the operator is $type)
+        or an invalid argument is given for the $near operator.
 
     """
-    if op == "$in":
+    if op in _RANGE_OPERATORS or op in ("$eq", "$ne"):
+        compare = getattr(operator, {"$gte": "$ge", "$lte": "$le"}.get(op, op)[1:])
+
+        def test(value):
+            return compare(value, argument)
+
+        if op in _RANGE_OPERATORS and isinstance(argument, (int, float)):
+
+            def match(index):
+                if isinstance(index, _TypedSetDefaultDict):
+                    keys = index.sorted_keys()
+                    if keys is not None:
+                        return _find_in_range(index, keys, op, argument)
+                return _scan_index(index, test)
 
-        def op(value, argument):
+            return match
+
+    elif op == "$in":
+
+        def test(value):
             return value in argument
 
     elif op == "$nin":
 
-        def op(value, argument):
+        def test(value):
             return value not in argument
 
     elif op == "$regex":
 
-        def op(value, argument):
+        def test(value):
             if isinstance(value, str):
                 return re.search(argument, value)
             else:
                 return False
 
     elif op == "$type":
+        if argument in _TYPES:
+            t = _TYPES[argument]
+        else:
+            raise ValueError(f"Unknown argument for $type operator: '{argument}'.")
 
-        def op(value, argument):
-            if argument in _TYPES:
-                t = _TYPES[argument]
-            else:
-                raise ValueError(f"Unknown argument for $type operator: '{argument}'.")
+        def test(value):
             return isinstance(value, t)
 
     elif op == "$where":
-
-        def op(value, argument):
-            return eval(argument)(value)
+        test = eval(argument)
 
     elif op == "$near":
         rel_tol, abs_tol = 1e-9, 0.0  # default values
@@ -184,15 +360,49 @@ def _find_with_index_operator(index, op, argument):
         rel_tol = float(rel_tol)
         abs_tol = float(abs_tol)
 
-        def op(value, argument):
+        def test(value):
             return isclose(value, argument, rel_tol=rel_tol, abs_tol=abs_tol)
 
+    def match(index):
+        return _scan_index(index, test)
+
+    return match
+
+
+def _find_in_range(index, keys, op, argument):
+    """Find ids for a range operator by binary search over the sorted keys.
+
+    Parameters
+    ----------
+    index : :class:`~_TypedSetDefaultDict`
+        Index with numerical keys only.
+    keys : list
+        The sorted keys of the index.
+    op : str
+        One of the operators '$gt', '$gte', '$lt', or '$lte'.
+    argument : int or float
+        The argument of the operator.
+
+    Returns
+    -------
+    set
+        The ids of all keys within the range.
+
+    """
+    if argument != argument:
+        # Nothing compares to NaN.
+        return set()
+    if op == "$lt":
+        selected = keys[: bisect_left(keys, argument)]
+    elif op == "$lte":
+        selected = keys[: bisect_right(keys, argument)]
+    elif op == "$gt":
+        selected = keys[bisect_right(keys, argument) :]
     else:
-        op = getattr(operator, {"$gte": "$ge", "$lte": "$le"}.get(op, op)[1:])
+        selected = keys[bisect_left(keys, argument) :]
     matches = set()
-    for value in index:
-        if op(value, argument):
-            matches.update(index[value])
+    for value in selected:
+        matches.update(index[value])
     return matches
 
 
@@ -253,8 +463,78 @@ class _SearchIndexer(dict):
     ``_SearchIndexer(mapping, **kwargs)``, or
     ``_SearchIndexer(iterable, **kwargs)``.
 
+    Indexes are cached until the indexer is modified. Indexes that were built
+    elsewhere, e.g., loaded from disk, can be provided with :meth:`add_index`.
+    Top-level keys whose values are expensive to access, e.g., a
+    :class:`_LazyDict` that is loaded from disk, can be marked with
+    :meth:`add_lazy_key`, so that expressions on them are evaluated last and,
+    where the result does not depend on other dicts, only for the remaining
+    candidates.
+
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._indexes = {}
+        self._lazy_keys = set()
+
+    def _invalidate(self):
+        """Discard all cached indexes after a modification."""
+        self._indexes.clear()
+
+    def __setitem__(self, key, value):
+        self._invalidate()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._invalidate()
+        super().__delitem__(key)
+
+    def clear(self):
+        self._invalidate()
+        super().clear()
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._invalidate()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._invalidate()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._invalidate()
+        super().update(*args, **kwargs)
+
+    def add_index(self, key, index):
+        """Provide a prebuilt index for a given key.
+
+        Parameters
+        ----------
+        key : str
+            The key of the index.
+        index : :class:`~_TypedSetDefaultDict`
+            Index for key, which must be identical to the result of
+            :meth:`build_index` for this key.
+
+        """
+        self._indexes[key] = index
+
+    def add_lazy_key(self, key):
+        """Mark a top-level key whose values are expensive to access.
+
+        Parameters
+        ----------
+        key : str
+            The top-level key.
+
+        """
+        self._lazy_keys.add(key)
+
     def build_index(self, key):
         """Build index for a given key.
 
@@ -276,6 +556,10 @@ class _SearchIndexer(dict):
             The dict contains invalid keys.
 
         """
+        try:
+            return self._indexes[key]
+        except KeyError:
+            pass
         logger.debug(f"Building index for key '{key}'...")
         nodes = key.split(".")
         index = _TypedSetDefaultDict()
@@ -295,7 +579,7 @@ class _SearchIndexer(dict):
                 # False path using the `type` based check.
                 if type(v) is list:
                     index[_to_hashable(v)].add(_id)
-                elif type(v) is dict:
+                elif type(v) is dict or type(v) is _LazyDict:
                     index[_DictPlaceholder].add(_id)
                 else:
                     index[v].add(_id)
@@ -309,8 +593,19 @@ class _SearchIndexer(dict):
                     "for a recipe on how to replace dots in existing keys."
                 )
         logger.debug(f"Built index for key '{key}'.")
+        self._indexes[key] = index
         return index
 
+    def _is_lazy(self, key):
+        """Check whether a key is nested within a lazy key."""
+        return key.split(".", 1)[0] in self._lazy_keys
+
+    def _subset(self, ids):
+        """Return an indexer of the dicts with the given ids."""
+        indexer = type(self)((_id, self[_id]) for _id in ids)
+        indexer._lazy_keys = self._lazy_keys
+        return indexer
+
     def _find_expression(self, key, value):
         """Find ids of dicts with keys matching a value expression.
 
@@ -335,30 +630,141 @@ class _SearchIndexer(dict):
             supported type for '$type' operator.
 
         """
-        logger.debug(f"Find ids matching expression '{key}: {value}'.")
-        if "$" in key:
-            if key.count("$") > 1:
-                raise KeyError(f"Invalid operator expression '{key}'.")
-            nodes = key.split(".")
-            op = nodes[-1]
-            if not op.startswith("$"):
-                raise KeyError(f"Invalid operator placement '{key}'.")
-            key = ".".join(nodes[:-1])
-            if op in _INDEX_OPERATORS:
-                index = self.build_index(key)
-                return _find_with_index_operator(index, op, value)
-            elif op == "$exists":
-                if not isinstance(value, bool):
-                    raise ValueError(
-                        "The value of the '$exists' operator must be boolean."
-                    )
-                index = self.build_index(key)
+        return _compile_expression(key, value).evaluate(self)
+
+    def _find_compiled(self, compiled):
+        """Find ids of dicts matching a compiled filter.
+
+        Parameters
+        ----------
+        compiled : :class:`~_CompiledFilter`
+            The compiled filter.
+
+        Returns
+        -------
+        set
+            A set of ids of dicts that match the given filter.
+
+        """
+        return compiled.find(self)
+
+    def find(self, filter_=None):
+        """Find ids of dicts matching a dict of filter expressions.
+
+        This function normalizes the filter argument and then attempts to
+        build a set of ids matching the given key-value queries.
+        For each key that is queried, an internal index is built and then
+        searched.
+
+        The results are a set of ids, where each id is the value of the
+        primary key of a dict that matches the given filter.
+
+        The find() method uses the following optimizations:
+
+            1. If the filter is None, a set of all ids is returned.
+            2. The filter is processed key by key. Once the set of matches is
+               empty it is immediately returned.
+            3. Range operators on numerical values use a binary search over
+               the sorted values of the index.
+            4. Expressions are evaluated in the order of their estimated
+               selectivity. Expressions on lazy keys are only evaluated for
+               the remaining candidates once the matches are narrowed down.
+
+        Filters that are evaluated repeatedly can be compiled once with
+        :class:`_CompiledFilter`.
+
+        Parameters
+        ----------
+        filter_ : dict, optional
+            The filter of expressions to match (Default value = None).
+
+        Returns
+        -------
+        set
+            A set of ids of dicts that match the given filter.
+
+        Raises
+        ------
+        ValueError
+            When the filter argument is invalid.
+
+        """
+        if not filter_:
+            return set(self)
+        return self._find_compiled(_CompiledFilter.from_filter(filter_))
+
+
+# A compiled predicate of a filter. The kind is one of 'id', 'expr', 'not', or
+# 'or'. For expressions, key, op, and argument are the queried key, operator
+# and its argument. The evaluate function returns the ids of all dicts of an
+# indexer that match and keys holds all keys that are indexed to evaluate it.
+# Typed predicates depend on the types of the indexed values. Since equal
+# values of different types (e.g. True and 1) share an entry of an index, their
+# result for a dict depends on the other dicts of the indexer.
+_Predicate = namedtuple(
+    "_Predicate", ["kind", "key", "op", "argument", "evaluate", "keys", "typed"]
+)
+
+_TYPED_OPERATORS = ("$type", "$where")
+
+
+def _compile_expression(key, value):
+    """Compile a single expression into a predicate.
+
+    Parameters
+    ----------
+    key : str
+        The dotted key of the expression, optionally followed by an operator.
+    value
+        The value expression to match.
+
+    Returns
+    -------
+    :class:`_Predicate`
+        The compiled expression.
+
+    Raises
+    ------
+    KeyError
+        An invalid operator was given.
+    ValueError
+        The value is not bool for '$exists' operator or not a
+        supported type for '$type' operator.
+
+    """
+    if "$" in key:
+        if key.count("$") > 1:
+            raise KeyError(f"Invalid operator expression '{key}'.")
+        nodes = key.split(".")
+        op = nodes[-1]
+        if not op.startswith("$"):
+            raise KeyError(f"Invalid operator placement '{key}'.")
+        key = ".".join(nodes[:-1])
+        if op in _INDEX_OPERATORS:
+            match = _compile_index_operator(op, value)
+
+            def evaluate(indexer):
+                logger.debug(f"Find ids matching expression '{key}.{op}: {value}'.")
+                return match(indexer.build_index(key))
+
+        elif op == "$exists":
+            if not isinstance(value, bool):
+                raise ValueError("The value of the '$exists' operator must be boolean.")
+
+            def evaluate(indexer):
+                logger.debug(f"Find ids matching expression '{key}.{op}: {value}'.")
+                index = indexer.build_index(key)
                 match = {elem for elems in index.values() for elem in elems}
-                return match if value else set(self).difference(match)
-            else:
-                raise KeyError(f"Unknown operator '{op}'.")
+                return match if value else set(indexer).difference(match)
+
         else:
-            index = self.build_index(key)
+            raise KeyError(f"Unknown operator '{op}'.")
+    else:
+        op = "$eq"
+
+        def evaluate(indexer):
+            logger.debug(f"Find ids matching expression '{key}: {value}'.")
+            index = indexer.build_index(key)
             # Check to see if 'value' is a floating point type but an
             # integer value (e.g., 4.0), and search for both the int and float
             # values. This allows the user to find statepoints that have
@@ -373,123 +779,205 @@ class _SearchIndexer(dict):
                 result_int = index.get(int(value), set())
                 return result_int.union(result_float)
             else:
-                return index.get(value, set())
+                # Copy, since the index may be cached.
+                return set(index.get(value, ()))
 
-    def _find_result(self, expr):
-        """Find ids of dicts matching a dict of filter expressions.
+    return _Predicate(
+        "expr", key, op, value, evaluate, frozenset((key,)), op in _TYPED_OPERATORS
+    )
+
+
+class _CompiledFilter:
+    """A filter that is parsed and validated once and can be evaluated repeatedly.
+
+    The filter is split into a conjunction of predicates, including those
+    nested within '$and' expressions. Operators are compiled into matching
+    functions, so that evaluating the filter only requires the indexes of the
+    queried keys.
+
+    Parameters
+    ----------
+    expr : dict
+        The normalized filter of expressions.
+
+    Raises
+    ------
+    KeyError
+        An invalid operator was given.
+    ValueError
+        The filter is invalid.
+
+    """
+
+    def __init__(self, expr):
+        self.expr = expr
+        self._predicates = []
+        self._compile(expr)
+        self.keys = frozenset().union(
+            *(predicate.keys for predicate in self._predicates)
+        )
+        self.typed = any(predicate.typed for predicate in self._predicates)
+
+    @classmethod
+    def from_filter(cls, filter_):
+        """Normalize and compile a filter.
 
         Parameters
         ----------
-        expr : dict
-            The filter of expressions to match.
+        filter_ : dict
+            The filter of expressions.
 
         Returns
         -------
-        set
-            A set of ids of dicts that match the given filter.
-
-        """
-        if not expr:
-            # Empty expression yields all ids.
-            return set(self)
-
-        result_ids = None
-
-        def reduce_results(match):
-            """Reduce the results by intersection of matches.
+        :class:`_CompiledFilter`
+            The compiled filter.
 
-            Parameters
-            ----------
-            match : set
-                match for the given expression.
+        Raises
+        ------
+        ValueError
+            When the filter argument is invalid.
 
-            """
-            nonlocal result_ids
-            if result_ids is None:  # First match
-                result_ids = match
-            else:  # Update previous match
-                result_ids = result_ids.intersection(match)
+        """
+        filter_ = json.loads(json.dumps(filter_))  # Normalize
+        if not isinstance(filter_, dict):
+            raise ValueError(f"Invalid filter: {filter_}")
+        return cls(filter_)
 
-        # Check if filter contains primary key, in which case we can
-        # immediately reduce the result.
+    def _compile(self, expr):
+        """Compile the predicates of a conjunction of filter expressions."""
+        expr = dict(expr)
         _id = expr.pop(_PRIMARY_KEY, None)
         if _id is not None:
-            reduce_results({_id} if _id in self else set())
 
-        # Extract all logical-operator expressions for now.
+            def evaluate(indexer):
+                return {_id} if _id in indexer else set()
+
+            self._predicates.append(
+                _Predicate("id", _PRIMARY_KEY, "id", _id, evaluate, frozenset(), False)
+            )
         or_expressions = expr.pop("$or", None)
         and_expressions = expr.pop("$and", None)
         not_expression = expr.pop("$not", None)
-
-        # Reduce the result based on the remaining non-logical expression:
         for key, value in _nested_dicts_to_dotted_keys(expr):
-            reduce_results(self._find_expression(key, value))
-            if not result_ids:
-                # No matches, so exit early.
-                return set()
-
-        # Reduce the result based on the logical-operator expressions:
+            self._predicates.append(_compile_expression(key, value))
         if not_expression is not None:
-            not_match = self._find_result(not_expression)
-            reduce_results(set(self).difference(not_match))
-            if not result_ids:
-                # No matches, so exit early.
-                return set()
+            negated = type(self)(not_expression)
 
+            def evaluate(indexer):
+                return set(indexer).difference(negated.find(indexer))
+
+            self._predicates.append(
+                _Predicate(
+                    "not", None, "not", None, evaluate, negated.keys, negated.typed
+                )
+            )
         if and_expressions is not None:
             _check_logical_operator_argument("$and", and_expressions)
             for expr_ in and_expressions:
-                reduce_results(self._find_result(expr_))
-                if not result_ids:
-                    # No matches, so exit early.
-                    return set()
-
+                self._compile(expr_)
         if or_expressions is not None:
             _check_logical_operator_argument("$or", or_expressions)
-            or_results = set()
-            for expr_ in or_expressions:
-                or_results.update(self._find_result(expr_))
-            reduce_results(or_results)
-
-        return result_ids
+            alternatives = [type(self)(expr_) for expr_ in or_expressions]
+
+            def evaluate(indexer):
+                or_results = set()
+                for alternative in alternatives:
+                    or_results.update(alternative.find(indexer))
+                return or_results
+
+            keys = frozenset().union(
+                *(alternative.keys for alternative in alternatives)
+            )
+            typed = any(alternative.typed for alternative in alternatives)
+            self._predicates.append(
+                _Predicate("or", None, "or", None, evaluate, keys, typed)
+            )
+
+    @staticmethod
+    def _estimate_cost(indexer, predicate):
+        """Estimate the cost of evaluating a predicate.
+
+        Predicates that can be evaluated with existing indexes are cheaper than
+        predicates that require building an index. Among those, predicates are
+        ordered by the expected selectivity of their operator and, where
+        available, by the number of matches.
 
-    def find(self, filter_=None):
-        """Find ids of dicts matching a dict of filter expressions.
+        Parameters
+        ----------
+        indexer : :class:`_SearchIndexer`
+            The indexer the predicate is evaluated on.
+        predicate : :class:`_Predicate`
+            The predicate.
 
-        This function normalizes the filter argument and then attempts to
-        build a set of ids matching the given key-value queries.
-        For each key that is queried, an internal index is built and then
-        searched.
+        Returns
+        -------
+        tuple
+            A sortable cost of the form (class, rank, matches), where a class of
+            2 denotes that an index must be built and a class of 3 that it must
+            be built from lazy keys.
 
-        The results are a set of ids, where each id is the value of the
-        primary key of a dict that matches the given filter.
+        """
+        if predicate.kind == "id":
+            return (0, 0, 0)
+        rank = _OPERATOR_RANKS.get(predicate.op, 0)
+        missing = [key for key in predicate.keys if key not in indexer._indexes]
+        if missing:
+            return (3 if any(map(indexer._is_lazy, missing)) else 2, rank, 0)
+        matches = len(indexer)
+        if predicate.kind == "expr" and predicate.op == "$eq":
+            try:
+                matches = len(
+                    indexer._indexes[predicate.key].get(predicate.argument, ())
+                )
+            except TypeError:
+                pass
+        return (1, rank, matches)
 
-        The find() method uses the following optimizations:
+    def find(self, indexer):
+        """Find ids of dicts of an indexer matching the filter.
 
-            1. If the filter is None, a set of all ids is returned.
-            2. The filter is processed key by key. Once the set of matches is
-               empty it is immediately returned.
+        The predicates are evaluated in the order of their estimated cost and
+        their matches are intersected. Predicates that require building an
+        index are evaluated for the remaining candidates only. Typed predicates
+        ('$type' and '$where') are always evaluated with the indexes of all
+        dicts, since their result for a dict depends on the other dicts.
 
         Parameters
         ----------
-        filter_ : dict, optional
-            The filter of expressions to match (Default value = None).
+        indexer : :class:`_SearchIndexer`
+            The indexer to search.
 
         Returns
         -------
         set
-            A set of ids of dicts that match the given filter.
-
-        Raises
-        ------
-        ValueError
-            When the filter argument is invalid.
+            A set of ids of dicts that match the filter.
 
         """
-        if not filter_:
-            return set(self)
+        if not self._predicates:
+            # Empty expression yields all ids.
+            return set(indexer)
 
-        filter_ = json.loads(json.dumps(filter_))  # Normalize
-        if not isinstance(filter_, dict):
-            raise ValueError(f"Invalid filter: {filter_}")
-        return self._find_result(filter_)
+        plan = sorted(
+            (self._estimate_cost(indexer, predicate), i, predicate)
+            for i, predicate in enumerate(self._predicates)
+        )
+
+        result_ids = None
+        candidates = indexer
+        for cost, _, predicate in plan:
+            if cost[0] >= 2 and not predicate.typed:
+                if result_ids is not None and len(result_ids) < len(candidates):
+                    # Only index the values of the remaining candidates.
+                    candidates = indexer._subset(result_ids)
+                match = predicate.evaluate(candidates)
+            else:
+                match = predicate.evaluate(indexer)
+            if result_ids is None:  # First match
+                result_ids = match
+            else:  # Update previous match
+                result_ids = result_ids.intersection(match)
+            if not result_ids:
+                # No matches, so exit early.
+                return set()
+
+        return result_ids
@@ -0,0 +1,195 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Evaluate filters on numerical columns with vectorized NumPy operations.
+
+For each queried key, the values of all dicts are gathered into a column array
+together with a mask marking the dicts that contain the key. Expressions are
+then evaluated as boolean masks over all dicts at once.
+
+Only filters whose expressions are exactly reproducible with floating point
+arrays are evaluated this way. All other filters, including those on columns
+with non-numerical values, are delegated to :class:`_SearchIndexer`.
+"""
+
+import numpy
+
+from ._search_indexer import (
+    _PRIMARY_KEY,
+    _check_logical_operator_argument,
+    _SearchIndexer,
+)
+from ._utility import _nested_dicts_to_dotted_keys
+
+# Integers of larger magnitude are not exactly representable as float64.
+_MAX_EXACT_INT = 2**53
+
+_COMPARISONS = {
+    "$eq": numpy.equal,
+    "$ne": numpy.not_equal,
+    "$gt": numpy.greater,
+    "$gte": numpy.greater_equal,
+    "$lt": numpy.less,
+    "$lte": numpy.less_equal,
+}
+
+
+class _Unsupported(Exception):
+    """Raised if a filter cannot be evaluated with vectorized operations."""
+
+
+def _is_number(value):
+    """Check if a value is a number that is exactly representable as float64."""
+    type_ = type(value)
+    if type_ is float or type_ is bool:
+        return True
+    return type_ is int and abs(value) <= _MAX_EXACT_INT
+
+
+class _VectorizedSearchIndexer(_SearchIndexer):
+    """A searchable index of dicts using vectorized operations.
+
+    Results are identical to those of :class:`_SearchIndexer`, which is used
+    for filters that cannot be evaluated on numerical columns.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._columns = {}
+        self._ids = None
+
+    def _invalidate(self):
+        super()._invalidate()
+        self._columns.clear()
+        self._ids = None
+
+    def _column(self, key):
+        """Return the column array and validity mask for a key.
+
+        Raises
+        ------
+        _Unsupported
+            If any value of the key is not a number or if the key is already
+            indexed.
+
+        """
+        if key in self._indexes:
+            raise _Unsupported(key)
+        try:
+            column = self._columns[key]
+        except KeyError:
+            column = self._columns[key] = self._build_column(key)
+        if column is None:
+            raise _Unsupported(key)
+        return column
+
+    def _build_column(self, key):
+        """Build the column array and validity mask for a key.
+
+        Returns
+        -------
+        tuple or None
+            The values and the validity mask or None if any value of the key
+            is not a number.
+
+        """
+        nodes = key.split(".")
+        values = numpy.zeros(len(self))
+        valid = numpy.zeros(len(self), dtype=bool)
+        for i, doc in enumerate(self.values()):
+            try:
+                v = doc
+                for n in nodes:
+                    v = v[n]
+            except (KeyError, TypeError):
+                pass
+            else:
+                if not _is_number(v):
+                    return None
+                values[i] = v
+                valid[i] = True
+            if len(nodes) > 1 and key in doc:
+                # Let the _SearchIndexer raise the InvalidKeyError.
+                return None
+        return values, valid
+
+    def _expression_mask(self, key, value):
+        """Evaluate a single expression on all dicts."""
+        if "$" in key:
+            nodes = key.split(".")
+            op = nodes[-1]
+            if key.count("$") > 1 or not op.startswith("$"):
+                raise _Unsupported(key)
+            key = ".".join(nodes[:-1])
+        else:
+            op = "$eq"
+        values, valid = self._column(key)
+        if op == "$exists":
+            if not isinstance(value, bool):
+                raise _Unsupported(key)
+            return valid if value else ~valid
+        if op in _COMPARISONS:
+            if not _is_number(value):
+                raise _Unsupported(key)
+            return valid & _COMPARISONS[op](values, value)
+        if op in ("$in", "$nin"):
+            # Lists are converted to tuples by _nested_dicts_to_dotted_keys.
+            if not isinstance(value, tuple):
+                raise _Unsupported(key)
+            numbers = [v for v in value if type(v) in (int, float, bool)]
+            if not all(map(_is_number, numbers)):
+                raise _Unsupported(key)
+            match = numpy.isin(values, numbers)
+            return valid & (match if op == "$in" else ~match)
+        raise _Unsupported(key)
+
+    def _filter_mask(self, expr):
+        """Evaluate a dict of filter expressions on all dicts."""
+        if not isinstance(expr, dict):
+            raise _Unsupported(expr)
+        expr = dict(expr)
+        mask = numpy.ones(len(self), dtype=bool)
+        _id = expr.pop(_PRIMARY_KEY, None)
+        if _id is not None:
+            mask &= self._ids == _id
+        or_expressions = expr.pop("$or", None)
+        and_expressions = expr.pop("$and", None)
+        not_expression = expr.pop("$not", None)
+        for key, value in _nested_dicts_to_dotted_keys(expr):
+            mask &= self._expression_mask(key, value)
+        if not_expression is not None:
+            mask &= ~self._filter_mask(not_expression)
+        if and_expressions is not None:
+            _check_logical_operator_argument("$and", and_expressions)
+            for expr_ in and_expressions:
+                mask &= self._filter_mask(expr_)
+        if or_expressions is not None:
+            _check_logical_operator_argument("$or", or_expressions)
+            or_mask = numpy.zeros(len(self), dtype=bool)
+            for expr_ in or_expressions:
+                or_mask |= self._filter_mask(expr_)
+            mask &= or_mask
+        return mask
+
+    def _find_compiled(self, compiled):
+        """Find ids of dicts matching a compiled filter.
+
+        Parameters
+        ----------
+        compiled : :class:`~signac._search_indexer._CompiledFilter`
+            The compiled filter.
+
+        Returns
+        -------
+        set
+            A set of ids of dicts that match the given filter.
+
+        """
+        if self._ids is None:
+            self._ids = numpy.array(list(self), dtype=object)
+        try:
+            mask = self._filter_mask(compiled.expr)
+        except _Unsupported:
+            return super()._find_compiled(compiled)
+        return set(self._ids[mask].tolist())
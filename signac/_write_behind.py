@@ -0,0 +1,147 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Flush buffered documents to disk in a background thread.
+
+While buffered mode is active, modified documents are only written when the
+buffered context is exited or the buffer capacity is exceeded. The write-behind
+flusher periodically forces a flush of the buffer from a background thread, the
+same way the buffer is flushed once it is filled to capacity, so that the
+modifications made since the last flush are the only ones at risk.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from synced_collections.backends.collection_json import BufferedJSONAttrDict
+from synced_collections.errors import BufferedError
+
+logger = logging.getLogger(__name__)
+
+# The interval at which the buffer size is compared to the high-water mark.
+_POLL_INTERVAL = 0.1
+
+
+class _WriteBehindFlusher(threading.Thread):
+    """A thread that flushes the document buffer periodically.
+
+    Parameters
+    ----------
+    flush_interval : float
+        The time in seconds between flushes.
+    high_water_mark : int or None
+        The buffer size at which the buffer is flushed before the flush
+        interval elapsed.
+
+    """
+
+    def __init__(self, flush_interval, high_water_mark):
+        super().__init__(name="signac-write-behind", daemon=True)
+        self._flush_interval = flush_interval
+        self._high_water_mark = high_water_mark
+        self._stop_event = threading.Event()
+        self.errors = {}
+        self.exception = None
+
+    def run(self):
+        if self._high_water_mark is None:
+            poll_interval = self._flush_interval
+        else:
+            poll_interval = min(self._flush_interval, _POLL_INTERVAL)
+        last_flush = time.monotonic()
+        while not self._stop_event.wait(poll_interval):
+            if (
+                time.monotonic() - last_flush >= self._flush_interval
+                or self._high_water_mark is not None
+                and BufferedJSONAttrDict.get_current_buffer_size()
+                >= self._high_water_mark
+            ):
+                self.flush()
+                last_flush = time.monotonic()
+
+    def flush(self):
+        """Flush the buffer and record the errors that occurred.
+
+        The files that could not be written are recorded in :attr:`errors`
+        and the first other exception in :attr:`exception`, so that the
+        thread keeps flushing the buffer until it is stopped.
+        """
+        try:
+            BufferedJSONAttrDict._flush_buffer(force=True)
+        except BufferedError as error:
+            logger.error(f"Unable to flush buffered files: {error}")
+            self.errors.update(error.files)
+        except Exception as error:
+            logger.error(f"Unable to flush buffered files: {error!r}")
+            if self.exception is None:
+                self.exception = error
+
+    def stop(self):
+        """Stop the thread and wait for an ongoing flush to complete."""
+        self._stop_event.set()
+        self.join()
+
+
+@contextmanager
+def write_behind(flush_interval=1.0, high_water_mark=None, buffer_capacity=None):
+    """Enter buffered mode with the buffer flushed in a background thread.
+
+    Like in :func:`~signac.buffered` mode, modifications of job and project
+    documents are buffered in memory. The buffer is written to disk by a
+    background thread every ``flush_interval`` seconds and whenever its size
+    reaches the ``high_water_mark``, so that the calling thread does not wait
+    for most writes. The remaining modifications are written when the context
+    is exited.
+
+    .. note::
+
+        Background flushes write all buffered documents, including those
+        modified in enclosing :func:`~signac.buffered` contexts.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with signac.write_behind(flush_interval=10):
+            for step in range(num_steps):
+                simulation.run(1000)
+                job.doc.step = step
+
+    Parameters
+    ----------
+    flush_interval : float, optional
+        The time in seconds between flushes, which bounds the time for which
+        modifications are only stored in memory (Default value = 1.0).
+    high_water_mark : int, optional
+        The buffer size in bytes at which the buffer is flushed before the
+        flush interval elapsed. Set it below the buffer capacity to avoid
+        flushes in the calling thread (Default value = None).
+    buffer_capacity : int, optional
+        The capacity of the buffer within this context, see
+        :func:`~signac.buffered` (Default value = None).
+
+    Raises
+    ------
+    :class:`~synced_collections.errors.BufferedError`
+        If any files could not be written by the background thread or when
+        exiting the context.
+    Exception
+        Any other exception raised while flushing the buffer in the background
+        thread is raised when exiting the context.
+
+    """
+    if flush_interval <= 0:
+        raise ValueError(f"The flush interval must be positive, not {flush_interval}.")
+    with BufferedJSONAttrDict.buffer_backend(buffer_capacity):
+        flusher = _WriteBehindFlusher(flush_interval, high_water_mark)
+        flusher.start()
+        try:
+            yield
+        finally:
+            flusher.stop()
+    if flusher.exception is not None:
+        raise flusher.exception
+    if flusher.errors:
+        raise BufferedError(flusher.errors)
@@ -110,6 +110,22 @@ class JobsCorruptedError(Error, RuntimeError):
         self.job_ids = job_ids
 
 
+class DocumentWriteError(Error, OSError):
+    """The documents of one or more jobs could not be written.
+
+    Parameters
+    ----------
+    errors : dict
+        A mapping of the ids of the jobs whose documents could not be written
+        to the errors that occurred.
+
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"Failed to write the documents of {len(errors)} job(s).")
+        self.errors = errors
+
+
 class StatepointParsingError(Error, RuntimeError):
     """Indicates an error that occurred while trying to identify a state point."""
 
@@ -125,6 +141,7 @@ class IncompatibleSchemaVersion(Error):
 __all__ = [
     "ConfigError",
     "DestinationExistsError",
+    "DocumentWriteError",
     "DocumentSyncConflict",
     "Error",
     "FileSyncConflict",
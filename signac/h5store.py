@@ -8,7 +8,8 @@ import logging
 import os
 import warnings
 from collections.abc import Mapping, MutableMapping
-from threading import RLock
+from threading import Condition, Lock, get_ident
+from typing import Dict, Tuple
 
 from ._dict_manager import _DictManager
 from ._utility import _safe_relpath
@@ -263,6 +264,143 @@ class H5Group(MutableMapping):
                 return super().__eq__(other)
 
 
+class _FileLock:
+    """The state of a reentrant lock of one file.
+
+    The lock is either held by one writer thread or shared by reader threads. A
+    thread that holds the lock may acquire it again in either mode. Threads
+    that do not hold the lock yet may only share it while no writer is waiting
+    for it, so that writers are not starved by readers.
+
+    The state of all file locks is guarded by :data:`_FILE_LOCKS_CONDITION`.
+    """
+
+    __slots__ = ["writer", "writes", "readers", "waiting_writers", "users"]
+
+    def __init__(self):
+        self.writer = None
+        self.writes = 0
+        self.readers = {}
+        self.waiting_writers = set()
+        self.users = 0
+
+    def blockers(self, ident, shared):
+        """Return the identifiers of the threads that prevent acquiring the lock."""
+        if self.writer not in (None, ident):
+            return {self.writer}
+        if not shared:
+            return self.readers.keys() - {ident}
+        if self.writer is None and ident not in self.readers:
+            return set(self.waiting_writers)
+        return set()
+
+    def acquire(self, ident, shared):
+        """Record that the thread with the given identifier acquired the lock."""
+        if shared:
+            self.readers[ident] = self.readers.get(ident, 0) + 1
+        else:
+            self.writer = ident
+            self.writes += 1
+
+    def release(self, ident, shared):
+        """Record that the thread with the given identifier released the lock."""
+        if shared:
+            self.readers[ident] -= 1
+            if not self.readers[ident]:
+                del self.readers[ident]
+        else:
+            self.writes -= 1
+            if not self.writes:
+                self.writer = None
+
+
+# The locks of all files that are currently opened by an H5Store and the locks
+# that threads are waiting for, mapped to the filenames and thread identifiers.
+_FILE_LOCKS: Dict[str, _FileLock] = {}
+_WAITING_THREADS: Dict[int, Tuple[_FileLock, bool]] = {}
+_FILE_LOCKS_CONDITION = Condition(Lock())
+
+
+def _would_deadlock(ident, blockers):
+    """Check whether the blocking threads are waiting for the given thread."""
+    visited = set()
+    while blockers:
+        blocker = blockers.pop()
+        if blocker == ident:
+            return True
+        if blocker in visited or blocker not in _WAITING_THREADS:
+            continue
+        visited.add(blocker)
+        file_lock, shared = _WAITING_THREADS[blocker]
+        blockers.update(file_lock.blockers(blocker, shared))
+    return False
+
+
+def _wait_for_file_lock(filename, file_lock, ident, shared):
+    """Wait until the thread with the given identifier can acquire a file lock.
+
+    Raises
+    ------
+    OSError
+        If waiting would deadlock, because the threads that hold the lock are
+        waiting for a lock held by this thread.
+
+    """
+    _WAITING_THREADS[ident] = file_lock, shared
+    if not shared:
+        file_lock.waiting_writers.add(ident)
+    try:
+        while True:
+            blockers = file_lock.blockers(ident, shared)
+            if not blockers:
+                return
+            if _would_deadlock(ident, blockers):
+                raise OSError(
+                    errno.EDEADLK,
+                    "Opening the file would deadlock with another thread",
+                    filename,
+                )
+            _FILE_LOCKS_CONDITION.wait()
+    finally:
+        del _WAITING_THREADS[ident]
+        if not shared:
+            file_lock.waiting_writers.discard(ident)
+            # Readers may have been waiting for this writer.
+            _FILE_LOCKS_CONDITION.notify_all()
+
+
+def _acquire_file_lock(filename, shared):
+    """Acquire the lock of a file and return the lock and the thread identifier."""
+    ident = get_ident()
+    with _FILE_LOCKS_CONDITION:
+        file_lock = _FILE_LOCKS.get(filename)
+        if file_lock is None:
+            file_lock = _FILE_LOCKS[filename] = _FileLock()
+        file_lock.users += 1
+        try:
+            if file_lock.blockers(ident, shared):
+                _wait_for_file_lock(filename, file_lock, ident, shared)
+        except:  # noqa We need to unregister under **all** circumstances upon error!
+            _unregister_file_lock(filename, file_lock)
+            raise
+        file_lock.acquire(ident, shared)
+    return file_lock, ident
+
+
+def _unregister_file_lock(filename, file_lock):
+    file_lock.users -= 1
+    if not file_lock.users:
+        del _FILE_LOCKS[filename]
+
+
+def _release_file_lock(filename, file_lock, ident, shared):
+    """Release the lock of a file acquired with :func:`_acquire_file_lock`."""
+    with _FILE_LOCKS_CONDITION:
+        file_lock.release(ident, shared)
+        _unregister_file_lock(filename, file_lock)
+        _FILE_LOCKS_CONDITION.notify_all()
+
+
 class H5Store(MutableMapping):
     r"""An HDF5-backed container for storing array-like and dictionary-like data.
 
@@ -280,6 +418,19 @@ class H5Store(MutableMapping):
     Values can be accessed as attributes (``h5s.foo``) or via key index
     (``h5s['foo']``).
 
+    Each file can only be opened by one thread at a time, while files with
+    different filenames can be opened by different threads concurrently. A
+    thread that opens a file waits until other threads have closed it. Set
+    :attr:`concurrent_reads` to True to allow multiple threads to open the
+    same file concurrently in read-only mode (``mode='r'``). Threads that
+    open a file in read-only mode wait while another thread is waiting to
+    open it for writing.
+
+    A thread may open multiple files at once. If two threads each keep a file
+    open and then try to open the other's file, the thread whose open call
+    would deadlock raises an :class:`OSError` with errno ``EDEADLK`` instead of
+    waiting. Always opening multiple files in the same order avoids this.
+
     Examples
     --------
     >>> from signac import H5Store
@@ -310,9 +461,10 @@ class H5Store(MutableMapping):
 
     """
 
-    __slots__ = ["_filename", "_file", "_kwargs"]
+    __slots__ = ["_filename", "_file", "_kwargs", "_file_lock"]
 
-    _thread_lock = RLock()
+    concurrent_reads = False
+    """bool: Whether multiple threads can open a file in read-only mode concurrently."""
 
     def __init__(self, filename, **kwargs):
         if not (isinstance(filename, str) and len(filename) > 0):
@@ -320,6 +472,7 @@ class H5Store(MutableMapping):
         self._filename = os.path.abspath(filename)
         self._file = None
         self._kwargs = kwargs
+        self._file_lock = None
 
     @property
     def filename(self):
@@ -360,12 +513,14 @@ class H5Store(MutableMapping):
         if parameters.get("mode", None) is None:
             parameters["mode"] = "a"
 
-        self._thread_lock.acquire()
+        shared = self.concurrent_reads and parameters["mode"] == "r"
+        file_lock, ident = _acquire_file_lock(self.filename, shared)
         try:
             self._file = h5py.File(self.filename, **parameters)
         except:  # noqa We need to release under **all** circumstances upon error!
-            self._thread_lock.release()
+            _release_file_lock(self.filename, file_lock, ident, shared)
             raise
+        self._file_lock = file_lock, ident, shared
         return self
 
     def open(self, mode=None):
@@ -380,6 +535,12 @@ class H5Store(MutableMapping):
         -------
         H5Store
             This H5Store instance.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be opened, or with errno ``EDEADLK`` if waiting
+            for another thread to close the file would deadlock.
         """
         if mode is None:
             mode = self._kwargs.get("mode", "a")
@@ -387,19 +548,17 @@ class H5Store(MutableMapping):
 
     def close(self):
         """Close the underlying HDF5 file."""
-        locked = True
         try:
             self._file.close()
             self._file = None
         except AttributeError:
-            locked = False
+            pass
         finally:
-            if locked:
-                try:
-                    self._thread_lock.release()
-                except RuntimeError as error:
-                    if "cannot release un-acquired lock" not in str(error):
-                        raise
+            # The file lock is not set if the constructor failed.
+            if getattr(self, "_file_lock", None) is not None:
+                file_lock, ident, shared = self._file_lock
+                self._file_lock = None
+                _release_file_lock(self.filename, file_lock, ident, shared)
 
     @property
     def file(self):
@@ -756,6 +756,7 @@ def _copy_to_job_workspace(src, job, copytree):
 
     """
     dst = job.path
+    _mkdir_p(os.path.dirname(dst))
     try:
         copytree(src, dst)
     except OSError as error:
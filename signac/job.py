@@ -11,7 +11,8 @@ import os
 import shutil
 import warnings
 from copy import deepcopy
-from threading import RLock
+from multiprocessing import Pool
+from threading import Lock, RLock
 from types import MappingProxyType
 from typing import FrozenSet
 
@@ -31,6 +32,10 @@ from .sync import sync_jobs
 logger = logging.getLogger(__name__)
 
 
+# The encoder is reused since json.dumps would create a new one for every id.
+_ID_ENCODER = SyncedCollectionJSONEncoder(sort_keys=True)
+
+
 def calc_id(statepoint):
     """Calculate and return a hash value for the given statepoint.
 
@@ -48,10 +53,36 @@ def calc_id(statepoint):
     str
         Encoded hash in hexadecimal format.
     """
-    blob = json.dumps(statepoint, cls=SyncedCollectionJSONEncoder, sort_keys=True)
-    m = hashlib.md5()
-    m.update(blob.encode())
-    return m.hexdigest()
+    return hashlib.md5(_ID_ENCODER.encode(statepoint).encode()).hexdigest()
+
+
+def calc_ids(statepoints, parallel=False):
+    """Calculate and return the hash values for many state points.
+
+    The hash values are identical to those computed by :func:`calc_id`.
+
+    Parameters
+    ----------
+    statepoints : iterable
+        JSON-encodable mappings.
+    parallel : bool or int, optional
+        Compute the hash values in parallel processes. Set to an integer to
+        specify the number of processes or to True to use one process per CPU
+        (Default value = False).
+
+    Returns
+    -------
+    list
+        Encoded hashes in hexadecimal format in the order of ``statepoints``.
+    """
+    if not parallel:
+        return [calc_id(statepoint) for statepoint in statepoints]
+    statepoints = list(statepoints)
+    num_processes = (os.cpu_count() or 1) if parallel is True else parallel
+    # Large chunks reduce the overhead of sending the state points.
+    chunksize = max(1, len(statepoints) // (4 * num_processes))
+    with Pool(num_processes) as pool:
+        return pool.map(calc_id, statepoints, chunksize=chunksize)
 
 
 # Note: All children of _StatePointDict will be of its parent type because they
@@ -127,7 +158,8 @@ class _StatePointDict(JSONAttrDict):
             # Move the state point to an intermediate location as a backup.
             os.replace(self.filename, tmp_statepoint_file)
             try:
-                new_workspace = os.path.join(job._project.workspace, new_id)
+                new_workspace = job._project._job_path(new_id)
+                _mkdir_p(os.path.dirname(new_workspace))
                 os.replace(job.path, new_workspace)
             except OSError as error:
                 os.replace(tmp_statepoint_file, self.filename)  # rollback
@@ -279,10 +311,38 @@ class Job:
     KEY_DATA = "signac_data"
     "The job's datastore key."
 
+    # Jobs are created in bulk when iterating over projects, so their state is
+    # stored in slots. The __dict__ slot keeps setting arbitrary attributes on
+    # jobs supported, as before jobs had slots.
+    __slots__ = (
+        "_project",
+        "_rlock",
+        "_directory_known",
+        "_id",
+        "_cached_statepoint",
+        "_statepoint_requires_init",
+        "_statepoint",
+        "_path",
+        "_document",
+        "_stores",
+        "_cwd",
+        "__dict__",
+        "__weakref__",
+    )
+
+    # Guards the lazy creation of the lock of each job.
+    _LOCK_CREATION_LOCK = Lock()
+
     def __init__(self, project, statepoint=None, id_=None, directory_known=False):
         self._project = project
-        self._lock = RLock()
-        self._initialize_lazy_properties()
+        # The lock is only created when first needed, see _lock.
+        self._rlock = None
+        # Not yet shared with other threads, so the lazy properties are
+        # initialized without locking.
+        self._path = None
+        self._document = None
+        self._stores = None
+        self._cwd = []
         self._directory_known = directory_known
 
         if statepoint is None and id_ is None:
@@ -307,6 +367,26 @@ class Job:
             except KeyError:
                 self._cached_statepoint = None
 
+    @property
+    def _lock(self):
+        """Get the lock of this job, which is created on first access."""
+        if self._rlock is None:
+            with Job._LOCK_CREATION_LOCK:
+                if self._rlock is None:
+                    self._rlock = RLock()
+        return self._rlock
+
+    def _get_state(self):
+        """Get the job's attributes except for its lock as a dict."""
+        state = {
+            name: getattr(self, name)
+            for name in Job.__slots__
+            if not name.startswith("__") and hasattr(self, name)
+        }
+        del state["_rlock"]
+        state.update(self.__dict__)
+        return state
+
     def _initialize_lazy_properties(self):
         """Initialize all properties that are designed to be loaded lazily."""
         with self._lock:
@@ -361,9 +441,7 @@ class Job:
         See :ref:`signac job -w <signac-cli-job>` for the command line equivalent.
         """
         if self._path is None:
-            # We can rely on the project workspace to be well-formed, so just
-            # use str.join with os.sep instead of os.path.join for speed.
-            self._path = os.sep.join((self._project.workspace, self.id))
+            self._path = self._project._job_path(self.id)
         return self._path
 
     def update_statepoint(self, update, overwrite=False):
@@ -769,6 +847,36 @@ class Job:
                 raise
         return self
 
+    def _init_new(self):
+        """Initialize the job's workspace directory if it does not exist yet.
+
+        Unlike :meth:`init`, the state point file of a new directory is not
+        read back for validation, since it was just written. Existing
+        directories are initialized with :meth:`init`.
+
+        Returns
+        -------
+        bool
+            True if the workspace directory was created.
+
+        """
+        with self._lock:
+            try:
+                os.makedirs(self.path)
+            except FileExistsError:
+                self.init()
+                return False
+            except OSError:
+                logger.error(
+                    "Error occurred while trying to create "
+                    "workspace directory for job '{}'.".format(self.id)
+                )
+                raise
+            self._directory_known = True
+            self.statepoint.save(force=True)
+            self._project._register(self.id, self._cached_statepoint)
+        return True
+
     def clear(self):
         """Remove all job data, but not the job itself.
 
@@ -846,7 +954,7 @@ class Job:
         with self._lock:
             statepoint = self.statepoint()
             dst = project.open_job(statepoint)
-            _mkdir_p(project.workspace)
+            _mkdir_p(os.path.dirname(dst.path))
             try:
                 os.replace(self.path, dst.path)
             except OSError as error:
@@ -862,7 +970,8 @@ class Job:
                     )
                 else:
                     raise error
-            self.__dict__.update(dst.__dict__)
+            for name, value in dst._get_state().items():
+                setattr(self, name, value)
 
             # Update the destination project's state point cache
             project._register(self.id, statepoint)
@@ -1065,15 +1174,14 @@ class Job:
         return False
 
     def __getstate__(self):
-        state = dict(self.__dict__)
-        # Locks are not pickleable and must be removed from the state
-        del state["_lock"]
-        return state
+        # Locks are not pickleable and are excluded from the state
+        return self._get_state()
 
     def __setstate__(self, state):
-        # Locks are not pickleable and must be added back to the state
-        state["_lock"] = RLock()
-        self.__dict__.update(state)
+        # Locks are not pickleable and are created again when needed
+        self._rlock = None
+        for name, value in state.items():
+            setattr(self, name, value)
         # We append to a list of jobs rather than replacing to support
         # transparent id updates between shallow copies of a job.
         self.statepoint._jobs.append(self)
@@ -1082,10 +1190,8 @@ class Job:
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
-        state = dict(self.__dict__)
-        # Locks are not pickleable and must be removed/added back
-        del state["_lock"]
-        for key, value in state.items():
+        # Locks are not pickleable and are created again when needed
+        result._rlock = None
+        for key, value in self._get_state().items():
             setattr(result, key, deepcopy(value, memo))
-        result._lock = RLock()
         return result
@@ -11,6 +11,7 @@ from .._utility import _print_err
 from ..version import SCHEMA_VERSION, __version__
 from .v0_to_v1 import _load_config_v1, _migrate_v0_to_v1
 from .v1_to_v2 import _load_config_v2, _migrate_v1_to_v2
+from .workspace_layout import _convert_workspace_layout
 
 FN_MIGRATION_LOCKFILE = ".SIGNAC_PROJECT_MIGRATION_LOCK"
 
@@ -131,6 +132,42 @@ def apply_migrations(root_directory):
             pass
 
 
+def apply_workspace_layout(root_directory, layout):
+    """Convert the workspace of a project to the given layout.
+
+    Projects with very many jobs may use the ``'sharded'`` workspace layout,
+    which places job directories in subdirectories named after the first two
+    characters of the job id instead of directly in the workspace directory
+    (the ``'flat'`` layout). The function is idempotent and completes an
+    interrupted conversion when called again. The project schema must be up to
+    date, see :func:`apply_migrations`.
+
+    Parameters
+    ----------
+    root_directory : str
+        The path to the project.
+    layout : str
+        The workspace layout, either ``'flat'`` or ``'sharded'``.
+    """
+    if _get_config_schema_version(root_directory, int(SCHEMA_VERSION)) != int(
+        SCHEMA_VERSION
+    ):
+        raise RuntimeError(
+            "The project schema must be migrated before converting the "
+            "workspace layout."
+        )
+    try:
+        lock = FileLock(os.path.join(root_directory, FN_MIGRATION_LOCKFILE))
+        with lock:
+            _convert_workspace_layout(root_directory, layout)
+    finally:
+        try:
+            os.unlink(lock.lock_file)
+        except FileNotFoundError:
+            pass
+
+
 __all__ = [
     "apply_migrations",
+    "apply_workspace_layout",
 ]
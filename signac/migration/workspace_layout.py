@@ -0,0 +1,74 @@
+# Copyright (c) 2026 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Convert the workspace of a project between the flat and sharded layouts.
+
+In the flat layout, all job directories are located directly within the
+workspace directory. In the sharded layout, job directories are located in
+subdirectories named after the first characters of the job id.
+
+The conversion is idempotent: it moves every job directory that is not yet in
+the requested layout, so that an interrupted conversion is completed by
+running it again.
+"""
+
+import os
+
+from .._config import _get_project_config_fn, _read_config_file
+from .._utility import _mkdir_p
+from ..project import JOB_ID_REGEX, SHARD_LENGTH, SHARD_REGEX, WORKSPACE_LAYOUTS
+
+
+def _shard_workspace(workspace):
+    """Move all job directories of a flat workspace into shard directories."""
+    for d in os.listdir(workspace):
+        if JOB_ID_REGEX.match(d):
+            shard = os.path.join(workspace, d[:SHARD_LENGTH])
+            _mkdir_p(shard)
+            os.replace(os.path.join(workspace, d), os.path.join(shard, d))
+
+
+def _flatten_workspace(workspace):
+    """Move all job directories of a sharded workspace into the workspace."""
+    for shard in os.listdir(workspace):
+        if SHARD_REGEX.match(shard):
+            shard = os.path.join(workspace, shard)
+            for d in os.listdir(shard):
+                if JOB_ID_REGEX.match(d):
+                    os.replace(os.path.join(shard, d), os.path.join(workspace, d))
+            try:
+                os.rmdir(shard)
+            except OSError:
+                # Keep shard directories that contain other files.
+                pass
+
+
+def _convert_workspace_layout(root_directory, layout):
+    """Convert the workspace of a project to the given layout.
+
+    Parameters
+    ----------
+    root_directory : str
+        The path to the project.
+    layout : str
+        The workspace layout, either ``'flat'`` or ``'sharded'``.
+
+    """
+    if layout not in WORKSPACE_LAYOUTS:
+        raise ValueError(
+            f"Unknown workspace layout '{layout}', expected one of "
+            f"{', '.join(WORKSPACE_LAYOUTS)}."
+        )
+    workspace = os.path.join(root_directory, "workspace")
+    if os.path.isdir(workspace):
+        if layout == "sharded":
+            _shard_workspace(workspace)
+        else:
+            _flatten_workspace(workspace)
+
+    config = _read_config_file(_get_project_config_fn(root_directory))
+    if layout == "flat":
+        config.pop("workspace_layout", None)
+    else:
+        config["workspace_layout"] = layout
+    config.write()
@@ -7,23 +7,32 @@ import errno
 import gzip
 import json
 import logging
+import operator
 import os
 import re
 import shutil
 import time
+import uuid
 import warnings
+from bisect import bisect_left
 from collections import defaultdict
 from collections.abc import Iterable
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import timedelta
+from functools import partial
 from itertools import compress, groupby
 from multiprocessing.pool import ThreadPool
 from tempfile import TemporaryDirectory
 from threading import RLock
 
-from synced_collections.backends.collection_json import BufferedJSONAttrDict
+from synced_collections.backends.collection_json import (
+    BufferedJSONAttrDict,
+    json_attr_dict_validator,
+)
+from synced_collections.utils import SyncedCollectionJSONEncoder
 
+from ._cache_index import _CacheIndex, _write_cache_index
 from ._config import (
     _Config,
     _get_project_config_fn,
@@ -32,21 +41,31 @@ from ._config import (
     _raise_if_older_schema,
     _read_config_file,
 )
+from ._document_cache import _MTIME_GRANULARITY_NS, _DocumentCache
 from ._neighbor import get_neighbor_list
-from ._search_indexer import _DictPlaceholder, _SearchIndexer
+from ._persistent_index import _fingerprint, _read_index, _write_index
+from ._search_indexer import (
+    _CompiledFilter,
+    _DictPlaceholder,
+    _LazyDict,
+    _SearchIndexer,
+)
 from ._utility import (
     _mkdir_p,
     _nested_dicts_to_dotted_keys,
 )
 from .errors import (
+    ConfigError,
     DestinationExistsError,
+    DocumentWriteError,
     IncompatibleSchemaVersion,
     JobsCorruptedError,
+    KeyTypeError,
     WorkspaceError,
 )
-from .filterparse import _add_prefix, _root_keys, parse_filter
+from .filterparse import _add_prefix, parse_filter
 from .h5store import H5StoreManager
-from .job import Job, calc_id
+from .job import Job, calc_id, calc_ids
 from .schema import ProjectSchema
 from .sync import sync_projects
 from .version import SCHEMA_VERSION, __version__
@@ -56,6 +75,13 @@ logger = logging.getLogger(__name__)
 JOB_ID_LENGTH = 32
 JOB_ID_REGEX = re.compile(f"[a-f0-9]{{{JOB_ID_LENGTH}}}")
 
+# Length of the job id prefix used to name shard directories in the sharded
+# workspace layout, where job directories are located at workspace/ab/abcdef...
+SHARD_LENGTH = 2
+SHARD_REGEX = re.compile(f"[a-f0-9]{{{SHARD_LENGTH}}}$")
+
+WORKSPACE_LAYOUTS = ("flat", "sharded")
+
 
 def _split_and_print_progress(iterable, num_chunks=10, write=None, desc="Progress: "):
     """Split the progress and prints it.
@@ -142,6 +168,14 @@ class Project:
     is found, instead invoke :func:`~signac.get_project` or
     :meth:`Project.get_project`.
 
+    By default, all job directories are located directly within the workspace
+    directory. Projects with very many jobs may use the ``sharded`` workspace
+    layout instead, which distributes job directories over subdirectories named
+    after the first two characters of the job id, e.g.,
+    ``workspace/ab/abcdef...``. The layout is stored in the
+    ``workspace_layout`` configuration key and is changed with
+    ``signac migrate --workspace-layout``.
+
     Parameters
     ----------
     path : str, optional
@@ -159,6 +193,25 @@ class Project:
     FN_CACHE = os.sep.join((".signac", "statepoint_cache.json.gz"))
     "The default filename for the state point cache file."
 
+    FN_CACHE_JOURNAL = os.sep.join((".signac", "statepoint_cache_journal.jsonl"))
+    "The filename of the append-only journal of state point cache updates."
+
+    FN_CACHE_INDEX = os.sep.join((".signac", "statepoint_cache.bin"))
+    "The filename of the random-access binary copy of the state point cache file."
+
+    FN_SEARCH_INDEX_DIR = os.sep.join((".signac", "search_index"))
+    "The directory of the persistent search indexes."
+
+    FN_DOCUMENT_CACHE = os.sep.join((".signac", "job_document_cache.json.gz"))
+    "The filename of the persistent job document cache."
+
+    FN_STATEPOINT_UPDATE_JOURNAL = os.sep.join(
+        (".signac", "statepoint_update_journal.json")
+    )
+    "The filename of the journal of state point updates in progress."
+
+    _STREAM_CHUNK_SIZE = 100
+
     _use_pandas_for_html_repr = True  # toggle use of pandas for html repr
 
     def __init__(self, path=None):
@@ -189,6 +242,13 @@ class Project:
         # os.path is used instead of pathlib.Path for performance.
         self._path = os.path.abspath(path)
         self._workspace = os.path.join(self._path, "workspace")
+        workspace_layout = self.config.get("workspace_layout", "flat")
+        if workspace_layout not in WORKSPACE_LAYOUTS:
+            raise ConfigError(
+                f"Unknown workspace layout '{workspace_layout}', expected one of "
+                f"{', '.join(WORKSPACE_LAYOUTS)}."
+            )
+        self._sharded = workspace_layout == "sharded"
 
         # Prepare workspace directory.
         if not os.path.isdir(self.workspace):
@@ -209,11 +269,66 @@ class Project:
         # cache.
         self._sp_cache = {}
         self._sp_cache_read = False
+        self._sp_cache_index = None
+        # Ids removed by the cache journal that are stale in the cache index
+        self._sp_cache_removed = set()
         self._sp_cache_misses = 0
         self._sp_cache_warned = False
         self._sp_cache_miss_warning_threshold = self.config.get(
             "statepoint_cache_miss_warning_threshold", 500
         )
+        # The journal of the persistent state point cache is compacted into the
+        # cache file once it holds more entries than this fraction of the cache.
+        self._sp_cache_compaction_ratio = float(
+            self.config.get("statepoint_cache_compaction_ratio", 0.5)
+        )
+        # Sorted ids of the jobs in the workspace and the signature of the
+        # workspace directories they were listed from.
+        self._sorted_job_ids_cache = None
+
+        # Persistent search indexes of state point keys (opt-in)
+        self._persistent_search_index = self._get_config_flag("persistent_search_index")
+
+        # Vectorized evaluation of filters on numerical state point keys (opt-in)
+        self._vectorized_search = self._get_config_flag("vectorized_search")
+        if self._vectorized_search:
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                logger.warning(
+                    "Vectorized search requires the numpy package, falling back "
+                    "to the default search."
+                )
+                self._vectorized_search = False
+
+        # State point search index reused by prepared queries
+        self._reusable_index = None
+
+        # k-d tree for nearest state point queries
+        self._nearest_index = None
+
+        # Persistent cache of parsed job documents (opt-in)
+        self._document_cache = None
+        if self._get_config_flag("job_document_cache"):
+            self._document_cache = _DocumentCache(self.fn(self.FN_DOCUMENT_CACHE))
+
+        self._check_statepoint_update_journal()
+
+    def _get_config_flag(self, key):
+        """Return the value of a boolean configuration key, False if unset.
+
+        Raises
+        ------
+        ConfigError
+            If the value is not a boolean.
+
+        """
+        try:
+            return self.config.as_bool(key)
+        except KeyError:
+            return False
+        except ValueError as error:
+            raise ConfigError(f"Invalid value for '{key}': {error}")
 
     def __str__(self):
         return str(self.path)
@@ -313,18 +428,13 @@ class Project:
             Minimum string length of a unique job identifier.
 
         """
-        job_ids = list(self._find_job_ids())
-        tmp = set()
-        for i in range(JOB_ID_LENGTH):
-            tmp.clear()
-            for id_ in job_ids:
-                if id_[:i] in tmp:
-                    break
-                else:
-                    tmp.add(id_[:i])
-            else:
-                break
-        return i
+        job_ids = self._sorted_job_ids()
+        if len(job_ids) < 2:
+            return 0
+        # The longest common prefix of any two ids is shared by neighbors.
+        return 1 + max(
+            len(os.path.commonprefix(pair)) for pair in zip(job_ids, job_ids[1:])
+        )
 
     def fn(self, filename):
         """Prepend a filename with the project path.
@@ -523,11 +633,6 @@ class Project:
             than one match.
 
         """
-        if not self._sp_cache_read:
-            # Read the cache from disk on the first call.
-            self._sp_cache.update(self._read_cache())
-            self._sp_cache_read = True
-
         if statepoint is None and id is None:
             raise ValueError("Must provide statepoint or id.")
         elif statepoint is not None and id is not None:
@@ -537,15 +642,19 @@ class Project:
             return Job(project=self, statepoint=deepcopy(statepoint))
         try:
             # Optimal case (id is in the state point cache)
-            return Job(project=self, statepoint=self._sp_cache[id], id_=id)
+            return Job(project=self, statepoint=self._get_cached_statepoint(id), id_=id)
         except KeyError:
             # Worst case: no state point was provided and the state point cache
             # missed. The Job will register itself in self._sp_cache when the
             # state point is accessed.
             if len(id) < JOB_ID_LENGTH:
-                # Resolve partial job ids (first few characters) into a full job id
-                job_ids = self._find_job_ids()
-                matches = [id_ for id_ in job_ids if id_.startswith(id)]
+                # Resolve partial job ids (first few characters) into a full job
+                # id. Two candidates suffice to detect ambiguous ids.
+                job_ids = self._sorted_job_ids()
+                start = bisect_left(job_ids, id)
+                matches = [
+                    id_ for id_ in job_ids[start : start + 2] if id_.startswith(id)
+                ]
                 if len(matches) == 1:
                     id = matches[0]
                 elif len(matches) > 1:
@@ -558,6 +667,226 @@ class Project:
                 raise KeyError(id)
             return Job(project=self, id_=id, directory_known=True)
 
+    def init_jobs(self, statepoints, parallel=False):
+        """Initialize the jobs of many state points.
+
+        This is equivalent to calling ``project.open_job(statepoint).init()``
+        for each state point, but the job ids are computed in bulk with
+        :func:`~signac.job.calc_ids`, the workspace directories are created
+        concurrently, and the state point files of new jobs are not read back
+        for validation. Existing jobs are validated like with
+        :meth:`~signac.job.Job.init`. If the project has a persistent state
+        point cache, the new jobs are added to it once all jobs are
+        initialized.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            jobs = project.init_jobs(
+                ({"T": T, "p": p} for T in range(10) for p in range(100)),
+                parallel=8,
+            )
+
+        Parameters
+        ----------
+        statepoints : iterable
+            The state points of the jobs.
+        parallel : bool or int, optional
+            Compute the job ids in parallel processes and initialize the jobs
+            in parallel threads. Set to an integer to specify the number of
+            processes and threads or to True to use the default numbers
+            (Default value = False).
+
+        Returns
+        -------
+        list
+            The initialized jobs in the order of ``statepoints``.
+
+        Raises
+        ------
+        OSError
+            If a workspace directory cannot be created or any other I/O error
+            occurs when attempting to save a state point file.
+        JobsCorruptedError
+            If the state point of an existing job on disk is corrupted.
+
+        """
+        # All ids are computed before any directory is created.
+        statepoints = [deepcopy(sp) for sp in statepoints]
+        try:
+            ids = calc_ids(statepoints, parallel=parallel)
+        except TypeError:
+            raise KeyTypeError
+        jobs = [
+            Job(project=self, statepoint=sp, id_=id_)
+            for sp, id_ in zip(statepoints, ids)
+        ]
+        jobs_by_id = {job.id: job for job in jobs}
+        unique_jobs = list(jobs_by_id.values())
+        if parallel:
+            with ThreadPool(None if parallel is True else parallel) as pool:
+                created = pool.map(Job._init_new, unique_jobs)
+        else:
+            created = [job._init_new() for job in unique_jobs]
+        new_jobs = list(compress(unique_jobs, created))
+        if new_jobs and os.path.exists(self.fn(self.FN_CACHE)):
+            self._append_cache_journal(
+                {job.id: self._sp_cache[job.id] for job in new_jobs}
+            )
+        return [jobs_by_id[job.id] for job in jobs]
+
+    def update_statepoints(self, update_fn, filter=None, parallel=False):
+        """Update the state points of many jobs.
+
+        This is equivalent to assigning ``update_fn(job.statepoint())`` to
+        ``job.statepoint`` for each matching job, but all new job ids are
+        computed and checked for conflicts before any job is moved, and the
+        job directories are moved concurrently. The moves are recorded in a
+        journal, so that the update is rolled back if any move fails. An update
+        that was interrupted is reported with a warning when the project is
+        opened or checked and rolled back the next time this method or
+        :meth:`~signac.Project.repair` is called. If the project has a
+        persistent state point cache, it is updated once all jobs are moved.
+
+        .. warning::
+
+            Job handles opened before the update keep referring to the old job
+            ids. Open the jobs again after the update.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            # Add a new key with a default value to all state points.
+            project.update_statepoints(lambda sp: {**sp, "seed": 0}, parallel=8)
+
+        Parameters
+        ----------
+        update_fn : callable
+            A function that is called with a copy of the state point of each
+            job and returns the new state point.
+        filter : Mapping, optional
+            Only update the jobs matching this filter, see
+            :meth:`~signac.Project.find_jobs` for the supported filters
+            (Default value = None).
+        parallel : bool or int, optional
+            Move the job directories in parallel threads. Set to an integer to
+            specify the number of threads or to True to use the default number
+            of threads (Default value = False).
+
+        Returns
+        -------
+        dict
+            A mapping of the old ids to the new ids of all moved jobs.
+
+        Raises
+        ------
+        :class:`~signac.errors.DestinationExistsError`
+            If a new state point is the state point of another job or of
+            another updated job. No job is moved in this case.
+        OSError
+            If a job directory cannot be moved. All moved jobs are moved back
+            in this case.
+
+        """
+        fn_journal = self.fn(self.FN_STATEPOINT_UPDATE_JOURNAL)
+        if os.path.exists(fn_journal):
+            logger.warning("Rolling back an interrupted state point update.")
+            self._rollback_statepoint_update()
+
+        job_ids = self._find_job_ids(filter)
+        moves = []
+        new_ids = set()
+        for job_id in job_ids:
+            statepoint = self._get_statepoint(job_id)
+            new_statepoint = update_fn(deepcopy(statepoint))
+            new_id = calc_id(new_statepoint)
+            if new_id == job_id:
+                continue
+            if new_id in new_ids or self._contains_job_id(new_id):
+                raise DestinationExistsError(new_id)
+            new_ids.add(new_id)
+            moves.append((job_id, new_id, statepoint, new_statepoint))
+        if not moves:
+            return {}
+
+        # The journal is replaced atomically, so that an interrupted write does
+        # not leave a truncated journal behind that cannot be rolled back.
+        fn_journal_tmp = fn_journal + "~"
+        try:
+            with open(fn_journal_tmp, "w") as journal:
+                json.dump(moves, journal)
+        except OSError:  # clean-up
+            try:
+                os.remove(fn_journal_tmp)
+            except OSError:
+                pass
+            raise
+        else:
+            os.replace(fn_journal_tmp, fn_journal)
+
+        def _move(move):
+            job_id, new_id, _, new_statepoint = move
+            try:
+                new_path = self._job_path(new_id)
+                _mkdir_p(os.path.dirname(new_path))
+                os.replace(self._job_path(job_id), new_path)
+                job = Job(project=self, statepoint=new_statepoint, id_=new_id)
+                job.statepoint.save(force=True)
+            except Exception as error:
+                # Errors are raised once all moves are completed, so that no
+                # job is moved while rolling back.
+                return error
+
+        if parallel:
+            with ThreadPool(None if parallel is True else parallel) as pool:
+                errors = pool.map(_move, moves)
+        else:
+            errors = [_move(move) for move in moves]
+        for error in errors:
+            if error is not None:
+                logger.error("State point update failed, moving jobs back.")
+                self._rollback_statepoint_update()
+                raise error
+
+        for job_id, new_id, _, new_statepoint in moves:
+            self._sp_cache.pop(job_id, None)
+            self._register(new_id, new_statepoint)
+        os.remove(fn_journal)
+        if os.path.exists(self.fn(self.FN_CACHE)):
+            self.update_cache()
+        logger.info(f"Updated the state points of {len(moves)} job(s).")
+        return {job_id: new_id for job_id, new_id, _, _ in moves}
+
+    def _check_statepoint_update_journal(self):
+        """Warn if the workspace contains an interrupted state point update."""
+        if os.path.exists(self.fn(self.FN_STATEPOINT_UPDATE_JOURNAL)):
+            logger.warning(
+                "The workspace contains an interrupted state point update. Call "
+                "Project.repair() or Project.update_statepoints() to roll it back."
+            )
+
+    def _rollback_statepoint_update(self):
+        """Move the jobs of an incomplete state point update back.
+
+        The moves are read from the state point update journal, which is
+        removed once all jobs are moved back.
+        """
+        fn_journal = self.fn(self.FN_STATEPOINT_UPDATE_JOURNAL)
+        with open(fn_journal) as journal:
+            moves = json.load(journal)
+        for job_id, new_id, statepoint, _ in moves:
+            path = self._job_path(job_id)
+            new_path = self._job_path(new_id)
+            if os.path.isdir(new_path) and not os.path.exists(path):
+                _mkdir_p(os.path.dirname(path))
+                os.replace(new_path, path)
+                job = Job(project=self, statepoint=statepoint, id_=job_id)
+                job.statepoint.save(force=True)
+            self._sp_cache.pop(new_id, None)
+        os.remove(fn_journal)
+
     def _job_dirs(self):
         """Generate ids of jobs in the workspace.
 
@@ -568,9 +897,16 @@ class Project:
 
         """
         try:
-            for d in os.listdir(self.workspace):
-                if JOB_ID_REGEX.match(d):
-                    yield d
+            if self._sharded:
+                for shard in os.listdir(self.workspace):
+                    if SHARD_REGEX.match(shard):
+                        for d in os.listdir(os.sep.join((self.workspace, shard))):
+                            if JOB_ID_REGEX.match(d):
+                                yield d
+            else:
+                for d in os.listdir(self.workspace):
+                    if JOB_ID_REGEX.match(d):
+                        yield d
         except OSError as error:
             if error.errno == errno.ENOENT:
                 if os.path.islink(self.workspace):
@@ -592,6 +928,80 @@ class Project:
                 )
                 raise WorkspaceError(error)
 
+    def _workspace_signature(self):
+        """Return the inode and modification time of the workspace directories.
+
+        Adding or removing a job directory modifies its parent directory.
+
+        Returns
+        -------
+        tuple or None
+            The signature of the workspace directory and, in the sharded
+            layout, of all shard directories, or None if the workspace is not
+            accessible.
+
+        """
+        try:
+            stats = [os.stat(self.workspace)]
+            if self._sharded:
+                for shard in sorted(os.listdir(self.workspace)):
+                    if SHARD_REGEX.match(shard):
+                        stats.append(os.stat(os.sep.join((self.workspace, shard))))
+        except OSError:
+            return None
+        return tuple((stat.st_ino, stat.st_mtime_ns) for stat in stats)
+
+    def _sorted_job_ids(self):
+        """Return the sorted ids of the jobs in the workspace.
+
+        The sorted ids are kept in memory and reused as long as the workspace
+        directories are unchanged. Since file systems may store modification
+        times with a coarse granularity, the ids are only reused if the
+        directories were last modified well before they were listed.
+
+        Returns
+        -------
+        list[str]
+            The sorted job ids.
+
+        """
+        listed_ns = time.time_ns()
+        signature = self._workspace_signature()
+        if (
+            self._sorted_job_ids_cache is not None
+            and self._sorted_job_ids_cache[0] == signature
+        ):
+            return self._sorted_job_ids_cache[1]
+        job_ids = sorted(self._job_dirs())
+        if signature is not None and all(
+            mtime_ns < listed_ns - _MTIME_GRANULARITY_NS for _, mtime_ns in signature
+        ):
+            self._sorted_job_ids_cache = (signature, job_ids)
+        else:
+            self._sorted_job_ids_cache = None
+        return job_ids
+
+    def _job_path(self, job_id):
+        """Return the path of a job directory in the workspace.
+
+        Parameters
+        ----------
+        job_id : str
+            The job id.
+
+        Returns
+        -------
+        str
+            The job directory.
+
+        """
+        # Performance-critical path. We can rely on the project workspace and
+        # job id to be well-formed, so just use str.join with os.sep instead of
+        # os.path.join for speed.
+        if self._sharded:
+            return os.sep.join((self.workspace, job_id[:SHARD_LENGTH], job_id))
+        return os.sep.join((self.workspace, job_id))
+
     def __len__(self):
         # We simply count the the number of valid directories and avoid building a list
         # for improved performance.
@@ -614,10 +1024,7 @@ class Project:
             True if the job id is initialized for this project.
 
         """
-        # Performance-critical path. We can rely on the project workspace and
-        # job id to be well-formed, so just use str.join with os.sep instead of
-        # os.path.join for speed.
-        return os.path.exists(os.sep.join((self.workspace, job_id)))
+        return os.path.exists(self._job_path(job_id))
 
     def __contains__(self, job):
         """Determine whether a job is in the project's data space.
@@ -707,10 +1114,229 @@ class Project:
         if not filter:
             return list(self._job_dirs())
         filter = dict(parse_filter(_add_prefix(filter)))
+        return self._find_job_ids_compiled(_CompiledFilter.from_filter(filter))
+
+    def _find_job_ids_compiled(self, compiled, reuse_index=False):
+        """Find the job ids of all jobs matching a compiled filter.
+
+        Parameters
+        ----------
+        compiled : :class:`~signac._search_indexer._CompiledFilter`
+            The compiled filter with prefixed keys.
+        reuse_index : bool, optional
+            Whether to reuse the state point search index of previous calls
+            while the jobs in the workspace are unchanged (Default value =
+            False).
+
+        Returns
+        -------
+        list
+            The ids of all jobs matching the filter.
+
+        """
+        document_keys = _queried_document_keys(compiled)
+        if document_keys is not None and not document_keys:
+            if reuse_index:
+                index = self._get_reusable_index()
+            elif self._persistent_search_index:
+                index = self._build_persistent_index(compiled.keys)
+            else:
+                index = self._new_search_indexer(self._build_index())
+            return list(index._find_compiled(compiled))
+        # Job documents are only read for jobs that match all other
+        # expressions and only the queried keys are kept.
         index = _SearchIndexer(
-            self._build_index(include_job_document="doc" in _root_keys(filter))
+            self._build_index(include_job_document=True, document_keys=document_keys)
         )
-        return list(index.find(filter))
+        index.add_lazy_key("doc")
+        if reuse_index:
+            statepoint_index = self._get_reusable_index()
+            for key, key_index in statepoint_index._indexes.items():
+                index.add_index(key, key_index)
+        job_ids = list(index._find_compiled(compiled))
+        if reuse_index:
+            for key, key_index in index._indexes.items():
+                if key.split(".", 1)[0] == "sp":
+                    statepoint_index.add_index(key, key_index)
+        self._flush_document_cache(index)
+        return job_ids
+
+    def _find_job_ids_many(self, compiled_filters):
+        """Find the job ids of all jobs matching each of many compiled filters.
+
+        Parameters
+        ----------
+        compiled_filters : list
+            The compiled filters with prefixed keys, None matches all jobs.
+
+        Returns
+        -------
+        list[list]
+            The ids of all jobs matching each filter.
+
+        """
+        job_ids = list(self._job_dirs())
+        keys = set()
+        document_keys = set()
+        for compiled in compiled_filters:
+            if compiled is None:
+                continue
+            keys.update(compiled.keys)
+            queried_document_keys = _queried_document_keys(compiled)
+            if document_keys is not None:
+                if queried_document_keys is None:
+                    document_keys = None
+                else:
+                    document_keys.update(queried_document_keys)
+        if document_keys is not None and not document_keys:
+            if self._persistent_search_index:
+                index = self._build_persistent_index(keys)
+            else:
+                index = self._new_search_indexer(self._build_index(job_ids=job_ids))
+        else:
+            # The lazily read job documents are shared by all filters.
+            index = _SearchIndexer(
+                self._build_index(
+                    include_job_document=True,
+                    document_keys=document_keys,
+                    job_ids=job_ids,
+                )
+            )
+            index.add_lazy_key("doc")
+        results = [
+            list(job_ids) if compiled is None else list(index._find_compiled(compiled))
+            for compiled in compiled_filters
+        ]
+        self._flush_document_cache(job_ids)
+        return results
+
+    def _stream_job_ids(self, filter=None):
+        """Generate the job ids of all jobs matching the filter.
+
+        The workspace is scanned in chunks of jobs, which are searched as soon
+        as they are read, so that the first matches are found without reading
+        all state points.
+
+        Parameters
+        ----------
+        filter : Mapping, optional
+            A mapping of key-value pairs used for the query (Default value =
+            None).
+
+        Yields
+        ------
+        str
+            The ids of all jobs matching the filter.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        if not filter:
+            yield from self._job_dirs()
+            return
+        filter = dict(parse_filter(_add_prefix(filter)))
+        compiled = _CompiledFilter.from_filter(filter)
+        document_keys = _queried_document_keys(compiled)
+        include_job_document = document_keys is None or bool(document_keys)
+
+        def _search(job_ids):
+            index = _SearchIndexer(
+                self._build_index(
+                    include_job_document=include_job_document,
+                    document_keys=document_keys,
+                    job_ids=job_ids,
+                )
+            )
+            if include_job_document:
+                index.add_lazy_key("doc")
+            matches = index._find_compiled(compiled)
+            return [job_id for job_id in job_ids if job_id in matches]
+
+        chunk = []
+        for job_id in self._job_dirs():
+            chunk.append(job_id)
+            if len(chunk) == self._STREAM_CHUNK_SIZE:
+                yield from _search(chunk)
+                chunk = []
+        if chunk:
+            yield from _search(chunk)
+        self._flush_document_cache()
+
+    def _new_search_indexer(self, docs):
+        """Create a search indexer for state points using the configured engine."""
+        if self._vectorized_search:
+            from ._vectorized_search import _VectorizedSearchIndexer
+
+            return _VectorizedSearchIndexer(docs)
+        return _SearchIndexer(docs)
+
+    def _get_reusable_index(self):
+        """Return a state point search index of all jobs in the workspace.
+
+        The index and all indexes built for it are reused until jobs are added
+        to or removed from the workspace. Since job ids are hashes of the state
+        points, this also covers all changes of state points.
+
+        Returns
+        -------
+        :class:`~signac._search_indexer._SearchIndexer`
+            The search index.
+
+        """
+        job_ids = list(self._job_dirs())
+        fingerprint = _fingerprint(job_ids)
+        if self._reusable_index is None or self._reusable_index[0] != fingerprint:
+            index = self._new_search_indexer(
+                (job_id, {"sp": self._get_statepoint(job_id)}) for job_id in job_ids
+            )
+            self._reusable_index = (fingerprint, index)
+        return self._reusable_index[1]
+
+    def _build_persistent_index(self, keys):
+        """Build a search index from persistent search indexes.
+
+        Indexes of the queried state point keys are read from the project's
+        search index directory. Missing or outdated indexes are built from the
+        state points and written to disk for subsequent queries.
+
+        Parameters
+        ----------
+        keys : iterable
+            The queried state point keys.
+
+        Returns
+        -------
+        :class:`~signac._search_indexer._SearchIndexer`
+            A search index with indexes for all queried keys.
+
+        """
+        job_ids = list(self._job_dirs())
+        fingerprint = _fingerprint(job_ids)
+        directory = self.fn(self.FN_SEARCH_INDEX_DIR)
+        indexes = {key: _read_index(directory, key, fingerprint) for key in keys}
+        missing = [key for key, index in indexes.items() if index is None]
+        if missing:
+            search_index = _SearchIndexer(
+                (job_id, {"sp": self._get_statepoint(job_id)}) for job_id in job_ids
+            )
+            for key in missing:
+                try:
+                    _write_index(
+                        directory, key, fingerprint, search_index.build_index(key)
+                    )
+                except OSError as error:
+                    logger.warning(f"Unable to write search index for '{key}': {error}")
+        else:
+            # All queried indexes are available, so no state point is needed.
+            search_index = _SearchIndexer(dict.fromkeys(job_ids))
+            for key, index in indexes.items():
+                search_index.add_index(key, index)
+        return search_index
 
     def find_jobs(self, filter=None):
         """Find all jobs in the project's workspace.
@@ -729,8 +1355,8 @@ class Project:
 
         .. tip::
 
-            To find many groups of jobs, use your own code to loop through the project
-            once and build multiple matching lists.
+            To find the jobs matching many filters, use `find_jobs_many` to
+            search the project once for all filters.
 
         .. warning::
 
@@ -760,6 +1386,378 @@ class Project:
             filter = {}
         return JobsCursor(self, dict(parse_filter(filter)))
 
+    def find_jobs_many(self, filters):
+        """Find the jobs in the project's workspace matching each of many filters.
+
+        This is equivalent to calling :meth:`~signac.Project.find_jobs` for
+        each filter, but all filters are evaluated on a shared search index
+        built in a single pass over the workspace. Each job document is read
+        at most once for all filters.
+
+        Parameters
+        ----------
+        filters : iterable of Mapping
+            The filters, see :meth:`~signac.Project.find_jobs` for the
+            supported queries. Filters may be None to match all jobs.
+
+        Returns
+        -------
+        list[:class:`~signac.project.JobsCursor`]
+            One JobsCursor of the matching jobs per filter.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        filters = [dict(parse_filter(filter)) if filter else {} for filter in filters]
+        compiled_filters = [
+            (
+                _CompiledFilter.from_filter(dict(parse_filter(_add_prefix(filter))))
+                if filter
+                else None
+            )
+            for filter in filters
+        ]
+        cursors = []
+        for filter, job_ids in zip(filters, self._find_job_ids_many(compiled_filters)):
+            cursor = JobsCursor(self, filter)
+            cursor._id_cache = job_ids
+            cursors.append(cursor)
+        return cursors
+
+    def stream_jobs(self, filter=None):
+        """Generate all jobs in the project's workspace matching the filter.
+
+        In contrast to :meth:`~signac.Project.find_jobs`, the workspace is
+        searched while it is scanned, such that the first matching jobs are
+        generated before all state points and documents have been read. Only
+        a small chunk of jobs is held in memory at a time. See
+        :meth:`~signac.Project.find_jobs` for the supported filters.
+
+        Parameters
+        ----------
+        filter : Mapping, optional
+            A mapping of key-value pairs used for the query (Default value =
+            None).
+
+        Yields
+        ------
+        :class:`~signac.job.Job`
+            The jobs matching the filter.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        for job_id in self._stream_job_ids(filter):
+            yield Job(project=self, id_=job_id, directory_known=True)
+
+    def _query_job_ids(self, filter):
+        """Find the job ids matching a filter, reusing the search indexes.
+
+        Parameters
+        ----------
+        filter : Mapping
+            A mapping of key-value pairs used for the query.
+
+        Returns
+        -------
+        list
+            The ids of all jobs matching the filter.
+
+        """
+        compiled = _CompiledFilter.from_filter(
+            dict(parse_filter(_add_prefix(dict(parse_filter(filter)))))
+        )
+        return self._find_job_ids_compiled(compiled, reuse_index=True)
+
+    def count(self, filter=None):
+        """Count the jobs in the project's workspace matching the filter.
+
+        The jobs are counted from the search indexes without creating job
+        handles. See :meth:`~signac.Project.find_jobs` for the supported
+        filters.
+
+        Parameters
+        ----------
+        filter : Mapping, optional
+            A mapping of key-value pairs used for the query (Default value =
+            None).
+
+        Returns
+        -------
+        int
+            The number of matching jobs.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        if not filter:
+            return len(self)
+        return len(self._query_job_ids(filter))
+
+    def value_counts(self, key, filter=None):
+        """Count the jobs per value of a state point or document key.
+
+        Prepend the key with 'sp.' or 'doc.' to specify the query namespace. If
+        no prefix is specified, the state point key is counted. The counts are
+        computed from the search index of the key without creating job
+        handles. State point indexes are reused while the jobs in the
+        workspace are unchanged.
+
+        Jobs without the key are not counted. List values are returned as
+        tuples. Values that are dicts are not counted, count their nested
+        keys instead. Numerically equal values, such as 1 and 1.0, are counted
+        together.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            # Count the jobs per temperature that are not done yet.
+            for T, count in project.value_counts("T", {"doc.done": False}).items():
+                print(T, count)
+
+        Parameters
+        ----------
+        key : str
+            The key of the values.
+        filter : Mapping, optional
+            Only count the jobs matching this filter, see
+            :meth:`~signac.Project.find_jobs` for the supported filters
+            (Default value = None).
+
+        Returns
+        -------
+        dict
+            The number of jobs per value, sorted by value if the values are
+            comparable.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        (key,) = dict(_add_prefix({key: None}))
+        job_ids = self._query_job_ids(filter) if filter else None
+        nodes = key.split(".")
+        if nodes[0] == "sp":
+            index = self._get_reusable_index().build_index(key)
+        else:
+            document_index = _SearchIndexer(
+                self._build_index(
+                    include_job_document=True,
+                    document_keys=set(nodes[1:2]) or None,
+                    job_ids=job_ids,
+                )
+            )
+            index = document_index.build_index(key)
+            self._flush_document_cache(document_index if job_ids is None else None)
+        if job_ids is not None:
+            job_ids = set(job_ids)
+        counts = {}
+        for value, ids in index.items():
+            if value is _DictPlaceholder:
+                continue
+            count = len(ids) if job_ids is None else len(ids.intersection(job_ids))
+            if count:
+                counts[value] = counts.get(value, 0) + count
+        try:
+            return dict(sorted(counts.items()))
+        except TypeError:
+            return counts
+
+    def distinct(self, key, filter=None):
+        """Return the distinct values of a state point or document key.
+
+        See :meth:`~signac.Project.value_counts` for the supported keys and
+        values.
+
+        Parameters
+        ----------
+        key : str
+            The key of the values.
+        filter : Mapping, optional
+            Only include the values of the jobs matching this filter, see
+            :meth:`~signac.Project.find_jobs` for the supported filters
+            (Default value = None).
+
+        Returns
+        -------
+        list
+            The distinct values, sorted if the values are comparable.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+
+        """
+        return list(self.value_counts(key, filter))
+
+    def read_documents(self, jobs, keys=None, parallel=False):
+        """Read the documents of many jobs.
+
+        The documents are read directly from the job directories without
+        opening the job documents, optionally in parallel threads to hide the
+        latency of reading many files. Changes made to job documents in
+        buffered mode are only read once they are flushed.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            docs = project.read_documents(project.find_jobs({"T": 1.0}), keys=["E"])
+            energies = [doc.get("E") for doc in docs]
+
+        Parameters
+        ----------
+        jobs : iterable
+            The jobs of this project whose documents are read.
+        keys : iterable of str, optional
+            The top-level keys of the documents to read, all keys if None
+            (Default value = None).
+        parallel : bool or int, optional
+            Read the documents in parallel threads. Set to an integer to
+            specify the number of threads or to True to use the default number
+            of threads (Default value = False).
+
+        Returns
+        -------
+        list
+            The documents as dicts in the order of ``jobs``. The documents of
+            jobs without a document are empty.
+
+        """
+        if isinstance(jobs, JobsCursor):
+            job_ids = jobs._ids
+        else:
+            job_ids = [job.id for job in jobs]
+        if keys is not None:
+            keys = set(keys)
+        read = partial(self._read_job_document, keys=keys)
+        if parallel:
+            with ThreadPool(None if parallel is True else parallel) as pool:
+                documents = pool.map(read, job_ids)
+        else:
+            documents = list(map(read, job_ids))
+        if self._document_cache is not None:
+            self._flush_document_cache()
+            # Cached documents are shared with the cache.
+            documents = [deepcopy(document) for document in documents]
+        return documents
+
+    @contextmanager
+    def document_batch(self, parallel=False):
+        """Context manager for updating the documents of many jobs at once.
+
+        Updates of the top-level keys of job documents are collected in a
+        batch and written when the context is exited, optionally in parallel
+        threads. All updates of a job are merged into a single write that
+        atomically replaces the document file. If the context is exited with
+        an exception, no document is written.
+
+        The updates are written even if the documents of some jobs cannot be
+        written, in which case a
+        :class:`~signac.errors.DocumentWriteError` is raised at the end.
+
+        .. warning::
+
+            Job documents opened in buffered mode overwrite the updates of a
+            batch when they are flushed.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            with project.document_batch(parallel=8) as batch:
+                for job in project.find_jobs({"T": 1.0}):
+                    batch[job]["status"] = "done"
+
+        Parameters
+        ----------
+        parallel : bool or int, optional
+            Write the documents in parallel threads. Set to an integer to
+            specify the number of threads or to True to use the default number
+            of threads (Default value = False).
+
+        Yields
+        ------
+        batch
+            The batch, which maps each job of this project to a dict of the
+            updates of its document. Jobs of other projects are rejected with
+            a ValueError.
+
+        Raises
+        ------
+        :class:`~signac.errors.DocumentWriteError`
+            If the documents of one or more jobs could not be written.
+
+        """
+        batch = _DocumentBatch(self)
+        yield batch
+        batch._write(parallel)
+
+    def prepare_query(self, filter=None):
+        """Prepare a search query for repeated use.
+
+        The filter is parsed, validated, and compiled once, see
+        :meth:`~signac.Project.find_jobs` for the supported filters. Searches
+        with the prepared query reuse the search indexes of previous searches
+        while the jobs in the workspace are unchanged, which is much faster
+        than calling :meth:`~signac.Project.find_jobs` for many filters in a
+        loop.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            query = project.prepare_query({"a": {"$gt": 0}, "doc.done": False})
+            while True:
+                for job in query.find_jobs():
+                    ...
+
+        Parameters
+        ----------
+        filter : Mapping, optional
+            A mapping of key-value pairs used for the query (Default value =
+            None).
+
+        Returns
+        -------
+        :class:`~signac.project.PreparedQuery`
+            The prepared query.
+
+        Raises
+        ------
+        TypeError
+            If the filters are not JSON serializable.
+        ValueError
+            If the filters are invalid.
+        KeyError
+            If the filters contain invalid operators.
+
+        """
+        return PreparedQuery(self, filter)
+
     def __iter__(self):
         return iter(self.find_jobs())
 
@@ -876,10 +1874,10 @@ class Project:
             When one or more jobs are identified as corrupted.
 
         """
-        # Performance-critical path. We can rely on the project workspace, job
-        # id, and state point file name to be well-formed, so just use str.join
-        # with os.sep instead of os.path.join for speed.
-        fn_statepoint = os.sep.join((self.workspace, job_id, Job.FN_STATE_POINT))
+        # Performance-critical path. We can rely on the job directory and state
+        # point file name to be well-formed, so just use str.join with os.sep
+        # instead of os.path.join for speed.
+        fn_statepoint = os.sep.join((self._job_path(job_id), Job.FN_STATE_POINT))
         try:
             with open(fn_statepoint, "rb") as statepoint_file:
                 statepoint = json.loads(statepoint_file.read().decode())
@@ -888,7 +1886,7 @@ class Project:
 
                 return statepoint
         except (OSError, ValueError) as error:
-            if os.path.isdir(os.sep.join((self.workspace, job_id))):
+            if os.path.isdir(self._job_path(job_id)):
                 logger.error(
                     "Error while trying to access state point file of job '{}': '{}'.".format(
                         job_id, error
@@ -897,6 +1895,78 @@ class Project:
                 raise JobsCorruptedError([job_id])
             raise KeyError(job_id)
 
+    def _get_cached_statepoint(self, job_id):
+        """Look up a state point in the in-memory or persistent cache.
+
+        On the first call, the persistent cache is prepared for lookups. If a
+        binary cache index is available, it is memory-mapped and only the
+        requested state points are decoded. Otherwise, the complete cache file
+        is read.
+
+        Parameters
+        ----------
+        job_id : str
+            A job id to get the state point for.
+
+        Returns
+        -------
+        dict
+            The state point corresponding to job_id.
+
+        Raises
+        ------
+        KeyError
+            If the state point is not cached.
+
+        """
+        if not self._sp_cache_read:
+            # Read the cache from disk on the first call.
+            self._sp_cache_index = self._open_cache_index()
+            if self._sp_cache_index is None:
+                self._sp_cache.update(self._read_cache())
+            else:
+                journal = {}
+                self._sp_cache_removed = set()
+                self._replay_cache_journal(journal, self._sp_cache_removed)
+                self._sp_cache.update(journal)
+            self._sp_cache_read = True
+        try:
+            return self._sp_cache[job_id]
+        except KeyError:
+            if self._sp_cache_index is None or job_id in self._sp_cache_removed:
+                raise
+            statepoint = self._sp_cache_index[job_id]
+            self._sp_cache[job_id] = statepoint
+            return statepoint
+
+    def _open_cache_index(self):
+        """Open the binary cache index if it is up to date with the cache file.
+
+        Returns
+        -------
+        :class:`~signac._cache_index._CacheIndex` or None
+            The cache index or None if it is missing, outdated, or invalid.
+
+        """
+        try:
+            if os.path.getmtime(self.fn(self.FN_CACHE_INDEX)) < os.path.getmtime(
+                self.fn(self.FN_CACHE)
+            ):
+                # The cache file was written by a version of signac that does
+                # not maintain the index.
+                return None
+            return _CacheIndex(self.fn(self.FN_CACHE_INDEX))
+        except (OSError, ValueError) as error:
+            logger.debug(f"Unable to use state point cache index: {error}")
+            return None
+
+    def _close_cache_index(self):
+        """Close the binary cache index, it is opened again on the next lookup."""
+        if self._sp_cache_index is not None:
+            self._sp_cache_index.close()
+            self._sp_cache_index = None
+            self._sp_cache_read = False
+
     def _get_statepoint(self, job_id, validate=True):
         """Get the state point associated with a job id.
 
@@ -925,13 +1995,9 @@ class Project:
             corrupted.
 
         """
-        if not self._sp_cache_read:
-            # Read the cache from disk on the first call.
-            self._sp_cache.update(self._read_cache())
-            self._sp_cache_read = True
         try:
             # State point cache hit
-            return self._sp_cache[job_id]
+            return self._get_cached_statepoint(job_id)
         except KeyError:
             # State point cache missed
             self._sp_cache_misses += 1
@@ -1039,6 +2105,7 @@ class Project:
         if copytree is None:
             copytree = shutil.copytree
         dst = self.open_job(job.statepoint())
+        _mkdir_p(os.path.dirname(dst.path))
         try:
             copytree(job.path, dst.path)
         except OSError as error:
@@ -1274,6 +2341,7 @@ class Project:
         """
         corrupted = []
         logger.info("Checking workspace for corruption...")
+        self._check_statepoint_update_journal()
         for job_id in self._find_job_ids():
             try:
                 self._get_statepoint_from_workspace(job_id)
@@ -1290,7 +2358,8 @@ class Project:
         """Attempt to repair the workspace after it got corrupted.
 
         This method will attempt to repair lost or corrupted job state point
-        files using a state point cache.
+        files using a state point cache. An interrupted state point update, see
+        :meth:`~signac.Project.update_statepoints`, is rolled back first.
 
         Parameters
         ----------
@@ -1303,6 +2372,10 @@ class Project:
             When one or more corrupted job could not be repaired.
 
         """
+        if os.path.exists(self.fn(self.FN_STATEPOINT_UPDATE_JOURNAL)):
+            logger.warning("Rolling back an interrupted state point update.")
+            self._rollback_statepoint_update()
+
         if job_ids is None:
             job_ids = self._find_job_ids()
 
@@ -1320,9 +2393,10 @@ class Project:
                         "The job id of job '{}' is incorrect; "
                         "it should be '{}'.".format(job_id, correct_id)
                     )
-                    invalid_wd = os.path.join(self.workspace, job_id)
-                    correct_wd = os.path.join(self.workspace, correct_id)
+                    invalid_wd = self._job_path(job_id)
+                    correct_wd = self._job_path(correct_id)
                     try:
+                        _mkdir_p(os.path.dirname(correct_wd))
                         os.replace(invalid_wd, correct_wd)
                     except OSError as error:
                         logger.critical(
@@ -1361,39 +2435,117 @@ class Project:
         if corrupted:
             raise JobsCorruptedError(corrupted)
 
-    def _build_index(self, include_job_document=False):
-        """Generate a basic state point index.
+    def _build_index(
+        self, include_job_document=False, document_keys=None, job_ids=None
+    ):
+        """Generate a basic state point index.
+
+        Parameters
+        ----------
+        include_job_document : bool, optional
+            Whether to include the job document in the index (Default value =
+            False). The job documents are read on first access.
+        document_keys : set, optional
+            The top-level keys of the job document to include, all keys if
+            None (Default value = None).
+        job_ids : iterable, optional
+            The ids of the jobs to include, all jobs in the workspace if None
+            (Default value = None).
+
+        Yields
+        ------
+        job_id : str
+            The job id.
+        doc : dict
+            Dictionary with keys ``sp`` containing the state point and ``doc``
+            containing the job document if requested.
+
+        """
+        if job_ids is None:
+            job_ids = self._find_job_ids()
+        for job_id in job_ids:
+            doc = {"sp": self._get_statepoint(job_id)}
+            if include_job_document:
+                doc["doc"] = _LazyDict(
+                    partial(self._read_job_document, job_id, document_keys)
+                )
+            yield job_id, doc
+
+    def _read_job_document(self, job_id, keys=None):
+        """Read the document of a job from disk.
+
+        Parameters
+        ----------
+        job_id : str
+            The job id.
+        keys : set, optional
+            The top-level keys to return, all keys if None (Default value =
+            None).
+
+        Returns
+        -------
+        dict
+            The job document, which is empty if the job has no document. If
+            the job document cache is enabled, the returned dict may be shared
+            with the cache and must not be modified.
+
+        """
+        # Performance-critical path. We can rely on the job directory and
+        # document file name to be well-formed, so just use str.join with
+        # os.sep instead of os.path.join for speed.
+        fn_document = os.sep.join((self._job_path(job_id), Job.FN_DOCUMENT))
+        if self._document_cache is None:
+            try:
+                with open(fn_document, "rb") as file:
+                    document = json.loads(file.read().decode())
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise
+                return {}
+        else:
+            document = self._document_cache.read(job_id, fn_document)
+            if document is None:
+                return {}
+        if keys is None:
+            return document
+        return {key: document[key] for key in keys if key in document}
+
+    def _get_job_document(self, job):
+        """Read the document of a job, using the job document cache if enabled.
+
+        Changes in buffered mode are not written to the document files yet, so
+        the cache is bypassed while the backend is buffered. Documents that are
+        read from the cache are copied, since they are shared with the cache.
 
         Parameters
         ----------
-        include_job_document : bool, optional
-            Whether to include the job document in the index (Default value =
-            False).
+        job : :class:`~signac.job.Job`
+            The job.
 
-        Yields
-        ------
-        job_id : str
-            The job id.
-        doc : dict
-            Dictionary with keys ``sp`` containing the state point and ``doc``
-            containing the job document if requested.
+        Returns
+        -------
+        dict or :class:`~synced_collections.backends.collection_json.BufferedJSONAttrDict`
+            A copy of the cached job document or the job document itself.
 
         """
-        for job_id in self._find_job_ids():
-            doc = {"sp": self._get_statepoint(job_id)}
-            if include_job_document:
-                try:
-                    # Performance-critical path. We can rely on the project
-                    # workspace, job id, and document file name to be
-                    # well-formed, so just use str.join with os.sep instead of
-                    # os.path.join for speed.
-                    fn_document = os.sep.join((self.workspace, job_id, Job.FN_DOCUMENT))
-                    with open(fn_document, "rb") as file:
-                        doc["doc"] = json.loads(file.read().decode())
-                except OSError as error:
-                    if error.errno != errno.ENOENT:
-                        raise
-            yield job_id, doc
+        if self._document_cache is None or BufferedJSONAttrDict.backend_is_buffered():
+            return job.document
+        return deepcopy(self._read_job_document(job.id))
+
+    def _flush_document_cache(self, job_ids=None):
+        """Write the job document cache to disk, if enabled.
+
+        Parameters
+        ----------
+        job_ids : iterable, optional
+            The ids of all jobs in the workspace, listed from the workspace if
+            None (Default value = None).
+
+        """
+        if self._document_cache is not None:
+            if job_ids is None:
+                job_ids = self._job_dirs()
+            self._document_cache.flush(set(job_ids))
 
     def _update_in_memory_cache(self):
         """Update the in-memory state point cache (self._sp_cache) to reflect the workspace."""
@@ -1429,12 +2581,14 @@ class Project:
             logger.debug("In-memory cache is up to date.")
 
     def _remove_persistent_cache_file(self):
-        """Remove the persistent cache file (if it exists)."""
-        try:
-            os.remove(self.fn(self.FN_CACHE))
-        except OSError as error:
-            if error.errno != errno.ENOENT:
-                raise error
+        """Remove the persistent cache file, its journal and index (if they exist)."""
+        self._close_cache_index()
+        for fn in (self.FN_CACHE, self.FN_CACHE_JOURNAL, self.FN_CACHE_INDEX):
+            try:
+                os.remove(self.fn(fn))
+            except OSError as error:
+                if error.errno != errno.ENOENT:
+                    raise error
 
     # TODO: change name to write_cache to better capture the meaning of this function?
     def update_cache(self):
@@ -1445,41 +2599,208 @@ class Project:
         operations, including iteration and filtering or selection are
         expected to be significantly faster after calling this function,
         especially for large data spaces.
+
+        Changes to the data space are appended to a journal next to the cache
+        file, so that the cost of an update scales with the number of added or
+        removed jobs rather than the size of the data space. The journal is
+        compacted into the cache file once it grows beyond a fraction of the
+        cache size, configurable with the ``statepoint_cache_compaction_ratio``
+        configuration key (Default value = 0.5).
         """
         logger.info("Update cache...")
         start = time.time()
-        self._update_in_memory_cache()
-        # now self._sp_cache matches the job ids in workspace
+        persistent_ids, num_journal_entries = self._read_persistent_cache_ids()
+        seeded = persistent_ids is None
+        if seeded:
+            # Without a cache index, the state points are decoded to obtain the
+            # ids. Seed the in-memory cache with them, so that they do not need
+            # to be read from the workspace again.
+            persistent_cache, num_journal_entries = self._read_persistent_cache()
+            for id_, statepoint in persistent_cache.items():
+                self._sp_cache.setdefault(id_, statepoint)
+            persistent_ids = set(persistent_cache)
 
-        cache_file = self._read_cache()
+        job_ids = set(self._job_dirs())
+        to_add = job_ids.difference(persistent_ids)
+        to_remove = persistent_ids.difference(job_ids)
 
-        # don't update _sp_cache from the disk cache so we can remove
-        # jobs from disk cache that aren't in the workspace
+        if persistent_ids and not (to_add or to_remove):
+            logger.info("Cache is up to date.")
+            return
+
+        num_journal_entries += len(to_add) + len(to_remove)
+        if (
+            not persistent_ids
+            or num_journal_entries > self._sp_cache_compaction_ratio * len(job_ids)
+        ):
+            # Compaction rewrites the cache file with all state points.
+            if not seeded:
+                for id_, statepoint in self._read_cache().items():
+                    self._sp_cache.setdefault(id_, statepoint)
+            self._update_in_memory_cache()
+            # now self._sp_cache matches the job ids in workspace
+            self._write_cache_file()
+        else:
+            # Only the state points of added jobs are read from the workspace.
+            for id_ in to_remove:
+                self._sp_cache.pop(id_, None)
+            to_read = [id_ for id_ in to_add if id_ not in self._sp_cache]
+            with ThreadPool() as pool:
+                statepoints = pool.map(self._get_statepoint_from_workspace, to_read)
+            self._sp_cache.update(zip(to_read, statepoints))
+            self._sp_cache_removed.difference_update(to_add)
+            self._sp_cache_removed.update(to_remove)
+            self._append_cache_journal(
+                {id_: self._sp_cache[id_] for id_ in to_add}, to_remove
+            )
+        delta = time.time() - start
+        logger.info(f"Updated cache in {delta:.3f} seconds.")
+        return len(job_ids)
 
-        cached_ids = set(self._sp_cache)
+    def _write_cache_file(self):
+        """Write the in-memory state point cache to disk and clear the journal.
 
-        if cache_file == {} or set(cache_file) != cached_ids:
-            fn_cache = self.fn(self.FN_CACHE)
-            fn_cache_tmp = fn_cache + "~"
+        A binary index of the cache file is written as well. It provides random
+        access to individual state points without reading the whole cache.
+        """
+        # The memory map must be released before the index file is replaced.
+        self._close_cache_index()
+        fn_cache = self.fn(self.FN_CACHE)
+        fn_cache_tmp = fn_cache + "~"
+        try:
+            with gzip.open(fn_cache_tmp, "wb") as cachefile:
+                cachefile.write(json.dumps(self._sp_cache).encode())
+        except OSError:  # clean-up
             try:
-                with gzip.open(fn_cache_tmp, "wb") as cachefile:
-                    cachefile.write(json.dumps(self._sp_cache).encode())
-            except OSError:  # clean-up
-                try:
-                    os.remove(fn_cache_tmp)
-                except OSError:
-                    pass
-                raise
-            else:
-                os.replace(fn_cache_tmp, fn_cache)
-            delta = time.time() - start
-            logger.info(f"Updated cache in {delta:.3f} seconds.")
-            return len(self._sp_cache)
+                os.remove(fn_cache_tmp)
+            except OSError:
+                pass
+            raise
         else:
-            logger.info("Cache is up to date.")
+            os.replace(fn_cache_tmp, fn_cache)
+        try:
+            _write_cache_index(self.fn(self.FN_CACHE_INDEX), self._sp_cache)
+        except OSError as error:
+            # Other processes may prevent replacing a memory-mapped file on
+            # some platforms. The outdated index is ignored by readers.
+            logger.warning(f"Unable to write state point cache index: {error}")
+        try:
+            os.remove(self.fn(self.FN_CACHE_JOURNAL))
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
 
-    def _read_cache(self):
-        """Read and return the file cache."""
+    def _append_cache_journal(self, added, removed=()):
+        """Append a record of added and removed jobs to the cache journal.
+
+        Parameters
+        ----------
+        added : dict
+            Mapping of job ids to state points that were added.
+        removed : iterable[str], optional
+            Ids of jobs that were removed (Default value = ()).
+
+        """
+        record = json.dumps({"add": added, "remove": sorted(removed)}) + "\n"
+        # A single write of the complete record to a file opened in append
+        # mode, so that concurrent writers do not interleave partial records.
+        with open(self.fn(self.FN_CACHE_JOURNAL), "a+b") as journal:
+            # Terminate a record truncated by an interrupted write, so that it
+            # does not share a line with this record.
+            end = journal.seek(0, os.SEEK_END)
+            if end:
+                journal.seek(end - 1)
+                if journal.read(1) != b"\n":
+                    record = "\n" + record
+            journal.write(record.encode())
+
+    def _read_persistent_cache_ids(self):
+        """Read the ids of the persistent cache without decoding state points.
+
+        The ids are read from the binary cache index and the cache journal.
+
+        Returns
+        -------
+        persistent_ids : set or None
+            The ids of the cached jobs or None if no up-to-date cache index is
+            available.
+        num_journal_entries : int
+            Number of added and removed ids recorded in the journal.
+
+        """
+        index = self._sp_cache_index
+        if index is None:
+            index = self._open_cache_index()
+            if index is None:
+                return None, 0
+        try:
+            persistent_ids = set(index)
+        finally:
+            if index is not self._sp_cache_index:
+                index.close()
+        journal = {}
+        removed = set()
+        num_journal_entries = self._replay_cache_journal(journal, removed)
+        persistent_ids.difference_update(removed)
+        persistent_ids.update(journal)
+        return persistent_ids, num_journal_entries
+
+    def _read_persistent_cache(self):
+        """Read the cache file and replay the cache journal on top of it.
+
+        Returns
+        -------
+        cache : dict
+            Mapping of job ids to state points.
+        num_journal_entries : int
+            Number of added and removed ids recorded in the journal.
+
+        """
+        cache = self._read_cache_file()
+        return cache, self._replay_cache_journal(cache)
+
+    def _replay_cache_journal(self, cache, removed=None):
+        """Apply the records of the cache journal to a cache.
+
+        Parameters
+        ----------
+        cache : dict
+            Mapping of job ids to state points that is updated in place.
+        removed : set, optional
+            Set that is updated in place with the ids that are removed by the
+            journal and not added again (Default value = None).
+
+        Returns
+        -------
+        int
+            Number of added and removed ids recorded in the journal.
+
+        """
+        num_journal_entries = 0
+        try:
+            with open(self.fn(self.FN_CACHE_JOURNAL), "rb") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line.decode())
+                    except ValueError:
+                        # A truncated record from an interrupted write. The
+                        # cache is only a cache, so it is safe to skip it.
+                        logger.warning("Skipping corrupted state point cache record.")
+                        continue
+                    cache.update(record["add"])
+                    for id_ in record["remove"]:
+                        cache.pop(id_, None)
+                    if removed is not None:
+                        removed.difference_update(record["add"])
+                        removed.update(record["remove"])
+                    num_journal_entries += len(record["add"]) + len(record["remove"])
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+        return num_journal_entries
+
+    def _read_cache_file(self):
+        """Read and return the contents of the cache file."""
         logger.debug("Reading cache file...")
         start = time.time()
         try:
@@ -1495,6 +2816,10 @@ class Project:
             logger.debug(f"Read cache in {delta:.3f} seconds.")
             return cache
 
+    def _read_cache(self):
+        """Read and return the file cache."""
+        return self._read_persistent_cache()[0]
+
     @contextmanager
     def temporary_project(self, dir=None):
         """Context manager for the initialization of a temporary project.
@@ -1661,6 +2986,12 @@ class Project:
         state = dict(self.__dict__)
         # Locks are not pickleable and must be removed from the state
         del state["_lock"]
+        # The reusable search index is rebuilt on demand
+        state["_reusable_index"] = None
+        # Memory maps are not pickleable and are opened again on demand
+        if state["_sp_cache_index"] is not None:
+            state["_sp_cache_index"] = None
+            state["_sp_cache_read"] = False
         return state
 
     def __setstate__(self, state):
@@ -1755,6 +3086,96 @@ class Project:
         # pass a copy of cache
         return get_neighbor_list(dict(self._sp_cache), sorted_schema, ignore)
 
+    def find_nearest(self, statepoint, keys=None, k=1, scale=None):
+        """Find the jobs with the state points nearest to a state point.
+
+        The distance between two state points is the Euclidean distance of
+        their values of the numerical keys. Jobs without a numerical value for
+        any of the keys are ignored. The values of each key can be divided by
+        a scale, for example to compare keys of different units or
+        magnitudes.
+
+        The jobs are found with a k-d tree of the state points, which is reused
+        while the jobs in the workspace are unchanged.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            # The five jobs closest to T=1.0, P=2.5 where P varies more.
+            for job in project.find_nearest(
+                {"T": 1.0, "P": 2.5}, k=5, scale={"P": 10.0}
+            ):
+                print(job.id, job.sp.T, job.sp.P)
+
+        Parameters
+        ----------
+        statepoint : Mapping
+            The state point to find the nearest jobs for.
+        keys : sequence of str, optional
+            The state point keys of the distance in dotted key format. By
+            default, all keys of ``statepoint`` are used (Default value =
+            None).
+        k : int, optional
+            The number of jobs to find (Default value = 1).
+        scale : Mapping, optional
+            A mapping of keys to positive scales by which the values of the
+            keys are divided (Default value = None).
+
+        Returns
+        -------
+        list
+            Up to k jobs, sorted by their distance to ``statepoint``. Jobs
+            at equal distance are sorted by their id.
+
+        Raises
+        ------
+        KeyError
+            If a key is not in ``statepoint``.
+        ValueError
+            If a value of ``statepoint`` for a key is not a finite number, if
+            ``k`` is less than one, or if a scale is not positive.
+        ImportError
+            If the numpy package is not available.
+
+        """
+        try:
+            from ._nearest import _gather_points, _is_coordinate, _KDTree
+        except ImportError:
+            raise ImportError("Nearest state point queries require the numpy package.")
+        coordinates = dict(_nested_dicts_to_dotted_keys(statepoint))
+        keys = tuple(coordinates if keys is None else keys)
+        if not keys:
+            raise ValueError("At least one state point key is required.")
+        if k < 1:
+            raise ValueError(f"The number of jobs must be at least one, not {k}.")
+        scale = {} if scale is None else scale
+        scales = tuple(scale.get(key, 1) for key in keys)
+        if not all(_is_coordinate(s) and s > 0 for s in scales):
+            raise ValueError(f"Scales must be positive numbers, not {scale}.")
+        point = []
+        for key in keys:
+            value = coordinates[key]
+            if not _is_coordinate(value):
+                raise ValueError(
+                    f"The value of '{key}' must be a finite number, not {value!r}."
+                )
+            point.append(value / scale.get(key, 1))
+
+        job_ids = list(self._job_dirs())
+        signature = (_fingerprint(job_ids), keys, scales)
+        if self._nearest_index is None or self._nearest_index[0] != signature:
+            ids, points = _gather_points(
+                ((job_id, self._get_statepoint(job_id)) for job_id in sorted(job_ids)),
+                keys,
+            )
+            self._nearest_index = (signature, ids, _KDTree(points / scales))
+        _, ids, tree = self._nearest_index
+        return [
+            Job(project=self, id_=ids[index], directory_known=True)
+            for _, index in tree.query(point, k)
+        ]
+
 
 @contextmanager
 def TemporaryProject(cls=None, **kwargs):
@@ -1790,6 +3211,105 @@ def TemporaryProject(cls=None, **kwargs):
         yield cls.init_project(path=tmp_dir)
 
 
+class _DocumentBatch:
+    """Updates of job documents that are written together.
+
+    Application developers should not directly instantiate this class, but
+    use :meth:`~signac.Project.document_batch` instead.
+
+    Parameters
+    ----------
+    project : :class:`~signac.Project`
+        Project handle.
+
+    """
+
+    def __init__(self, project):
+        self._project = project
+        self._jobs = {}
+        self._updates = {}
+
+    def __getitem__(self, job):
+        """Get the dict of the updates of a job's document.
+
+        Raises
+        ------
+        ValueError
+            If the job belongs to a different project.
+
+        """
+        if job._project != self._project:
+            raise ValueError(f"The job {job} is not part of the project.")
+        self._jobs.setdefault(job.id, job)
+        return self._updates.setdefault(job.id, {})
+
+    def __len__(self):
+        return len(self._updates)
+
+    def _write_document(self, job_id):
+        """Merge the updates into the document of a job and write it.
+
+        Returns
+        -------
+        Exception or None
+            The error that occurred while writing the document, if any.
+
+        """
+        try:
+            updates = self._updates[job_id]
+            json_attr_dict_validator(updates)
+            job = self._jobs[job_id]
+            job.init(validate_statepoint=False)
+            document = dict(job._project._read_job_document(job.id))
+            document.update(updates)
+            blob = json.dumps(document, cls=SyncedCollectionJSONEncoder).encode()
+            fn_document = os.sep.join((job.path, Job.FN_DOCUMENT))
+            fn_tmp = os.sep.join((job.path, f"._{uuid.uuid4()}_{Job.FN_DOCUMENT}"))
+            try:
+                with open(fn_tmp, "wb") as file:
+                    file.write(blob)
+                os.replace(fn_tmp, fn_document)
+            except OSError:
+                try:
+                    os.remove(fn_tmp)
+                except OSError:
+                    pass
+                raise
+        except Exception as error:
+            return error
+
+    def _write(self, parallel=False):
+        """Write the updated documents of all jobs.
+
+        Parameters
+        ----------
+        parallel : bool or int, optional
+            Write the documents in parallel threads (Default value = False).
+
+        Raises
+        ------
+        :class:`~signac.errors.DocumentWriteError`
+            If the documents of one or more jobs could not be written.
+
+        """
+        job_ids = [job_id for job_id, updates in self._updates.items() if updates]
+        if parallel:
+            with ThreadPool(None if parallel is True else parallel) as pool:
+                results = pool.map(self._write_document, job_ids)
+        else:
+            results = [self._write_document(job_id) for job_id in job_ids]
+        errors = {
+            job_id: error
+            for job_id, error in zip(job_ids, results)
+            if error is not None
+        }
+        if errors:
+            for job_id, error in errors.items():
+                logger.error(f"Unable to write the document of job '{job_id}': {error}")
+            raise DocumentWriteError(errors)
+        logger.info(f"Wrote the documents of {len(job_ids)} job(s).")
+
+
 class _JobsCursorIterator:
     """Iterator for JobsCursor."""
 
@@ -1813,7 +3333,9 @@ class JobsCursor:
     Application developers should not directly instantiate this class, but
     use :meth:`~signac.Project.find_jobs` instead.
 
-    Enables simple iteration and grouping operations.
+    Enables simple iteration and grouping operations. Cursors of the same
+    project can be combined with the set operators ``|``, ``&``, ``-``, and
+    ``^``, which use the cached matching jobs instead of searching again.
 
     .. warning::
 
@@ -1844,6 +3366,9 @@ class JobsCursor:
         self._id_cache = None
         self._id_set_cache = None
 
+        # The set operation and cursors this cursor is combined from.
+        self._operands = None
+
     @property
     def _ids(self):
         """List of job ids that match the filter.
@@ -1856,7 +3381,18 @@ class JobsCursor:
             Job ids that match the filter.
         """
         if self._id_cache is None:
-            self._id_cache = self._project._find_job_ids(self._filter)
+            if self._operands is None:
+                self._id_cache = self._project._find_job_ids(self._filter)
+            else:
+                set_operator, left, right = self._operands
+                ids = set_operator(left._id_set, right._id_set)
+                self._id_cache = [job_id for job_id in left._ids if job_id in ids]
+                self._id_cache.extend(
+                    job_id
+                    for job_id in right._ids
+                    if job_id in ids and job_id not in left._id_set
+                )
+                self._operands = None
 
         return self._id_cache
 
@@ -1879,6 +3415,85 @@ class JobsCursor:
     def __eq__(self, other):
         return self._project == other._project and self._filter == other._filter
 
+    def _combine(self, other, set_operator, filter):
+        """Combine the jobs of two cursors with a set operation.
+
+        The matching ids of the new cursor are computed from the matching ids
+        of both cursors on first use, such that the workspace is not searched
+        again. The filter of the new cursor is equivalent to the combination.
+
+        Parameters
+        ----------
+        other : :class:`~signac.project.JobsCursor`
+            The other cursor.
+        set_operator : callable
+            The set operation applied to the sets of matching ids.
+        filter : Mapping
+            The combined filter.
+
+        Returns
+        -------
+        :class:`~signac.project.JobsCursor`
+            The combined cursor.
+
+        Raises
+        ------
+        ValueError
+            If the cursors belong to different projects.
+
+        """
+        if self._project != other._project:
+            raise ValueError("Cannot combine jobs of different projects.")
+        cursor = JobsCursor(self._project, filter)
+        cursor._operands = (set_operator, self, other)
+        return cursor
+
+    @staticmethod
+    def _difference_filter(filter, other):
+        """Return a filter matching the jobs of filter but not of other."""
+        if filter is None:
+            return {"$not": other or {}}
+        return {"$and": [filter, {"$not": other or {}}]}
+
+    def __or__(self, other):
+        """Return a cursor of the jobs in either cursor."""
+        if not isinstance(other, JobsCursor):
+            return NotImplemented
+        if self._filter is None or other._filter is None:
+            filter = None
+        else:
+            filter = {"$or": [self._filter, other._filter]}
+        return self._combine(other, operator.or_, filter)
+
+    def __and__(self, other):
+        """Return a cursor of the jobs in both cursors."""
+        if not isinstance(other, JobsCursor):
+            return NotImplemented
+        if self._filter is None or other._filter is None:
+            filter = other._filter if self._filter is None else self._filter
+        else:
+            filter = {"$and": [self._filter, other._filter]}
+        return self._combine(other, operator.and_, filter)
+
+    def __sub__(self, other):
+        """Return a cursor of the jobs in this cursor but not in the other."""
+        if not isinstance(other, JobsCursor):
+            return NotImplemented
+        filter = self._difference_filter(self._filter, other._filter)
+        return self._combine(other, operator.sub, filter)
+
+    def __xor__(self, other):
+        """Return a cursor of the jobs in exactly one of the cursors."""
+        if not isinstance(other, JobsCursor):
+            return NotImplemented
+        filter = {
+            "$or": [
+                self._difference_filter(self._filter, other._filter),
+                self._difference_filter(other._filter, self._filter),
+            ]
+        }
+        return self._combine(other, operator.xor, filter)
+
     def __len__(self):
         # Highly performance critical code path!!
         if self._filter:
@@ -2013,7 +3628,15 @@ class JobsCursor:
             """Check if a key is a document key."""
             return "." in key and key.split(".", 1)[0] == "doc"
 
+        _document = self._project._get_job_document
+
         if isinstance(key, str):
+            groups = self._group_ids_by_index(key, default)
+            if groups is not None:
+                for value, job_ids in groups:
+                    yield value, _JobsCursorIterator(self._project, job_ids)
+                return
+
             stripped_key = _strip_prefix(key)
 
             if default is None:
@@ -2025,7 +3648,7 @@ class JobsCursor:
                 if _is_doc_key(key):
 
                     def keyfunction(job):
-                        return job.document[stripped_key]
+                        return _document(job)[stripped_key]
 
                 else:
 
@@ -2036,7 +3659,7 @@ class JobsCursor:
                 if _is_doc_key(key):
 
                     def keyfunction(job):
-                        return job.document.get(stripped_key, default)
+                        return _document(job).get(stripped_key, default)
 
                 else:
 
@@ -2061,7 +3684,7 @@ class JobsCursor:
                 def keyfunction(job):
                     return tuple(
                         [job.cached_statepoint[k] for k in sp_keys]
-                        + [job.document[k] for k in doc_keys]
+                        + [_document(job)[k] for k in doc_keys]
                     )
 
             else:
@@ -2069,7 +3692,7 @@ class JobsCursor:
                 def keyfunction(job):
                     return tuple(
                         [job.cached_statepoint.get(k, default) for k in sp_keys]
-                        + [job.document.get(k, default) for k in doc_keys]
+                        + [_document(job).get(k, default) for k in doc_keys]
                     )
 
         elif key is None:
@@ -2081,13 +3704,70 @@ class JobsCursor:
             # Pass the job document to a callable
             keyfunction = key
 
-        yield from groupby(
-            sorted(
-                iter(self._project.find_jobs(_filter)),
-                key=keyfunction,
-            ),
-            key=keyfunction,
-        )
+        jobs = sorted(iter(self._project.find_jobs(_filter)), key=keyfunction)
+        self._project._flush_document_cache()
+        yield from groupby(jobs, key=keyfunction)
+
+    def _group_ids_by_index(self, key, default=None):
+        """Group the job ids by the value of a key using a search index.
+
+        The groups are built from the inverted index of the key, such that no
+        job handles are created and job documents are only read if the key
+        is a document key. In buffered mode, the documents are not grouped by
+        the index, since buffered changes are not written to the document files
+        yet.
+
+        Parameters
+        ----------
+        key : str
+            The grouping key, optionally prefixed with 'sp.' or 'doc.'.
+        default : object, optional
+            The value used for jobs without the key, jobs without the key are
+            omitted if None (Default value = None).
+
+        Returns
+        -------
+        list or None
+            The sorted list of tuples of values and job ids or None if the
+            jobs cannot be grouped by the index, e.g., because of nested keys
+            or values that are lists or dicts.
+
+        """
+        nodes = key.split(".")
+        if len(nodes) == 1:
+            nodes.insert(0, "sp")
+        if len(nodes) != 2 or nodes[0] not in ("sp", "doc"):
+            return None
+        if nodes[0] == "doc" and BufferedJSONAttrDict.backend_is_buffered():
+            return None
+        job_ids = self._ids
+        include_job_document = nodes[0] == "doc"
+        index = _SearchIndexer(
+            self._project._build_index(
+                include_job_document=include_job_document,
+                document_keys={nodes[1]},
+                job_ids=job_ids,
+            )
+        ).build_index(".".join(nodes))
+        if include_job_document:
+            self._project._flush_document_cache()
+        groups = {}
+        grouped = 0
+        for value, group in index.items():
+            if type(value) not in (str, int, float, bool) or value != value:
+                return None
+            # Equal values of different types, e.g., 1 and 1.0, are grouped.
+            groups.setdefault(value, set()).update(group)
+            grouped += len(group)
+        if default is not None and grouped < len(job_ids):
+            missing = set(job_ids).difference(*index.values())
+            groups.setdefault(default, set()).update(missing)
+        # Preserve the order of the jobs within each group.
+        position = {job_id: i for i, job_id in enumerate(job_ids)}
+        return [
+            (value, sorted(groups[value], key=position.__getitem__))
+            for value in sorted(groups)
+        ]
 
     def export_to(self, target, path=None, copytree=None):
         """Export all jobs to a target location, such as a directory or a (zipped) archive file.
@@ -2191,15 +3871,15 @@ class JobsCursor:
                 prefixed_key = sp_prefix + key
                 if usecols(prefixed_key):
                     yield prefixed_key, value
-            for key, value in _flatten(job.doc).items():
+            document = self._project._get_job_document(job)
+            for key, value in _flatten(document).items():
                 prefixed_key = doc_prefix + key
                 if usecols(prefixed_key):
                     yield prefixed_key, value
 
-        return pandas.DataFrame.from_dict(
-            data={job.id: dict(_export_sp_and_doc(job)) for job in self},
-            orient="index",
-        ).infer_objects()
+        data = {job.id: dict(_export_sp_and_doc(job)) for job in self}
+        self._project._flush_document_cache()
+        return pandas.DataFrame.from_dict(data=data, orient="index").infer_objects()
 
     def __repr__(self):
         return "{type}(project={project}, filter={filter})".format(
@@ -2248,6 +3928,92 @@ class JobsCursor:
         return repr(self) + self._repr_html_jobs()
 
 
+def _queried_document_keys(compiled):
+    """Return the top-level job document keys queried by a filter.
+
+    Parameters
+    ----------
+    compiled : :class:`~signac._search_indexer._CompiledFilter`
+        The compiled filter with prefixed keys.
+
+    Returns
+    -------
+    set or None
+        The queried top-level document keys or None if the whole document is
+        queried.
+
+    """
+    document_keys = set()
+    for key in compiled.keys:
+        nodes = key.split(".")
+        if nodes[0] == "doc":
+            if len(nodes) == 1:
+                return None
+            document_keys.add(nodes[1])
+    return document_keys
+
+
+class PreparedQuery:
+    """A search query that is parsed, validated, and compiled once.
+
+    Application developers should not directly instantiate this class, but
+    use :meth:`~signac.Project.prepare_query` instead.
+
+    Every call of :meth:`find_jobs` searches the current workspace. The state
+    point search index and all indexes built for previous searches are reused
+    until jobs are added to or removed from the workspace.
+
+    Parameters
+    ----------
+    project : :class:`~signac.Project`
+        Project handle.
+    filter : Mapping
+        A mapping of key-value pairs used for the query (Default value = None).
+
+    Raises
+    ------
+    TypeError
+        If the filters are not JSON serializable.
+    ValueError
+        If the filters are invalid.
+    KeyError
+        If the filters contain invalid operators.
+
+    """
+
+    def __init__(self, project, filter=None):
+        self._project = project
+        self._filter = dict(parse_filter(filter)) if filter else None
+        self._compiled = None
+        if self._filter:
+            self._compiled = _CompiledFilter.from_filter(
+                dict(parse_filter(_add_prefix(self._filter)))
+            )
+
+    def find_jobs(self):
+        """Find all jobs in the project's workspace matching the query.
+
+        Returns
+        -------
+        :class:`~signac.project.JobsCursor`
+            JobsCursor of jobs matching the query.
+
+        """
+        cursor = JobsCursor(self._project, self._filter)
+        if self._compiled is not None:
+            cursor._id_cache = self._project._find_job_ids_compiled(
+                self._compiled, reuse_index=True
+            )
+        return cursor
+
+    def __repr__(self):
+        return "{type}(project={project}, filter={filter})".format(
+            type=self.__class__.__name__,
+            project=repr(self._project),
+            filter=repr(self._filter),
+        )
+
+
 def init_project(path=None):
     """Initialize a project.
 
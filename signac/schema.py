@@ -7,7 +7,7 @@ from collections.abc import Mapping
 from numbers import Number
 from pprint import pformat
 
-from ._search_indexer import _DictPlaceholder
+from ._search_indexer import _DictPlaceholder, _TypedSetDefaultDict
 from ._utility import _nested_dicts_to_dotted_keys
 
 
@@ -64,9 +64,11 @@ def _build_job_statepoint_index(exclude_const, index):
         ):
             continue
         statepoint_key = _strip_prefix(key)
-        # Remove _DictPlaceholder keys from the index
-        statepoint_values = indexes[key]
-        statepoint_values.pop(_DictPlaceholder, None)
+        # Remove _DictPlaceholder keys from a copy of the (cached) index
+        statepoint_values = _TypedSetDefaultDict()
+        for value, ids in indexes[key].items():
+            if value is not _DictPlaceholder:
+                statepoint_values[value] = ids
         yield statepoint_key, statepoint_values
 
 
@@ -6,9 +6,11 @@ import os
 import platform
 from stat import S_IREAD
 from tempfile import TemporaryDirectory
-from time import sleep
+from threading import Event, current_thread
+from time import sleep, time
 
 import pytest
+from synced_collections.backends.collection_json import BufferedJSONAttrDict
 from synced_collections.errors import BufferedError
 from test_project import TestProjectBase
 
@@ -89,6 +91,85 @@ class TestBufferedMode(TestProjectBase):
 
         assert not signac.is_buffered()
 
+    def _wait_for_document(self, job, expected, timeout=10.0):
+        """Wait until the document file of a job has the expected contents."""
+        start = time()
+        while True:
+            with open(job.fn(job.FN_DOCUMENT), "rb") as file:
+                if json.loads(file.read().decode()) == expected:
+                    return True
+            if time() - start > timeout:
+                return False
+            sleep(0.01)
+
+    def test_write_behind(self):
+        job = self.project.open_job(dict(a=0)).init()
+        job.doc.a = 0
+        with signac.write_behind(flush_interval=0.05):
+            assert signac.is_buffered()
+            job.doc.a = 1
+            # The modification is written in the background.
+            assert self._wait_for_document(job, {"a": 1})
+            assert signac.is_buffered()
+            job.doc.a = 2
+            assert job.doc.a == 2
+            assert self._wait_for_document(job, {"a": 2})
+        assert not signac.is_buffered()
+        assert job.doc.a == 2
+
+    def test_write_behind_high_water_mark(self):
+        job = self.project.open_job(dict(a=0)).init()
+        job.doc.a = 0
+        with signac.write_behind(flush_interval=1000, high_water_mark=1):
+            job.doc.a = 1
+            assert self._wait_for_document(job, {"a": 1})
+        assert job.doc.a == 1
+
+    def test_write_behind_flush_on_exit(self):
+        job = self.project.open_job(dict(a=0)).init()
+        job.doc.a = 0
+        with signac.write_behind(flush_interval=1000, buffer_capacity=1000):
+            assert signac.get_buffer_capacity() == 1000
+            job.doc.a = 1
+            assert not self._wait_for_document(job, {"a": 1}, timeout=0.2)
+        assert self._wait_for_document(job, {"a": 1}, timeout=0)
+        with pytest.raises(ValueError):
+            with signac.write_behind(flush_interval=0):
+                pass
+
+    def test_write_behind_errors(self, monkeypatch):
+        job = self.project.open_job(dict(a=0)).init()
+        job.doc.a = 0
+        with pytest.raises(BufferedError) as cm:
+            with signac.write_behind(flush_interval=1000):
+                job.doc.a = 1
+                # The size of the modified file differs from the buffered one.
+                with open(job.doc._filename, "wb") as file:
+                    file.write(json.dumps({"a": 22}).encode())
+        assert job.doc._filename in cm.value.files
+
+        # Errors of flushes in the background are raised when exiting.
+        flushed = Event()
+        flush_buffer = BufferedJSONAttrDict._flush_buffer
+
+        def _flush_buffer(*args, **kwargs):
+            if current_thread().name == "signac-write-behind":
+                flushed.set()
+                raise OSError("Unable to write.")
+            return flush_buffer(*args, **kwargs)
+
+        monkeypatch.setattr(
+            BufferedJSONAttrDict, "_flush_buffer", staticmethod(_flush_buffer)
+        )
+        job.doc.a = 0
+        with pytest.raises(OSError, match="Unable to write."):
+            with signac.write_behind(flush_interval=0.01):
+                job.doc.a = 3
+                assert flushed.wait(timeout=10)
+        monkeypatch.undo()
+        # The buffer is still flushed when exiting.
+        assert self._wait_for_document(job, {"a": 3}, timeout=0)
+
     def test_integration(self):
         def routine():
             for i in range(1, 4):
@@ -1,6 +1,7 @@
 # Copyright (c) 2018 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import errno
 import os
 import platform
 import random
@@ -15,12 +16,19 @@ from itertools import chain
 from multiprocessing.pool import ThreadPool
 from platform import python_implementation
 from tempfile import TemporaryDirectory
-from time import time
+from threading import Event, Thread
+from time import sleep, time
 
 import pytest
 
 from signac.errors import InvalidKeyError
-from signac.h5store import H5Store, H5StoreAlreadyOpenError, H5StoreClosedError
+from signac.h5store import (
+    _FILE_LOCKS,
+    _WAITING_THREADS,
+    H5Store,
+    H5StoreAlreadyOpenError,
+    H5StoreClosedError,
+)
 
 PYPY = "PyPy" in platform.python_implementation()
 
@@ -721,6 +729,119 @@ class TestH5StoreMultiThreading(TestH5StoreBase):
         assert self.get_h5store()["x"] in set(range(100))
 
 
+class TestH5StoreFileLocks(TestH5StoreBase):
+    def _open_in_thread(self, get_h5store, **kwargs):
+        opened = Event()
+
+        def open_store():
+            with get_h5store().open(**kwargs):
+                opened.set()
+
+        thread = Thread(target=open_store)
+        thread.start()
+        return thread, opened
+
+    def _wait_until_waiting(self, thread, timeout=10):
+        """Wait until a thread waits for a file lock."""
+        start = time()
+        while thread.ident not in _WAITING_THREADS:
+            assert time() - start < timeout
+            sleep(0.001)
+
+    def test_different_files_concurrently(self):
+        with self.open_h5store():
+            thread, opened = self._open_in_thread(self.get_other_h5store)
+            assert opened.wait(timeout=10)
+            thread.join()
+        assert not _FILE_LOCKS
+
+    def test_same_file_exclusively(self):
+        with self.open_h5store() as h5s:
+            h5s["x"] = 0
+            thread, opened = self._open_in_thread(self.get_h5store, mode="r")
+            assert not opened.wait(timeout=0.1)
+        assert opened.wait(timeout=10)
+        thread.join()
+        assert not _FILE_LOCKS
+
+    def test_concurrent_reads(self, monkeypatch):
+        with self.open_h5store() as h5s:
+            h5s["x"] = 0
+        monkeypatch.setattr(H5Store, "concurrent_reads", True)
+        with self.open_h5store(mode="r") as h5s:
+            thread, opened = self._open_in_thread(self.get_h5store, mode="r")
+            assert opened.wait(timeout=10)
+            thread.join()
+            thread, opened = self._open_in_thread(self.get_h5store)
+            assert not opened.wait(timeout=0.1)
+            assert h5s["x"] == 0
+        assert opened.wait(timeout=10)
+        thread.join()
+        assert not _FILE_LOCKS
+
+    def test_concurrent_reads_writer_preference(self, monkeypatch):
+        with self.open_h5store() as h5s:
+            h5s["x"] = 0
+        monkeypatch.setattr(H5Store, "concurrent_reads", True)
+        with self.open_h5store(mode="r"):
+            writer, written = self._open_in_thread(self.get_h5store)
+            self._wait_until_waiting(writer)
+            # New readers wait for the waiting writer, but this thread does not.
+            reader, read = self._open_in_thread(self.get_h5store, mode="r")
+            self._wait_until_waiting(reader)
+            with self.open_h5store(mode="r") as h5s:
+                assert h5s["x"] == 0
+            assert not written.is_set()
+            assert not read.is_set()
+        assert written.wait(timeout=10)
+        assert read.wait(timeout=10)
+        writer.join()
+        reader.join()
+        assert not _FILE_LOCKS
+
+    def test_deadlock(self):
+        opened, opened_both = Event(), Event()
+
+        def open_both():
+            with self.open_h5store():
+                opened.set()
+                with self.open_other_h5store():
+                    opened_both.set()
+
+        with self.open_other_h5store():
+            thread = Thread(target=open_both)
+            thread.start()
+            assert opened.wait(timeout=10)
+            self._wait_until_waiting(thread)
+            # Waiting for the thread, which waits for this thread, fails.
+            with pytest.raises(OSError) as error:
+                self.get_h5store().open()
+            assert error.value.errno == errno.EDEADLK
+            assert not opened_both.is_set()
+        assert opened_both.wait(timeout=10)
+        thread.join()
+        assert not _FILE_LOCKS
+
+    def test_reopen_in_same_thread(self, monkeypatch):
+        monkeypatch.setattr(H5Store, "concurrent_reads", True)
+        with self.open_h5store() as writer:
+            with self.open_h5store(mode="r") as reader:
+                writer["x"] = 0
+                assert reader["x"] == 0
+        assert not _FILE_LOCKS
+
+    def test_close_in_other_thread(self):
+        h5s = self.get_h5store()
+        h5s.open()
+        thread = Thread(target=h5s.close)
+        thread.start()
+        thread.join()
+        thread, opened = self._open_in_thread(self.get_h5store)
+        assert opened.wait(timeout=10)
+        thread.join()
+        assert not _FILE_LOCKS
+
+
 def _read_from_h5store(filename, **kwargs):
     with H5Store(filename, **kwargs) as h5s:
         list(h5s)
@@ -20,7 +20,7 @@ from signac.errors import (
     JobsCorruptedError,
     KeyTypeError,
 )
-from signac.job import Job
+from signac.job import Job, calc_ids
 
 try:
     import h5py  # noqa: F401
@@ -113,6 +113,17 @@ class TestJobID(TestJobBase):
         assert str(job1) == str(job2)
         assert job1.statepoint() == job2.statepoint()
 
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_calc_ids(self, parallel):
+        statepoints = [builtins_dict(), self.nested_dict(), self.dict_of_list_of_dict()]
+        expected = [BUILTINS_HASH, NESTED_HASH, LIST_HASH]
+        for p, h in BUILTINS:
+            statepoints.append(p)
+            expected.append(h)
+        assert calc_ids(statepoints, parallel=parallel) == expected
+        assert calc_ids(iter(statepoints), parallel=parallel) == expected
+        assert calc_ids([], parallel=parallel) == []
+
 
 class TestJob(TestJobBase):
     def test_repr(self):
@@ -243,6 +254,24 @@ class TestJob(TestJobBase):
         copied_job.sp.a = 3
         assert copied_job in self.project
 
+    def test_lazy_lock(self):
+        for i in range(3):
+            self.project.open_job({"a": i}).init()
+        jobs = list(self.project)
+        assert all(job._rlock is None for job in jobs)
+        assert sorted(job.cached_statepoint["a"] for job in jobs) == [0, 1, 2]
+        assert all(job._rlock is None for job in jobs)
+        job = jobs[0]
+        job.doc.b = 1
+        lock = job._rlock
+        assert lock is not None
+        assert job._lock is lock
+        # Jobs still accept arbitrary attributes.
+        job.custom = "value"
+        assert copy.deepcopy(job).custom == "value"
+        assert copy.deepcopy(job)._rlock is None
+        assert copy.deepcopy(job).doc == {"b": 1}
+
     def test_project_access_from_job(self):
         job = self.project.open_job({"a": 0}).init()
         assert isinstance(job.project, signac.Project)
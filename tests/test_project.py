@@ -31,7 +31,9 @@ from signac._config import (
 )
 from signac.errors import (
     DestinationExistsError,
+    DocumentWriteError,
     IncompatibleSchemaVersion,
+    InvalidKeyError,
     JobsCorruptedError,
     StatepointParsingError,
     WorkspaceError,
@@ -92,6 +94,32 @@ class TestProjectBase(TestJobBase):
 
 
 class TestProject(TestProjectBase):
+    @pytest.fixture
+    def query_filters(self):
+        """Initialize jobs with documents and return filters that match them."""
+        for i in range(10):
+            self.project.open_job({"a": i, "b": {"c": i % 3}}).doc.d = i % 2
+        return [
+            None,
+            {"a": 3},
+            {"a": {"$lt": 5}, "b.c": {"$ne": 0}},
+            {"$or": [{"sp.a": 1}, {"doc.d": 0}]},
+            {"doc.d": 1, "b.c": 2},
+        ]
+
+    @pytest.fixture
+    def document_reads(self, monkeypatch):
+        """Record the ids of all jobs whose documents are read."""
+        read = []
+        read_job_document = self.project._read_job_document
+
+        def _read_job_document(job_id, keys=None):
+            read.append(job_id)
+            return read_job_document(job_id, keys)
+
+        monkeypatch.setattr(self.project, "_read_job_document", _read_job_document)
+        return read
+
     def test_repr(self):
         p = eval(repr(self.project))
         assert repr(p) == repr(self.project)
@@ -268,6 +296,261 @@ class TestProject(TestProjectBase):
         for job in self.project.find_jobs():
             assert self.project.open_job(id=job.id).id == job.id
 
+    def test_find_jobs_lazy_job_documents(self, document_reads):
+        for i in range(10):
+            job = self.project.open_job({"a": i, "b": i % 2})
+            job.document.update({"c": i, "d": list(range(100))})
+        read = document_reads
+        job = self.project.open_job({"a": 3, "b": 1})
+        assert list(self.project.find_jobs({"a": 3, "doc.c": 3})) == [job]
+        assert read == [job.id]
+        # Only the queried keys are kept.
+        assert self.project._read_job_document(job.id, {"c"}) == {"c": 3}
+        read.clear()
+        assert len(self.project.find_jobs({"b": 1, "doc.c": {"$gt": 4}})) == 3
+        assert len(read) == 5
+        read.clear()
+        assert len(self.project.find_jobs({"$or": [{"a": 0}, {"doc.c": 1}]})) == 2
+        assert len(read) == 10
+
+    def test_prepare_query(self, query_filters):
+        filters = query_filters
+        queries = [self.project.prepare_query(filter) for filter in filters]
+        for _ in range(2):
+            for filter, query in zip(filters, queries):
+                assert set(query.find_jobs()) == set(self.project.find_jobs(filter))
+                assert query.find_jobs() == self.project.find_jobs(filter)
+        index = self.project._reusable_index[1]
+        assert {"sp.a", "sp.b.c"}.issubset(index._indexes)
+        assert len(queries[1].find_jobs()) == 1
+        assert self.project._reusable_index[1] is index
+
+        # Changes of the workspace and job documents are found.
+        job = self.project.open_job({"a": 3, "b": {"c": 0}})
+        job.sp.a = 11
+        assert len(queries[1].find_jobs()) == 0
+        assert self.project._reusable_index[1] is not index
+        assert job not in queries[3].find_jobs()
+        job.doc.d = 0
+        assert job in queries[3].find_jobs()
+
+        with pytest.raises(KeyError):
+            self.project.prepare_query({"a": {"$unknown": 0}})
+        with pytest.raises(ValueError):
+            self.project.prepare_query({"a": {"$exists": 0}})
+
+    def test_find_jobs_many(self, query_filters, document_reads):
+        filters = query_filters + [{"doc": {"d": 0}}]
+        read = document_reads
+        cursors = self.project.find_jobs_many(filters)
+        assert len(read) == len(set(read)) == 10
+        assert len(cursors) == len(filters)
+        for filter, cursor in zip(filters, cursors):
+            assert set(cursor) == set(self.project.find_jobs(filter))
+            assert cursor == self.project.find_jobs(filter)
+        assert self.project.find_jobs_many([]) == []
+        cursors = self.project.find_jobs_many([{"a": 0}, {"b.c": 1}])
+        assert [len(cursor) for cursor in cursors] == [1, 3]
+        with pytest.raises(KeyError):
+            self.project.find_jobs_many([{"a": 0}, {"a": {"$unknown": 0}}])
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_read_documents(self, parallel):
+        assert self.project.read_documents([], parallel=parallel) == []
+        jobs = [self.project.open_job({"a": i}).init() for i in range(10)]
+        for job in jobs[1:]:
+            job.doc.update({"b": job.sp.a, "c": {"d": [job.sp.a]}})
+        docs = self.project.read_documents(jobs, parallel=parallel)
+        assert docs == [job.doc() for job in jobs]
+        assert docs[0] == {}
+        cursor = self.project.find_jobs({"a": {"$gt": 5}})
+        docs = self.project.read_documents(cursor, keys=["b", "e"], parallel=parallel)
+        assert docs == [{"b": job.sp.a} for job in cursor]
+        # The documents are copies.
+        docs = self.project.read_documents(jobs[1:2] * 2, parallel=parallel)
+        docs[0]["c"]["d"].append(0)
+        assert docs[1] == jobs[1].doc()
+        assert self.project.read_documents(jobs[1:2], ["c"]) == [{"c": {"d": [1]}}]
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_document_batch(self, parallel):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(10)]
+        jobs[0].doc.b = 0
+        with self.project.document_batch(parallel=parallel) as batch:
+            for job in jobs:
+                batch[job]["c"] = job.sp.a
+                batch[job]["d"] = {"e": [job.sp.a]}
+            batch[jobs[0]]["b"] = 1
+            assert len(batch) == 10
+            # Nothing is written before the batch is exited.
+            assert jobs[1].doc() == {}
+        assert jobs[0].doc() == {"b": 1, "c": 0, "d": {"e": [0]}}
+        for job in jobs[1:]:
+            assert job.doc() == {"c": job.sp.a, "d": {"e": [job.sp.a]}}
+        # Uninitialized jobs are initialized.
+        new_job = self.project.open_job({"a": 10})
+        with self.project.document_batch(parallel=parallel) as batch:
+            batch[new_job]["c"] = 10
+        assert new_job in self.project
+        assert new_job.doc() == {"c": 10}
+
+        # Updates are discarded on errors.
+        with pytest.raises(RuntimeError):
+            with self.project.document_batch(parallel=parallel) as batch:
+                batch[jobs[1]]["c"] = 100
+                raise RuntimeError()
+        assert jobs[1].doc.c == 1
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_document_batch_errors(self, parallel):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(4)]
+        with open(jobs[1].fn(Job.FN_DOCUMENT), "w") as file:
+            file.write("{")
+        logging.disable(logging.CRITICAL)
+        try:
+            with pytest.raises(DocumentWriteError) as error:
+                with self.project.document_batch(parallel=parallel) as batch:
+                    for job in jobs:
+                        batch[job]["b"] = 0
+                    batch[jobs[2]]["c.d"] = 0
+        finally:
+            logging.disable(logging.NOTSET)
+        assert set(error.value.errors) == {jobs[1].id, jobs[2].id}
+        assert isinstance(error.value.errors[jobs[2].id], InvalidKeyError)
+        assert str(error.value) == "Failed to write the documents of 2 job(s)."
+        assert error.value.args == (str(error.value),)
+        # The documents of the other jobs are written.
+        assert jobs[0].doc() == {"b": 0}
+        assert jobs[3].doc() == {"b": 0}
+        assert jobs[2].doc() == {}
+
+        # Jobs of other projects are rejected.
+        with self.project.temporary_project() as tmp_project:
+            tmp_job = tmp_project.open_job({"a": 0}).init()
+            tmp_job.doc.c = 1
+            with pytest.raises(ValueError):
+                with self.project.document_batch(parallel=parallel) as batch:
+                    batch[tmp_job]["b"] = 1
+            assert tmp_job.doc() == {"c": 1}
+        assert jobs[0].doc() == {"b": 0}
+
+    def test_count_distinct_value_counts(self):
+        assert self.project.count() == 0
+        assert self.project.value_counts("a") == {}
+        for i in range(12):
+            sp = {"i": i, "a": i % 3, "b": {"c": [i % 2]}}
+            if i % 4:
+                sp["d"] = float(i % 2)
+            self.project.open_job(sp).doc.e = "xy"[i % 2]
+        assert self.project.count() == 12
+        assert self.project.count({"a": 1}) == 4
+        assert self.project.count({"a": 1, "doc.e": "y"}) == 2
+        assert self.project.count({"a": 100}) == 0
+        assert self.project.value_counts("a") == {0: 4, 1: 4, 2: 4}
+        assert self.project.value_counts("sp.a", {"doc.e": "x"}) == {0: 2, 1: 2, 2: 2}
+        assert self.project.value_counts("a", {"a": {"$gt": 0}}) == {1: 4, 2: 4}
+        assert self.project.value_counts("b.c") == {(0,): 6, (1,): 6}
+        assert self.project.value_counts("d") == {0.0: 3, 1.0: 6}
+        assert self.project.value_counts("doc.e") == {"x": 6, "y": 6}
+        assert self.project.value_counts("doc.e", {"a": 0}) == {"x": 2, "y": 2}
+        # Dict values and missing keys are not counted.
+        assert self.project.value_counts("b") == {}
+        assert self.project.value_counts("f") == {}
+        assert self.project.distinct("a") == [0, 1, 2]
+        assert self.project.distinct("d", {"a": 0}) == [0.0, 1.0]
+        assert self.project.distinct("doc.e", {"doc.e": "y"}) == ["y"]
+
+        # Results reflect changes of the workspace.
+        self.project.open_job({"a": 3}).init()
+        assert self.project.count() == 13
+        assert self.project.distinct("a") == [0, 1, 2, 3]
+        self.project.open_job({"a": "z"}).init()
+        assert set(self.project.value_counts("a")) == {0, 1, 2, 3, "z"}
+
+    @pytest.mark.skipif(not NUMPY, reason="test requires the numpy package")
+    def test_find_nearest(self, monkeypatch):
+        from signac._nearest import _KDTree
+
+        # Use small leaves to search a deep tree.
+        monkeypatch.setattr(_KDTree, "LEAF_SIZE", 2)
+        assert self.project.find_nearest({"a": 0}) == []
+        statepoints = [
+            {"a": i % 7, "b": {"c": (i * 3) % 11 / 2}, "d": i} for i in range(40)
+        ]
+        statepoints.extend([{"a": "x", "b": {"c": 0}}, {"b": {"c": 0}}])
+        jobs = [self.project.open_job(sp).init() for sp in statepoints]
+
+        def brute_force(sp, keys, k, scale={}):
+            def distance(job):
+                return sum(
+                    (
+                        (functools.reduce(dict.get, key.split("."), job.sp()) - sp[key])
+                        / scale.get(key, 1)
+                    )
+                    ** 2
+                    for key in keys
+                )
+
+            candidates = [job for job in jobs if isinstance(job.sp.get("a"), int)]
+            return sorted(candidates, key=lambda job: (distance(job), job.id))[:k]
+
+        for sp in ({"a": 3, "c": 2.2}, {"a": -1.5, "c": 6}, {"a": 10, "c": 0}):
+            sp_nested = {"a": sp["a"], "b": {"c": sp["c"]}}
+            sp_dotted = {"a": sp["a"], "b.c": sp["c"]}
+            for k in (1, 5, 50):
+                assert self.project.find_nearest(sp_nested, k=k) == brute_force(
+                    sp_dotted, ["a", "b.c"], k
+                )
+                assert self.project.find_nearest(
+                    sp_nested, keys=["b.c", "a"], k=k, scale={"a": 0.1}
+                ) == brute_force(sp_dotted, ["a", "b.c"], k, {"a": 0.1})
+        assert self.project.find_nearest({"a": 3}, k=6) == brute_force(
+            {"a": 3}, ["a"], 6
+        )
+        assert len(self.project.find_nearest({"a": 0, "b": {"c": 0}}, k=100)) == 40
+        assert self.project.find_nearest({"d": 7.4, "a": "x"}, keys=["d"]) == [jobs[7]]
+
+        # Results reflect changes of the workspace.
+        job = self.project.open_job({"a": 100, "b": {"c": 100}}).init()
+        assert self.project.find_nearest({"a": 99, "b": {"c": 99}}) == [job]
+        job.remove()
+        assert job not in self.project.find_nearest({"a": 99, "b": {"c": 99}})
+
+        with pytest.raises(KeyError):
+            self.project.find_nearest({"a": 0}, keys=["a", "b.c"])
+        with pytest.raises(ValueError):
+            self.project.find_nearest({"a": "x"})
+        with pytest.raises(ValueError):
+            self.project.find_nearest({"a": float("nan")})
+        with pytest.raises(ValueError):
+            self.project.find_nearest({"a": 0}, k=0)
+        with pytest.raises(ValueError):
+            self.project.find_nearest({"a": 0}, scale={"a": 0})
+        with pytest.raises(ValueError):
+            self.project.find_nearest({})
+
+    def test_stream_jobs(self, query_filters):
+        self.project._STREAM_CHUNK_SIZE = 3
+        for filter in query_filters + [{"a": {"$gt": 100}}]:
+            jobs = list(self.project.stream_jobs(filter))
+            assert len(jobs) == len(set(jobs))
+            assert set(jobs) == set(self.project.find_jobs(filter))
+
+        # Matches are generated before the workspace is fully scanned.
+        read = []
+        get_statepoint = self.project._get_statepoint
+
+        def _get_statepoint(job_id):
+            read.append(job_id)
+            return get_statepoint(job_id)
+
+        self.project._get_statepoint = _get_statepoint
+        next(self.project.stream_jobs({"a": {"$exists": True}}))
+        assert len(read) == 3
+
+        with pytest.raises(KeyError):
+            next(self.project.stream_jobs({"a": {"$unknown": 0}}))
+
     def test_find_jobs_JobsCursor_contains(self):
         statepoints = [{"a": i} for i in range(5)]
         for sp in statepoints:
@@ -285,6 +568,41 @@ class TestProject(TestProjectBase):
         for sp in statepoints:
             assert self.project.open_job(sp) in cursor_doc
 
+    def test_find_jobs_JobsCursor_set_operators(self):
+        for i in range(10):
+            self.project.open_job({"a": i}).doc.b = i % 2
+        low = self.project.find_jobs({"a": {"$lt": 6}})
+        odd = self.project.find_jobs({"doc.b": 1})
+        everything = self.project.find_jobs()
+        cursors = [low, odd, everything, self.project.find_jobs({"a": 100})]
+        for left in cursors:
+            for right in cursors:
+                for combined, expected in [
+                    (left | right, set(left) | set(right)),
+                    (left & right, set(left) & set(right)),
+                    (left - right, set(left) - set(right)),
+                    (left ^ right, set(left) ^ set(right)),
+                ]:
+                    assert isinstance(combined, JobsCursor)
+                    assert set(combined) == expected
+                    assert len(combined) == len(expected)
+                    assert all(job in combined for job in expected)
+                    # The combined filter is equivalent.
+                    assert set(self.project.find_jobs(combined._filter)) == expected
+
+        # The workspace is not searched again.
+        find_job_ids = self.project._find_job_ids
+        self.project._find_job_ids = None
+        combined = (low & odd) | (everything - low)
+        assert sorted(job.sp.a for job in combined) == [1, 3, 5, 6, 7, 8, 9]
+        self.project._find_job_ids = find_job_ids
+
+        with pytest.raises(TypeError):
+            low | set(low)
+        with self.project.temporary_project() as tmp_project:
+            with pytest.raises(ValueError):
+                low & tmp_project.find_jobs()
+
     def test_find_jobs_arithmetic_operators(self):
         for i in range(10):
             self.project.open_job(dict(a=i)).init()
@@ -448,6 +766,219 @@ class TestProject(TestProjectBase):
         with pytest.raises(KeyError):
             self.project.open_job(id="abc")
 
+    @pytest.mark.parametrize("parallel", [False, True, 2])
+    def test_init_jobs(self, parallel, monkeypatch):
+        assert self.project.init_jobs([], parallel=parallel) == []
+        existing = self.project.open_job({"a": 0}).init()
+        statepoints = [{"a": i, "b": {"c": [i]}} for i in range(20)] + [{"a": 0}] * 2
+        calls = []
+        calc_ids = signac.project.calc_ids
+
+        def _calc_ids(statepoints, parallel=False):
+            calls.append(parallel)
+            return calc_ids(statepoints, parallel)
+
+        monkeypatch.setattr(signac.project, "calc_ids", _calc_ids)
+        jobs = self.project.init_jobs(iter(statepoints), parallel=parallel)
+        # The ids are computed in bulk.
+        assert calls == [parallel]
+        assert len(jobs) == 22
+        assert jobs[-1] is jobs[-2]
+        assert jobs[-1] == existing
+        assert len(self.project) == 21
+        for sp, job in zip(statepoints, jobs):
+            assert job.sp == sp
+            assert job in self.project
+            assert self.project.open_job(id=job.id) == job
+        # The state points are copied.
+        statepoints[1]["b"]["c"].append(2)
+        assert jobs[1].sp.b.c == [1]
+        # Existing jobs are validated.
+        with open(existing.fn(Job.FN_STATE_POINT), "w") as file:
+            file.write('{"a": 1}')
+        logging.disable(logging.CRITICAL)
+        try:
+            with pytest.raises(JobsCorruptedError):
+                self.project.init_jobs([{"a": 0}], parallel=parallel)
+        finally:
+            logging.disable(logging.NOTSET)
+        with pytest.raises(TypeError):
+            self.project.init_jobs([{"a": {1: 0}}], parallel=parallel)
+
+    def test_init_jobs_persistent_cache(self):
+        self.project.init_jobs([{"a": 0}])
+        self.project.update_cache()
+        jobs = self.project.init_jobs([{"a": i} for i in range(5)], parallel=2)
+        # New jobs are added to the persistent cache without scanning the workspace.
+        fresh_project = self.project_class.get_project(path=self.project.path)
+        assert fresh_project._read_cache() == {job.id: job.sp() for job in jobs}
+        assert self.project.update_cache() is None
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_update_statepoints(self, parallel):
+        assert self.project.update_statepoints(lambda sp: sp) == {}
+        jobs = [self.project.open_job({"a": i}).init() for i in range(10)]
+        for job in jobs:
+            job.doc.b = job.sp.a
+        self.project.update_cache()
+        moved = self.project.update_statepoints(
+            lambda sp: {**sp, "c": 0}, {"a": {"$lt": 5}}, parallel=parallel
+        )
+        assert set(moved) == {job.id for job in jobs[:5]}
+        assert len(self.project) == 10
+        for job in jobs[:5]:
+            assert job not in self.project
+            new_job = self.project.open_job(id=moved[job.id])
+            assert new_job.sp == {"a": job.sp.a, "c": 0}
+            assert new_job.doc.b == job.sp.a
+            assert new_job.sp() == self.project.open_job({"a": job.sp.a, "c": 0}).sp()
+        assert all(job in self.project for job in jobs[5:])
+        # The persistent cache is updated.
+        assert self.project.update_cache() is None
+        fresh_project = self.project_class.get_project(path=self.project.path)
+        assert fresh_project._read_cache() == {
+            job.id: job.sp() for job in fresh_project
+        }
+        assert not os.path.exists(
+            self.project.fn(self.project.FN_STATEPOINT_UPDATE_JOURNAL)
+        )
+
+    def test_update_statepoints_conflicts(self):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(3)]
+        # Conflicts with other jobs and among the updated jobs.
+        with pytest.raises(DestinationExistsError):
+            self.project.update_statepoints(lambda sp: {"a": sp["a"] + 1})
+        with pytest.raises(DestinationExistsError):
+            self.project.update_statepoints(lambda sp: {"b": 0})
+        assert all(job in self.project for job in jobs)
+        assert len(self.project) == 3
+
+    @pytest.mark.parametrize("parallel", [False, 2])
+    def test_update_statepoints_rollback(self, parallel, monkeypatch):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(6)]
+        save = signac.job._StatePointDict.save
+
+        def failing_save(statepoint, *args, **kwargs):
+            if statepoint == {"a": 3, "b": 0}:
+                raise OSError("failed")
+            return save(statepoint, *args, **kwargs)
+
+        monkeypatch.setattr(signac.job._StatePointDict, "save", failing_save)
+        logging.disable(logging.CRITICAL)
+        try:
+            with pytest.raises(OSError, match="failed"):
+                self.project.update_statepoints(
+                    lambda sp: {**sp, "b": 0}, parallel=parallel
+                )
+        finally:
+            logging.disable(logging.NOTSET)
+        monkeypatch.undo()
+        assert set(self.project) == set(jobs)
+        for job in jobs:
+            assert self.project.open_job(id=job.id).sp() == job.sp()
+        self.project._sp_cache.clear()
+        self.project.check()
+
+    def test_update_statepoints_interrupted(self):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(3)]
+        moves = [
+            [job.id, calc_id({"b": i}), job.sp(), {"b": i}]
+            for i, job in enumerate(jobs)
+        ]
+        # Simulate an update that was interrupted after moving the first job.
+        new_path = self.project._job_path(moves[0][1])
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(jobs[0].path, new_path)
+        fn_journal = self.project.fn(self.project.FN_STATEPOINT_UPDATE_JOURNAL)
+        with open(fn_journal, "w") as journal:
+            json.dump(moves, journal)
+        logging.disable(logging.WARNING)
+        try:
+            assert self.project.update_statepoints(lambda sp: sp) == {}
+        finally:
+            logging.disable(logging.NOTSET)
+        assert set(self.project) == set(jobs)
+        self.project.check()
+
+    def test_update_statepoints_interrupted_repair(self, caplog):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(3)]
+        moves = [[jobs[0].id, calc_id({"b": 0}), jobs[0].sp(), {"b": 0}]]
+        new_path = self.project._job_path(moves[0][1])
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(jobs[0].path, new_path)
+        with open(os.path.join(new_path, jobs[0].FN_STATE_POINT), "w") as file:
+            json.dump({"b": 0}, file)
+        fn_journal = self.project.fn(self.project.FN_STATEPOINT_UPDATE_JOURNAL)
+        with open(fn_journal, "w") as journal:
+            json.dump(moves, journal)
+
+        # The interrupted update is reported when opening and checking the
+        # project and rolled back by repair().
+        with caplog.at_level(logging.WARNING):
+            project = self.project_class.get_project(path=self._tmp_pr)
+            assert "interrupted state point update" in caplog.text
+            caplog.clear()
+            project.check()
+            assert "interrupted state point update" in caplog.text
+            project.repair()
+        assert not os.path.exists(fn_journal)
+        assert set(project) == set(jobs)
+        project.check()
+
+    def test_update_statepoints_interrupted_journal(self, monkeypatch):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(3)]
+
+        def interrupted_dump(obj, file):
+            file.write("[[")
+            raise KeyboardInterrupt
+
+        # Simulate an update that was interrupted while writing the journal.
+        monkeypatch.setattr(json, "dump", interrupted_dump)
+        with pytest.raises(KeyboardInterrupt):
+            self.project.update_statepoints(lambda sp: {"b": sp["a"]})
+        monkeypatch.undo()
+        fn_journal = self.project.fn(self.project.FN_STATEPOINT_UPDATE_JOURNAL)
+        assert not os.path.exists(fn_journal)
+        assert set(self.project) == set(jobs)
+        assert len(self.project.update_statepoints(lambda sp: {"b": sp["a"]})) == 3
+        assert {job.sp.b for job in self.project} == {0, 1, 2}
+
+    def test_min_len_unique_id(self):
+        assert self.project.min_len_unique_id() == 0
+        job_ids = []
+        for i in range(50):
+            job_ids.append(self.project.open_job({"a": i}).init().id)
+            expected = 0
+            for j in range(1, 33):
+                if len({job_id[:j] for job_id in job_ids}) == len(job_ids):
+                    expected = j
+                    break
+            if len(job_ids) > 1:
+                assert self.project.min_len_unique_id() == expected
+
+    def test_sorted_job_ids(self):
+        jobs = [self.project.open_job({"a": i}).init() for i in range(5)]
+        assert self.project._sorted_job_ids() == sorted(job.id for job in jobs)
+        # Recently modified workspaces are listed again.
+        assert self.project._sorted_job_ids_cache is None
+
+        def backdate(path):
+            os.utime(path, ns=(0, 0))
+
+        backdate(self.project.workspace)
+        if self.project._sharded:
+            for job in jobs:
+                backdate(os.path.dirname(job.path))
+        job_ids = self.project._sorted_job_ids()
+        assert self.project._sorted_job_ids_cache is not None
+        assert self.project._sorted_job_ids() is job_ids
+        job = self.project.open_job(id=jobs[0].id[:8])
+        assert job == jobs[0]
+        job.remove()
+        assert self.project._sorted_job_ids() == sorted(job.id for job in jobs[1:])
+        with pytest.raises(KeyError):
+            self.project.open_job(id=jobs[0].id[:8])
+
     def test_missing_statepoint_file(self):
         job = self.project.open_job(dict(a=0))
         job.init()
@@ -493,7 +1024,8 @@ class TestProject(TestProjectBase):
         job.init()
         # First, we move the job to the wrong directory.
         wd = job.path
-        wd_invalid = os.path.join(self.project.workspace, "0" * 32)
+        wd_invalid = self.project._job_path("0" * 32)
+        os.makedirs(os.path.dirname(wd_invalid), exist_ok=True)
         os.replace(wd, wd_invalid)  # Move to incorrect id.
         assert not os.path.exists(job.path)
 
@@ -966,6 +1498,52 @@ class TestProject(TestProjectBase):
                 assert str(job) == k
         assert group_count == len(list(self.project.find_jobs()))
 
+    def test_jobs_groupby_index(self, document_reads):
+        for i in range(12):
+            sp = {"a": i % 4, "b": "xyz"[i % 3], "c": [i % 2]}
+            if i % 5:
+                sp["d"] = float(i % 2)
+            self.project.open_job(sp).document = {"e": i % 3}
+
+        def groups(cursor, key, default=None):
+            return [(k, [job.id for job in g]) for k, g in cursor.groupby(key, default)]
+
+        def reference(cursor, key, default=None):
+            namespace, _, name = key.rpartition(".")
+            result = {}
+            for job in cursor:
+                values = job.document if namespace == "doc" else job.cached_statepoint
+                value = values.get(name, default)
+                if value is not None:
+                    result.setdefault(value, []).append(job.id)
+            return sorted(result.items())
+
+        read = document_reads
+        cursors = [self.project, self.project.find_jobs({"a": {"$lt": 2}})]
+        for cursor in cursors:
+            for key in ("a", "sp.b", "d", "doc.e", "doc.f"):
+                assert groups(cursor, key) == reference(cursor, key)
+                assert groups(cursor, key, -1) == reference(cursor, key, -1)
+            # Lists are grouped without the index.
+            assert [k for k, _ in cursor.groupby("c")] == [[0], [1]]
+
+        # Documents are not read when grouping by state point keys.
+        read.clear()
+        assert len(groups(self.project, "a")) == 4
+        assert len(groups(self.project, "d", -1)) == 3
+        assert read == []
+        assert len(groups(self.project, "doc.e")) == 3
+        assert len(read) == len(self.project)
+
+        # Buffered changes of documents are grouped.
+        with signac.buffered():
+            for job in self.project.find_jobs({"doc.e": 2}):
+                job.doc.e = 0
+            assert [(k, len(list(g))) for k, g in self.project.groupby("doc.e")] == [
+                (0, 8),
+                (1, 4),
+            ]
+
     def test_temp_project(self):
         with self.project.temporary_project() as tmp_project:
             assert len(tmp_project) == 0
@@ -2155,8 +2733,20 @@ class TestCache(TestProject):
     def manual_read_cache_file(self):
         with gzip.open(self.project.fn(self.project.FN_CACHE), "rb") as cachefile:
             cache = json.loads(cachefile.read().decode())
+        try:
+            with open(self.project.fn(self.project.FN_CACHE_JOURNAL)) as journal:
+                for line in journal:
+                    record = json.loads(line)
+                    cache.update(record["add"])
+                    for id_ in record["remove"]:
+                        cache.pop(id_, None)
+        except FileNotFoundError:
+            pass
         return cache
 
+    def workspace_statepoints(self):
+        return {job.id: job.statepoint() for job in self.project}
+
     @pytest.mark.usefixtures("subtests")
     def test_cache_update(self, subtests):
 
@@ -2174,7 +2764,7 @@ class TestCache(TestProject):
         file_cache_1 = self.manual_read_cache_file()
 
         with subtests.test(f"Initial cache of {num_initial} jobs"):
-            assert file_cache_1 == self.project._sp_cache
+            assert file_cache_1 == self.workspace_statepoints()
         with subtests.test(f"Initial cache of {num_initial} jobs"):
             assert file_cache_1 == self.project._read_cache()
         with subtests.test(f"Initial cache of {num_initial} jobs"):
@@ -2192,7 +2782,7 @@ class TestCache(TestProject):
         file_cache_2 = self.manual_read_cache_file()
 
         with subtests.test("New project object with added jobs"):
-            assert file_cache_2 == self.project._sp_cache
+            assert file_cache_2 == self.workspace_statepoints()
         with subtests.test("New project object with added jobs"):
             assert file_cache_2 == self.project._read_cache()
         with subtests.test("New project object with added jobs"):
@@ -2215,10 +2805,141 @@ class TestCache(TestProject):
         with subtests.test("File cache with pruned job"):
             assert job_to_remove.id not in file_cache_3
         with subtests.test("New project object, cache pruned"):
-            assert len(self.project._sp_cache) == num_total - 1
+            assert file_cache_3 == self.workspace_statepoints()
         with subtests.test("New project object, cache pruned"):
             assert len(self.project._read_cache()) == num_total - 1
 
+    def test_cache_journal(self):
+        for a in range(10):
+            self.project.open_job({"a": a}).init()
+        assert self.project.update_cache() == 10
+        fn_journal = self.project.fn(self.project.FN_CACHE_JOURNAL)
+        assert not os.path.isfile(fn_journal)
+
+        # Small changes are appended to the journal instead of rewriting the cache.
+        with gzip.open(self.project.fn(self.project.FN_CACHE), "rb") as cachefile:
+            cache_file_before = cachefile.read()
+        self.project.open_job({"a": 10}).init()
+        self.project.open_job({"a": 0}).remove()
+        assert self.project.update_cache() == 10
+        assert os.path.isfile(fn_journal)
+        with gzip.open(self.project.fn(self.project.FN_CACHE), "rb") as cachefile:
+            assert cachefile.read() == cache_file_before
+        assert self.project._read_cache() == self.project._sp_cache
+        assert self.project.update_cache() is None
+
+        # A truncated journal record is ignored, but not the records after it.
+        with open(fn_journal, "ab") as journal:
+            journal.write(b'{"add": {"abc')
+        assert self.project._read_cache() == self.project._sp_cache
+        self.project.open_job({"a": 11}).init()
+        assert self.project.update_cache() == 11
+        assert self.project._read_cache() == self.project._sp_cache
+
+        # The journal is compacted into the cache file once it grows too large.
+        for a in range(12, 20):
+            self.project.open_job({"a": a}).init()
+        assert self.project.update_cache() == 19
+        assert not os.path.isfile(fn_journal)
+        assert self.manual_read_cache_file() == self.project._sp_cache
+
+        self.project._remove_persistent_cache_file()
+        assert self.project._read_cache() == {}
+
+    def test_cache_update_reads_ids_from_index(self, monkeypatch):
+        for a in range(10):
+            self.project.open_job({"a": a}).init()
+        self.project.update_cache()
+        self.project.open_job({"a": 10}).init()
+        self.project.open_job({"a": 0}).remove()
+
+        # Journaled updates only read the ids of the persistent cache from the
+        # index and the state points of the added jobs from the workspace.
+        project = self.project_class.get_project(path=self._tmp_pr)
+        read_statepoints = []
+        get_statepoint_from_workspace = project._get_statepoint_from_workspace
+
+        def _get_statepoint_from_workspace(job_id, *args, **kwargs):
+            read_statepoints.append(job_id)
+            return get_statepoint_from_workspace(job_id, *args, **kwargs)
+
+        def _read_cache_file():
+            raise AssertionError("The cache file must not be read.")
+
+        monkeypatch.setattr(
+            project, "_get_statepoint_from_workspace", _get_statepoint_from_workspace
+        )
+        monkeypatch.setattr(project, "_read_cache_file", _read_cache_file)
+        assert project.update_cache() == 10
+        assert read_statepoints == [project.open_job({"a": 10}).id]
+        assert project.update_cache() is None
+        monkeypatch.undo()
+        assert self.manual_read_cache_file() == self.workspace_statepoints()
+
+    def test_cache_index(self):
+        statepoints = [{"a": a} for a in range(10)]
+        jobs = [self.project.open_job(sp).init() for sp in statepoints]
+        self.project.update_cache()
+        assert os.path.isfile(self.project.fn(self.project.FN_CACHE_INDEX))
+        added_job = self.project.open_job({"a": 10}).init()
+        self.project.update_cache()
+
+        # Opening jobs by id only decodes the requested state points.
+        project = self.project_class.get_project(path=self._tmp_pr)
+        assert project.open_job(id=jobs[3].id).cached_statepoint == statepoints[3]
+        assert project._sp_cache_index is not None
+        assert len(project._sp_cache) == 2  # The journaled job and the opened job.
+        assert project._get_statepoint(jobs[5].id) == statepoints[5]
+        assert project._get_statepoint(added_job.id) == {"a": 10}
+        assert len(project._sp_cache) == 3
+        assert "0" * 32 not in project._sp_cache_index
+        with pytest.raises(KeyError):
+            project._sp_cache_index["0" * 32]
+        with pytest.raises(KeyError):
+            project._sp_cache_index["xyz"]
+
+        # The index can be pickled along with the project.
+        assert pickle.loads(pickle.dumps(project)).open_job(id=jobs[7].id) == jobs[7]
+
+        # Compaction replaces the index.
+        for a in range(11, 25):
+            project.open_job({"a": a}).init()
+        project.update_cache()
+        assert project._sp_cache_index is None
+        assert project.open_job(id=jobs[0].id) == jobs[0]
+        assert len(project._sp_cache_index) == 25
+
+        # Jobs removed by the journal are not opened from the stale index.
+        jobs[1].remove()
+        project.update_cache()
+        project = self.project_class.get_project(path=self._tmp_pr)
+        with pytest.raises(KeyError):
+            project.open_job(id=jobs[1].id)
+        assert jobs[1].id in project._sp_cache_index
+        assert project.open_job(id=jobs[2].id) == jobs[2]
+
+        # The index is ignored if the cache file was written without it.
+        os.utime(project.fn(project.FN_CACHE_INDEX), (0, 0))
+        assert project._open_cache_index() is None
+
+
+class TestShardedProject(TestProject):
+    @pytest.fixture(autouse=True)
+    def setUp_sharded(self, setUp):
+        from signac.migration import apply_workspace_layout
+
+        apply_workspace_layout(self._tmp_pr, "sharded")
+        self.project = self.project_class.get_project(path=self._tmp_pr)
+
+    def test_job_path(self):
+        job = self.project.open_job({"a": 0}).init()
+        assert job.path == os.path.join(self.project.workspace, job.id[:2], job.id)
+        assert os.path.isfile(
+            os.path.join(self.project.workspace, job.id[:2], job.id, job.FN_STATE_POINT)
+        )
+        assert job in self.project
+        assert list(self.project.find_jobs()) == [job]
+
 
 class TestProjectInit:
     @pytest.fixture(autouse=True)
@@ -2543,6 +3264,200 @@ class TestSchemaMigration:
                 signac.Project(dirname)
 
 
+class TestPersistentSearchIndexProject(TestProject):
+    @pytest.fixture(autouse=True)
+    def setUp_persistent_search_index(self, setUp):
+        config = _read_config_file(_get_project_config_fn(self._tmp_pr))
+        config["persistent_search_index"] = True
+        config.write()
+        self.project = self.project_class.get_project(path=self._tmp_pr)
+
+    def test_persistent_search_index(self):
+        jobs = [
+            self.project.open_job({"a": a, "b": {"c": a % 2}}).init() for a in range(10)
+        ]
+        directory = self.project.fn(self.project.FN_SEARCH_INDEX_DIR)
+        assert len(self.project.find_jobs({"a": {"$lt": 5}})) == 5
+        assert len(os.listdir(directory)) == 1
+        assert len(self.project.find_jobs({"b.c": 0, "a": {"$gte": 2}})) == 4
+        assert len(os.listdir(directory)) == 2
+
+        # Queries of indexed keys do not read any state points.
+        project = self.project_class.get_project(path=self._tmp_pr)
+        assert set(project.find_jobs({"$or": [{"a": 1}, {"b.c": 0}]})) == {
+            job for job in jobs if job.sp.a == 1 or job.sp.b.c == 0
+        }
+        assert not project._sp_cache
+
+        # Indexes are rebuilt when jobs are added or removed.
+        self.project.open_job({"a": 10, "b": {"c": 0}}).init()
+        assert len(project.find_jobs({"b.c": 0})) == 6
+        jobs[0].remove()
+        assert len(project.find_jobs({"b.c": 0})) == 5
+        jobs[1].sp.a = 1.5
+        assert len(project.find_jobs({"a": 1.5})) == 1
+        assert len(project.find_jobs({"a": 1})) == 0
+
+        # Corrupted indexes are ignored.
+        for fn in os.listdir(directory):
+            with open(os.path.join(directory, fn), "w") as file:
+                file.write("{")
+        assert len(project.find_jobs({"a": {"$lt": 5}})) == 4
+
+        # Unreadable indexes are ignored as well.
+        for fn in os.listdir(directory):
+            os.remove(os.path.join(directory, fn))
+            os.mkdir(os.path.join(directory, fn))
+        assert len(project.find_jobs({"a": {"$lt": 5}})) == 4
+
+    def test_invalid_persistent_search_index(self):
+        config = _read_config_file(_get_project_config_fn(self._tmp_pr))
+        config["persistent_search_index"] = "maybe"
+        config.write()
+        with pytest.raises(signac.errors.ConfigError):
+            Project(self._tmp_pr)
+
+
+@pytest.mark.skipif(not NUMPY, reason="test requires the numpy package")
+class TestVectorizedSearchProject(TestProject):
+    @pytest.fixture(autouse=True)
+    def setUp_vectorized_search(self, setUp):
+        config = _read_config_file(_get_project_config_fn(self._tmp_pr))
+        config["vectorized_search"] = True
+        config.write()
+        self.project = self.project_class.get_project(path=self._tmp_pr)
+
+    def test_vectorized_search(self):
+        assert self.project._vectorized_search
+        jobs = [self.project.open_job({"a": a, "b": str(a)}).init() for a in range(10)]
+        assert set(self.project.find_jobs({"a": {"$gte": 5}, "b": {"$ne": "7"}})) == {
+            job for job in jobs[5:] if job.sp.b != "7"
+        }
+        assert list(self.project.find_jobs({"a": 3.0})) == [jobs[3]]
+        assert len(self.project.find_jobs({"b": {"$regex": "[0-4]"}})) == 5
+
+
+class TestJobDocumentCacheProject(TestProject):
+    @pytest.fixture(autouse=True)
+    def setUp_job_document_cache(self, setUp):
+        config = _read_config_file(_get_project_config_fn(self._tmp_pr))
+        config["job_document_cache"] = True
+        config.write()
+        self.project = self.project_class.get_project(path=self._tmp_pr)
+
+    def test_job_document_cache(self):
+        jobs = [self.project.open_job({"a": a}) for a in range(4)]
+        for job in jobs:
+            job.doc.b = job.sp.a
+        # Pretend the documents were written a while ago.
+        for job in jobs:
+            os.utime(job.fn(job.FN_DOCUMENT), ns=(0, 0))
+        assert len(self.project.find_jobs({"doc.b": {"$lt": 2}})) == 2
+        assert os.path.isfile(self.project.fn(self.project.FN_DOCUMENT_CACHE))
+
+        # Up-to-date documents are not read again, even by other processes.
+        fn = jobs[0].fn(jobs[0].FN_DOCUMENT)
+        with open(fn, "w") as file:
+            file.write('{"b": 9}')
+        os.utime(fn, ns=(0, 0))
+        project = self.project_class.get_project(path=self._tmp_pr)
+        assert project._read_job_document(jobs[0].id) == {"b": 0}
+        groups = {key: len(list(group)) for key, group in project.groupby("doc.b")}
+        assert groups == {0: 1, 1: 1, 2: 1, 3: 1}
+
+        # Modified documents are read again.
+        jobs[0].doc.b = 10
+        jobs[1].doc.clear()
+        assert list(project.find_jobs({"doc.b": 10})) == [jobs[0]]
+        assert len(project.find_jobs({"doc.b": {"$exists": True}})) == 3
+        jobs[2].remove()
+        groups = {key: len(list(group)) for key, group in project.groupby("doc.b")}
+        assert groups == {3: 1, 10: 1}
+        if PANDAS:
+            assert project.to_dataframe()["doc.b"].dropna().to_dict() == {
+                jobs[0].id: 10,
+                jobs[3].id: 3,
+            }
+
+        # Cached documents are copied and buffered changes are not missed.
+        jobs[0].doc.c = {"d": 1}
+        os.utime(jobs[0].fn(jobs[0].FN_DOCUMENT), ns=(0, 0))
+        project._get_job_document(jobs[0])["c"]["d"] = 2
+        assert project._read_job_document(jobs[0].id)["c"] == {"d": 1}
+        with signac.buffered():
+            jobs[3].doc.b = 10
+            groups = {
+                key: len(list(group)) for key, group in project.groupby(["doc.b"])
+            }
+            assert groups == {(10,): 2}
+            if PANDAS:
+                assert project.to_dataframe()["doc.b"].dropna().to_dict() == {
+                    jobs[0].id: 10,
+                    jobs[3].id: 10,
+                }
+
+    def test_pickle_job_document_cache(self):
+        jobs = [self.project.open_job({"a": a}) for a in range(3)]
+        for job in jobs:
+            job.doc.b = job.sp.a
+        assert len(self.project.find_jobs({"doc.b": {"$lt": 2}})) == 2
+        project = pickle.loads(pickle.dumps(self.project))
+        assert project == self.project
+        assert len(project.find_jobs({"doc.b": {"$lt": 2}})) == 2
+        for job in jobs:
+            assert pickle.loads(pickle.dumps(job)) == job
+
+    def test_invalid_job_document_cache(self):
+        config = _read_config_file(_get_project_config_fn(self._tmp_pr))
+        config["job_document_cache"] = "maybe"
+        config.write()
+        with pytest.raises(signac.errors.ConfigError):
+            Project(self._tmp_pr)
+
+
+class TestWorkspaceLayoutMigration(TestProjectBase):
+    def test_convert_workspace_layout(self):
+        from signac.migration import apply_workspace_layout
+
+        jobs = [self.project.open_job({"a": a}).init() for a in range(10)]
+        for job in jobs:
+            job.doc.a = job.sp.a
+        ids = {job.id for job in jobs}
+
+        apply_workspace_layout(self.project.path, "sharded")
+        project = Project(self.project.path)
+        assert project.config["workspace_layout"] == "sharded"
+        assert not any(os.path.isdir(job.path) for job in jobs)
+        assert {job.id for job in project} == ids
+        assert len(project) == len(jobs)
+        for job in project:
+            assert os.path.dirname(job.path) == os.path.join(
+                project.workspace, job.id[:2]
+            )
+            assert job.doc.a == job.sp.a
+        assert signac.get_job(project.open_job({"a": 0}).path).sp.a == 0
+
+        # The conversion is idempotent.
+        apply_workspace_layout(self.project.path, "sharded")
+        assert {job.id for job in Project(self.project.path)} == ids
+
+        apply_workspace_layout(self.project.path, "flat")
+        project = Project(self.project.path)
+        assert "workspace_layout" not in project.config
+        assert sorted(os.listdir(project.workspace)) == sorted(ids)
+        assert all(os.path.isdir(job.path) for job in jobs)
+
+        with pytest.raises(ValueError):
+            apply_workspace_layout(self.project.path, "nested")
+
+    def test_invalid_workspace_layout(self):
+        config = _read_config_file(_get_project_config_fn(self.project.path))
+        config["workspace_layout"] = "nested"
+        config.write()
+        with pytest.raises(signac.errors.ConfigError):
+            Project(self.project.path)
+
+
 class TestProjectPickling(TestProjectBase):
     def test_pickle_project_empty(self):
         blob = pickle.dumps(self.project)
@@ -1,8 +1,19 @@
 import pytest
 
-from signac._search_indexer import _SearchIndexer
+from signac._search_indexer import (
+    _CompiledFilter,
+    _SearchIndexer,
+    _TypedSetDefaultDict,
+)
 from signac.errors import InvalidKeyError
 
+try:
+    import numpy  # noqa: F401
+except ImportError:
+    NUMPY = False
+else:
+    NUMPY = True
+
 n = 42
 N = 100
 
@@ -134,6 +145,48 @@ class TestSearchIndexer:
             for _id in _ids:
                 assert self.c[_id]["a"] == value
 
+    def test_index_cache(self):
+        docs = {str(i): {"a": i} for i in range(10)}
+        self.c.update(docs)
+        index = self.c.build_index("a")
+        assert self.c.build_index("a") is index
+        self.c["10"] = {"a": 10}
+        index = self.c.build_index("a")
+        assert len(index[10]) == 1
+        del self.c["10"]
+        assert 10 not in self.c.build_index("a")
+        self.c.add_index("b", index)
+        assert self.c.build_index("b") is index
+        assert len(self.c.find({"b": 0})) == 1
+        # Results must not alias the cached index.
+        self.c.find({"a": 0}).add("x")
+        assert self.c.find({"a": 0}) == {"0"}
+
+    def test_compiled_filter(self):
+        def keys(filter_):
+            return _CompiledFilter.from_filter(filter_).keys
+
+        assert keys({}) == set()
+        assert keys({"_id": "0"}) == set()
+        assert keys({"a": 0, "b": {"c": 1}}) == {"a", "b.c"}
+        assert keys({"a": {"$gt": 0}}) == {"a"}
+        assert keys({"a.$exists": True}) == {"a"}
+        assert keys(
+            {"$and": [{"a": 0}, {"$not": {"b": 0}}], "$or": [{"c": {"$in": [0]}}]}
+        ) == {"a", "b", "c"}
+
+        # Compiled filters are validated once and can be evaluated repeatedly.
+        with pytest.raises(KeyError):
+            _CompiledFilter.from_filter({"a": {"$unknown": 0}})
+        with pytest.raises(ValueError):
+            _CompiledFilter.from_filter({"a": {"$type": "complex"}})
+        compiled = _CompiledFilter.from_filter({"a": {"$lt": 5}, "$not": {"b": 1}})
+        assert compiled.find(self.c) == set()
+        self.c.update({str(i): {"a": i, "b": i % 2} for i in range(10)})
+        assert compiled.find(self.c) == {"0", "2", "4"}
+        self.c["10"] = {"a": -1, "b": 0}
+        assert compiled.find(self.c) == {"0", "2", "4", "10"}
+
     def test_clear(self):
         assert len(self.c) == 0
         self.c["0"] = {"a": 0}
@@ -321,6 +374,82 @@ class TestSearchIndexer:
         for expr, n in ARITHMETIC_EXPRESSIONS:
             assert len(self.c.find({"a": expr})) == n
 
+    def test_sorted_keys(self):
+        index = _TypedSetDefaultDict()
+        index.update({2: {"a"}, 1.0: {"b"}})
+        index[1].add("c")
+        assert index.sorted_keys() == [1, 1.0, 2]
+        index.pop(1.0)
+        assert index.sorted_keys() == [1, 2]
+        assert index.popitem() == (1, {"c"})
+        assert index.sorted_keys() == [2]
+        index.setdefault(0.5, set())
+        assert index.sorted_keys() == [0.5, 2]
+        index.update([(3, set())], b=set())
+        assert index.sorted_keys() is None
+        index.clear()
+        assert index.sorted_keys() == []
+
+    def test_find_range_operators(self):
+        values = [-1.5, -1, 0, 0.0, 0.5, 1, 1.0, True, 2, float("inf"), float("nan")]
+        self.c.update({str(i): {"a": value} for i, value in enumerate(values)})
+        for argument in (-2, -1, -1.0, 0, 0.25, 1, True, 1.5, 3, float("inf")):
+            for op, func in (
+                ("$lt", lambda x: x < argument),
+                ("$lte", lambda x: x <= argument),
+                ("$gt", lambda x: x > argument),
+                ("$gte", lambda x: x >= argument),
+            ):
+                expected = {str(i) for i, value in enumerate(values) if func(value)}
+                assert self.c.find({"a": {op: argument}}) == expected
+        assert self.c.find({"a": {"$lt": float("nan")}}) == set()
+
+        # The sorted values are updated when documents are added.
+        self.c["a"] = {"a": -10}
+        assert self.c.find({"a": {"$lt": -5}}) == {"a"}
+
+        # Comparing numbers and other types fails as before.
+        self.c["b"] = {"a": "b"}
+        with pytest.raises(TypeError):
+            self.c.find({"a": {"$lt": 0}})
+
+    def test_find_query_plan(self):
+        docs = {str(i): {"a": i, "b": i % 2, "c": {"d": i % 3}} for i in range(N)}
+        self.c.update(docs)
+        expected = {
+            _id
+            for _id, doc in docs.items()
+            if doc["a"] == 7 and doc["b"] != 0 and doc["c"]["d"] in (0, 1)
+        }
+        result = self.c.find(
+            {"b": {"$ne": 0}, "$and": [{"c.d": {"$in": [0, 1]}}], "a": 7}
+        )
+        assert result == expected
+        # The most selective expression is evaluated first, the remaining keys
+        # are only indexed for the remaining candidates.
+        assert set(self.c._indexes) == {"a"}
+
+        # Existing indexes are used before building new ones and the remaining
+        # expressions are skipped once no candidates remain.
+        self.c._invalidate()
+        self.c.build_index("b")
+        assert self.c.find({"c.d": 1, "b": 2}) == set()
+        assert set(self.c._indexes) == {"b"}
+        assert self.c.find({"a": {"$gte": 0}, "b": 1, "$not": {"c.d": 2}}) == {
+            _id for _id, doc in docs.items() if doc["b"] == 1 and doc["c"]["d"] != 2
+        }
+        assert set(self.c._indexes) == {"b"}
+        assert self.c.find({"$or": [{"a": 1}, {"a": 2}], "_id": "1"}) == {"1"}
+        assert self.c.find({"_id": "1", "a": 2}) == set()
+
+        # The result does not depend on the order of evaluation, even though
+        # equal values of different types share an entry of the index.
+        self.c.clear()
+        self.c.update({"13": {"b": True}, "18": {"b": 1, "n": {"m": 2.5}}})
+        assert self.c.find({"b": {"$type": "bool"}, "n.m": 2.5}) == {"18"}
+        assert self.c.find({"b": {"$type": "bool"}}) == {"13", "18"}
+        assert self.c.find({"n.m": 2.5, "b": True}) == {"18"}
+
     def test_find_near(self):
         assert len(self.c) == 0
         # find 0 items in empty collection
@@ -434,3 +563,58 @@ class TestSearchIndexer:
         for expr, expectation in INVALID_SYNTAX_EXPRESSIONS:
             with pytest.raises(expectation):
                 self.c.find(expr)
+
+
+@pytest.mark.skipif(not NUMPY, reason="test requires the numpy package")
+class TestVectorizedSearchIndexer(TestSearchIndexer):
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        from signac._vectorized_search import _VectorizedSearchIndexer
+
+        self.c = _VectorizedSearchIndexer()
+
+    def test_find_query_plan(self):
+        docs = {str(i): {"a": i, "b": i % 2, "c": {"d": i % 3}} for i in range(N)}
+        self.c.update(docs)
+        result = self.c.find(
+            {"b": {"$ne": 0}, "$and": [{"c.d": {"$in": [0, 1]}}], "a": {"$lt": 10}}
+        )
+        assert result == {"1", "3", "7", "9"}
+        # Numerical keys are evaluated on columns instead of indexes.
+        assert set(self.c._columns) == {"a", "b", "c.d"}
+        assert not self.c._indexes
+
+    def test_find_vectorized(self):
+        values = [0, 1, 1.0, 1.5, True, False, -2, float("inf"), float("nan")]
+        docs = {str(i): {"a": v, "b": {"c": i}} for i, v in enumerate(values)}
+        docs["missing"] = {"b": {"c": 0}}
+        self.c.update(docs)
+        reference = _SearchIndexer(docs)
+        filters = [
+            {"a": 1},
+            {"a": 1.0},
+            {"a": 1.5},
+            {"a": True},
+            {"a": {"$eq": 0}},
+            {"a": {"$ne": 1}},
+            {"a": {"$gte": 1}},
+            {"a": {"$lt": float("inf")}},
+            {"a": {"$in": [1.5, -2, "x", [1]]}},
+            {"a": {"$nin": [0, 1]}},
+            {"a": {"$exists": False}},
+            {"b.c": {"$gt": 3}, "$not": {"a": {"$lte": 1}}},
+            {"$or": [{"a": -2}, {"b.c": 0}], "_id": "missing"},
+            {"$and": [{"a": {"$gt": 0}}, {"b.c": {"$lt": 4}}]},
+        ]
+        for filter_ in filters:
+            assert self.c.find(filter_) == reference.find(filter_)
+        assert set(self.c._columns) == {"a", "b.c"}
+
+        # Non-numerical columns and arguments fall back to the index.
+        for filter_ in ({"a": "x"}, {"a": {"$regex": "x"}}, {"a": 2**60}):
+            assert self.c.find(filter_) == reference.find(filter_)
+        self.c["x"] = {"a": "x"}
+        assert self.c.find({"a": "x"}) == {"x"}
+        assert self.c._columns == {"a": None}
+        with pytest.raises(TypeError):
+            self.c.find({"a": {"$lt": 0}})
@@ -843,6 +843,15 @@ class TestBasicShell:
         project = signac.get_project()
         with gzip.open(project.fn(project.FN_CACHE), "rb") as cachefile:
             cache = json.loads(cachefile.read().decode())
+        try:
+            with open(project.fn(project.FN_CACHE_JOURNAL)) as journal:
+                for line in journal:
+                    record = json.loads(line)
+                    cache.update(record["add"])
+                    for id_ in record["remove"]:
+                        cache.pop(id_, None)
+        except FileNotFoundError:
+            pass
         return cache
 
     @pytest.mark.usefixtures("subtests")
@@ -907,3 +916,17 @@ class TestBasicShell:
         assert not os.path.isdir(os.path.join(dirname, "workspace_dir"))
         assert os.path.isdir(os.path.join(dirname, ".signac"))
         assert os.path.isdir(os.path.join(dirname, "workspace"))
+
+    def test_migrate_workspace_layout(self):
+        self.call("python -m signac init".split())
+        project = signac.Project()
+        job = project.open_job({"a": 0}).init()
+        err = self.call(
+            "python -m signac migrate --workspace-layout sharded".split(), error=True
+        )
+        assert "OK" in err
+        assert os.path.isdir(os.path.join(project.workspace, job.id[:2], job.id))
+        out = self.call("python -m signac find".split())
+        assert job.id in out
+        self.call("python -m signac migrate --workspace-layout flat".split())
+        assert os.path.isdir(os.path.join(project.workspace, job.id))